@@ -0,0 +1,66 @@
+"""Markdown 解析器性能基准：逐行解析 vs Markdown -> HTML -> BeautifulSoup
+
+用法:
+    python benchmarks/bench_markdown_parser.py --cases 1000 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+from pywinauto_pytest.parser.markdown_parser import MarkdownParser
+
+
+def generate_markdown(cases: int) -> str:
+    """生成包含指定数量测试用例的 Markdown 内容"""
+    lines = ["# Benchmark Suite", ""]
+    for i in range(cases):
+        lines += [
+            f"## Test Case {i}",
+            "1. **start_application**: calc.exe",
+            f'2. **click**: Button("{i % 10}")',
+            '3. **click**: Button("+")',
+            f'4. **assert_text**: Edit() == "{i}"',
+            "",
+            "**Teardown**:",
+            "- **close_application**",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def measure(func, file_path: str, repeat: int) -> float:
+    """返回多次执行中的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown 解析器性能基准")
+    parser.add_argument("--cases", type=int, default=1000, help="生成的测试用例数量")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    md_parser = MarkdownParser()
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", encoding="utf-8", delete=False) as f:
+        f.write(generate_markdown(args.cases))
+        file_path = f.name
+
+    try:
+        assert md_parser.parse(file_path) == md_parser.parse_html(file_path), "两种解析方式的结果不一致"
+        line_time = measure(md_parser.parse, file_path, args.repeat)
+        html_time = measure(md_parser.parse_html, file_path, args.repeat)
+    finally:
+        os.unlink(file_path)
+
+    print(f"测试用例数: {args.cases}")
+    print(f"逐行解析:  {line_time * 1000:.1f} ms")
+    print(f"HTML 解析: {html_time * 1000:.1f} ms")
+    print(f"加速比:    {html_time / line_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""数据模型内存基准：紧凑模型（__slots__、驻留字符串、共享空 data） vs 普通 dataclass
+
+用法:
+    python benchmarks/bench_models.py --cases 10000 --steps 20
+"""
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from pywinauto_pytest.models import TestCase, TestStep
+
+
+@dataclass
+class PlainStep:
+    """此前版本的测试步骤模型"""
+    action: str
+    target: Optional[str] = None
+    locator: Optional[str] = None
+    expected: Optional[str] = None
+    data: Optional[Dict[str, Any]] = field(default_factory=dict)
+    description: Optional[str] = None
+
+
+@dataclass
+class PlainCase:
+    """此前版本的测试用例模型"""
+    name: str
+    steps: List[PlainStep]
+    teardown: List[PlainStep] = field(default_factory=list)
+    setup: List[PlainStep] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    description: Optional[str] = None
+
+
+ACTIONS = ["click", "set_text", "assert_text", "wait_for"]
+TARGETS = ["Button", "Edit", "Window"]
+
+
+def build(case_cls, step_cls, cases: int, steps: int) -> list:
+    """模拟解析器的输出：每个字符串都是新创建的对象，与从文件中解析得到的一样"""
+    suite = []
+    for i in range(cases):
+        case_steps = []
+        for j in range(steps):
+            case_steps.append(step_cls(
+                action="".join(ACTIONS[j % len(ACTIONS)]),
+                target="".join(TARGETS[j % len(TARGETS)]),
+                locator=f"button{j % 10}",
+                expected=str(i) if j == steps - 1 else None,
+                data={}
+            ))
+        suite.append(case_cls(name=f"case {i}", steps=case_steps))
+    return suite
+
+
+def measure(case_cls, step_cls, cases: int, steps: int) -> int:
+    """返回构建模型后占用的内存（字节）"""
+    gc.collect()
+    tracemalloc.start()
+    suite = build(case_cls, step_cls, cases, steps)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del suite
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据模型内存基准")
+    parser.add_argument("--cases", type=int, default=10000, help="测试用例数量")
+    parser.add_argument("--steps", type=int, default=20, help="每个测试用例的步骤数")
+    args = parser.parse_args()
+
+    plain = measure(PlainCase, PlainStep, args.cases, args.steps)
+    compact = measure(TestCase, TestStep, args.cases, args.steps)
+    total = args.cases * args.steps
+
+    print(f"步骤数: {total}")
+    print(f"普通 dataclass: {plain / 2 ** 20:.1f} MiB ({plain / total:.0f} 字节/步骤)")
+    print(f"紧凑模型:       {compact / 2 ** 20:.1f} MiB ({compact / total:.0f} 字节/步骤)")
+    print(f"节省:           {(1 - compact / plain) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
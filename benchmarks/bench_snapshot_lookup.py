@@ -0,0 +1,81 @@
+"""元素查找基准：快照索引 vs 实时定位策略探测
+
+在 fake 后端加载的录制 UI 树（默认 tests/test_data/settings_tree.yaml）上，
+对树中每个控件按 title/auto_id/class_name 和若干序号查找，比较：
+
+- 实时探测：依次尝试 ``_locator_strategies`` 给出的策略，每次都遍历子树
+- 快照索引：一次遍历建立快照后，按哈希索引和序号查找
+
+用法:
+    python benchmarks/bench_snapshot_lookup.py --rounds 20
+    python benchmarks/bench_snapshot_lookup.py --tree path/to/tree.yaml --app app.exe
+"""
+import argparse
+import logging
+import os
+import time
+from collections import Counter
+from pywinauto_pytest.executor import PywinautoExecutor
+from pywinauto_pytest.executor.backends import FakeBackend
+from pywinauto_pytest.logger import logger
+from pywinauto_pytest.models import TestStep
+
+DEFAULT_TREE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "test_data", "settings_tree.yaml")
+
+
+def probe_chain(executor, target, locator):
+    """按实时定位策略依次探测"""
+    for strategy in executor._locator_strategies(locator):
+        element = executor._locate_by(strategy, target, locator)
+        if element is not None:
+            return element
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="快照索引与实时定位策略的查找性能对比")
+    parser.add_argument("--tree", default=DEFAULT_TREE, help="fake 后端的 UI 树文件")
+    parser.add_argument("--app", default="settings.exe", help="UI 树中的应用程序路径")
+    parser.add_argument("--rounds", type=int, default=10, help="重复查找的轮数")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    backend = FakeBackend.from_file(args.tree)
+    executor = PywinautoExecutor(backend=backend)
+    executor.execute_step(TestStep(action="start_application", target=args.app))
+
+    started = time.perf_counter()
+    snapshot = executor.capture_snapshot()
+    capture = time.perf_counter() - started
+
+    counts = Counter(info.control_type for info in snapshot.elements)
+    queries = set()
+    for info in snapshot.elements:
+        queries.update((info.control_type, value) for value in (info.title, info.auto_id, info.class_name) if value)
+        queries.add((info.control_type, str(counts[info.control_type] - 1)))
+    queries = sorted(queries)
+    lookups = len(queries) * args.rounds
+
+    backend.calls.clear()
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for target, locator in queries:
+            probe_chain(executor, target, locator)
+    probe_time = time.perf_counter() - started
+    probes = backend.calls["find_child"] + backend.calls["find_children"]
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for target, locator in queries:
+            snapshot.find(target, locator, executor._locator_strategies(locator))
+    index_time = time.perf_counter() - started
+
+    print(f"控件数: {len(snapshot)}, 查询数: {len(queries)}, 轮数: {args.rounds}")
+    print(f"快照捕获: {capture * 1000:.2f} ms")
+    print(f"实时探测: {probe_time / lookups * 1e6:.1f} us/次, 平均 {probes / lookups:.2f} 次后端查询")
+    print(f"快照索引: {index_time / lookups * 1e6:.2f} us/次")
+    print(f"加速比: {probe_time / index_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""性能基准套件：解析器、测试收集和步骤分发
+
+生成 10 到 100000 个测试用例的 YAML/JSON/Excel/Markdown 文件，测量：
+
+- ``get_parser(path).parse`` 的耗时和峰值内存
+- ``PywinautoFile.collect`` 的吞吐量（在进程内运行 ``pytest --collect-only``）
+- ``execute_compiled`` / ``execute_step`` 在 fake 后端上的单步分发开销
+
+结果可以保存为基线，之后与基线比较，耗时或内存超出阈值时视为性能回退并以退出码 1 结束。
+基线与机器相关，请在同一台机器上保存和比较。
+
+用法:
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json --threshold 0.2
+    python benchmarks/bench_suite.py --sizes 10 100 1000 10000 100000 --formats yaml json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pytest
+from openpyxl import Workbook
+from pywinauto_pytest import models
+from pywinauto_pytest.executor import PywinautoExecutor, compile_case
+from pywinauto_pytest.executor.backends import FakeBackend
+from pywinauto_pytest.logger import logger
+from pywinauto_pytest.parser import get_parser
+
+FORMATS = ("yaml", "json", "xlsx", "md")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+TREE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "test_data", "calculator_tree.yaml")
+
+
+def write_yaml(path: str, cases: int) -> None:
+    """生成 YAML 测试文件"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("test_suite: Benchmark Suite\ntests:\n")
+        for i in range(cases):
+            f.write(
+                f"  - name: case {i}\n"
+                "    steps:\n"
+                "      - {action: start_application, target: calc.exe}\n"
+                f"      - {{action: click, target: Button, locator: \"{i % 10}\"}}\n"
+                f"      - {{action: set_text, target: Edit, locator: CalculatorResults, data: {{text: \"{i}\"}}}}\n"
+                f"      - {{action: assert_text, target: Edit, expected: \"{i}\"}}\n"
+                "    teardown:\n"
+                "      - {action: close_application}\n"
+            )
+
+
+def write_json(path: str, cases: int) -> None:
+    """生成 JSON 测试文件"""
+    tests = [{
+        "name": f"case {i}",
+        "steps": [
+            {"action": "start_application", "target": "calc.exe"},
+            {"action": "click", "target": "Button", "locator": str(i % 10)},
+            {"action": "set_text", "target": "Edit", "locator": "CalculatorResults", "data": {"text": str(i)}},
+            {"action": "assert_text", "target": "Edit", "expected": str(i)},
+        ],
+        "teardown": [{"action": "close_application"}],
+    } for i in range(cases)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"test_suite": "Benchmark Suite", "tests": tests}, f, ensure_ascii=False)
+
+
+def write_xlsx(path: str, cases: int) -> None:
+    """生成 Excel 测试文件"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("TestCases")
+    sheet.append(["Benchmark Suite"])
+    sheet.append(["TestName", "Action", "Target", "Locator", "Expected"])
+    for i in range(cases):
+        sheet.append([f"## case {i}"])
+        sheet.append([None, "start_application", "calc.exe", None, None])
+        sheet.append([None, "click", "Button", str(i % 10), None])
+        sheet.append([None, "assert_text", "Edit", None, str(i)])
+        sheet.append(["Teardown", "close_application", None, None, None])
+    workbook.save(path)
+
+
+def write_md(path: str, cases: int) -> None:
+    """生成 Markdown 测试文件"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Benchmark Suite\n\n")
+        for i in range(cases):
+            f.write(
+                f"## case {i}\n"
+                "1. **start_application**: calc.exe\n"
+                f'2. **click**: Button("{i % 10}")\n'
+                f'3. **assert_text**: Edit() == "{i}"\n\n'
+                "**Teardown**:\n"
+                "- **close_application**\n\n"
+            )
+
+
+WRITERS: Dict[str, Callable[[str, int], None]] = {
+    "yaml": write_yaml, "json": write_json, "xlsx": write_xlsx, "md": write_md,
+}
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """返回多次执行中的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """返回执行过程中的峰值内存（字节）"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class CollectTimer:
+    """记录 pytest 收集阶段耗时和测试项数量的插件"""
+
+    def __init__(self):
+        self.started = 0.0
+        self.duration = 0.0
+        self.items = 0
+
+    def pytest_collection(self, session):
+        self.started = time.perf_counter()
+
+    def pytest_collection_finish(self, session):
+        self.duration = time.perf_counter() - self.started
+        self.items = len(session.items)
+
+
+def collect_once(path: str) -> CollectTimer:
+    """在进程内运行 pytest --collect-only，不使用解析缓存"""
+    timer = CollectTimer()
+    args = ["--collect-only", "-qq", "-p", "no:cacheprovider", f"--pywinauto-file={path}",
+            f"--rootdir={os.path.dirname(path)}", path]
+    with contextlib.redirect_stdout(io.StringIO()):
+        pytest.main(args, plugins=[timer])
+    return timer
+
+
+def bench_parsers(workdir: str, formats: List[str], sizes: List[int], repeat: int,
+                  collect_limit: int) -> Dict[str, float]:
+    """解析耗时、峰值内存和收集吞吐量"""
+    results = {}
+    for fmt in formats:
+        for size in sizes:
+            path = os.path.join(workdir, f"bench_{size}.{fmt}")
+            WRITERS[fmt](path, size)
+            parser = get_parser(path)
+            parsed = parser.parse(path)
+            assert len(parsed.tests) == size, f"{path} 解析得到 {len(parsed.tests)} 个用例"
+
+            prefix = f"parse.{fmt}.{size}"
+            results[f"{prefix}.seconds"] = best_time(lambda: parser.parse(path), repeat)
+            results[f"{prefix}.peak_bytes"] = peak_memory(lambda: parser.parse(path))
+
+            if size <= collect_limit:
+                timer = min((collect_once(path) for _ in range(repeat)), key=lambda t: t.duration)
+                assert timer.items == size, f"{path} 收集到 {timer.items} 个测试项"
+                results[f"collect.{fmt}.{size}.seconds"] = timer.duration
+                results[f"collect.{fmt}.{size}.items_per_second"] = size / timer.duration
+            print(f"  {prefix}: {results[f'{prefix}.seconds'] * 1000:.1f} ms", file=sys.stderr)
+            os.unlink(path)
+    return results
+
+
+def bench_dispatch(steps: int, repeat: int) -> Dict[str, float]:
+    """单步分发开销：fake 后端上的原始操作、已编译步骤和未编译步骤"""
+    backend = FakeBackend.from_file(TREE_FILE)
+    executor = PywinautoExecutor(backend=backend)
+    executor.execute_step(models.TestStep(action="start_application", target="calc.exe"))
+    step = models.TestStep(action="click", target="Button", locator="plusButton")
+    compiled = compile_case(PywinautoExecutor, models.TestCase(name="dispatch", steps=[step])).steps[0]
+    element = executor._find_element(step.target, step.locator)
+
+    def raw():
+        for _ in range(steps):
+            backend.click(element)
+
+    def run_compiled():
+        for _ in range(steps):
+            executor.execute_compiled(compiled)
+        executor.instrumentation.take_records()
+
+    def run_step():
+        for _ in range(steps):
+            executor.execute_step(step)
+        executor.instrumentation.take_records()
+
+    results = {
+        "dispatch.raw_click.us_per_step": best_time(raw, repeat) / steps * 1e6,
+        "dispatch.execute_compiled.us_per_step": best_time(run_compiled, repeat) / steps * 1e6,
+        "dispatch.execute_step.us_per_step": best_time(run_step, repeat) / steps * 1e6,
+    }
+    results["dispatch.overhead.us_per_step"] = (
+        results["dispatch.execute_compiled.us_per_step"] - results["dispatch.raw_click.us_per_step"]
+    )
+    executor.teardown()
+    return results
+
+
+# 数值越大越好的指标，其余指标数值越小越好
+HIGHER_IS_BETTER = ("items_per_second",)
+
+# 基线耗时低于该值（秒）的测量受计时抖动影响太大，不参与比较
+NOISE_FLOOR = 0.005
+
+
+def size_of(name: str) -> int:
+    """从 ``collect.<格式>.<用例数>.<指标>`` 形式的指标名中取出用例数"""
+    return int(name.split(".")[2])
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """与基线比较，返回超出阈值的回退说明"""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if not base or base <= 0:
+            continue
+        if name.endswith(".seconds") and base < NOISE_FLOOR:
+            continue
+        if name.endswith(HIGHER_IS_BETTER) and size_of(name) / base < NOISE_FLOOR:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            change = base / value - 1 if value > 0 else float("inf")
+        else:
+            change = value / base - 1
+        if change > threshold:
+            regressions.append(f"{name}: {base:.4g} -> {value:.4g} (+{change * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="解析器、测试收集和步骤分发性能基准")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="测试文件格式")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="每个文件的测试用例数量")
+    parser.add_argument("--collect-limit", type=int, default=10000, help="测量收集吞吐量的最大用例数")
+    parser.add_argument("--dispatch-steps", type=int, default=20000, help="测量分发开销时执行的步骤数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最短耗时")
+    parser.add_argument("--save-baseline", metavar="PATH", help="将结果保存为基线")
+    parser.add_argument("--compare", metavar="PATH", help="与基线比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="超出基线的比例阈值，默认 0.2")
+    parser.add_argument("--output", metavar="PATH", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    # 只测量分发本身，不测量控制台和文件日志
+    logger.setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = bench_parsers(workdir, args.formats, args.sizes, args.repeat, args.collect_limit)
+    results.update(bench_dispatch(args.dispatch_steps, args.repeat))
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:,.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"基线已保存: {args.save_baseline}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"性能回退（超出基线 {args.threshold * 100:.0f}%）:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("没有超出阈值的性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,9 @@ setup(
             'flake8>=5.0.0',
             'black>=23.0.0',
         ],
+        'fast': [
+            'orjson>=3.6.0',
+        ],
     },
     entry_points={
         'pytest11': [
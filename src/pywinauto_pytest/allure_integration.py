@@ -1,55 +1,119 @@
 import os
-import time
-from typing import Optional, Any
-from pywinauto import Application
+from functools import partial
+from typing import Callable, Optional, Any, Tuple
+from .attachments import AttachmentWriter, encode_png, grab_screen
+from .screenshots import ScreenshotStore
 from .logger import logger
 
+_NOT_LOADED = object()
+_allure: Any = _NOT_LOADED
+
+
+def _import_allure() -> Any:
+    """导入 allure 模块并缓存结果，未安装时返回 None"""
+    global _allure
+    if _allure is _NOT_LOADED:
+        try:
+            import allure
+            _allure = allure
+        except ImportError:
+            _allure = None
+            logger.warning("allure 模块未安装，无法生成 Allure 报告")
+    return _allure
+
 
 class AllureIntegration:
-    """Allure 报告集成"""
+    """Allure 报告集成
+
+    传入 ``writer`` 时截图在后台线程中编码，调用 ``flush`` 后才添加到报告；
+    否则截图在内存中同步编码并立即添加。
+    传入 ``store`` 时截图经过去重、裁剪和大小预算，``owner`` 用于在重复截图的说明中标识来源。
+    """
     
-    def __init__(self):
+    def __init__(self, writer: Optional[AttachmentWriter] = None, store: Optional[ScreenshotStore] = None,
+                 owner: Optional[str] = None):
         self._step_count = 0
+        self.writer = writer
+        self.store = store
+        self.owner = owner
     
     def start_step(self, name: str, description: Optional[str] = None) -> None:
         """开始一个测试步骤"""
-        try:
-            import allure
-            with allure.step(name):
-                if description:
-                    allure.attach(description, name="描述")
-        except ImportError:
-            logger.warning("allure 模块未安装，无法生成 Allure 报告")
+        allure = _import_allure()
+        if allure is None:
+            return
+        with allure.step(name):
+            if description:
+                allure.attach(description, name="描述")
     
     def stop_step(self) -> None:
         """停止当前测试步骤"""
         # Allure 步骤通过上下文管理器自动管理，不需要手动停止
         pass
     
-    def attach_screenshot(self, name: str = "截图") -> None:
-        """添加截图到 Allure 报告"""
+    def attach_screenshot(self, name: str = "截图",
+                          region: Optional[Callable[[], Optional[Tuple[int, int, int, int]]]] = None) -> None:
+        """截取屏幕并添加到 Allure 报告
+
+        ``region`` 返回当前窗口的区域，启用裁剪时只截取该区域。
+        """
+        store = self.store
         try:
-            import allure
-            from PIL import ImageGrab
-            
-            # 截取当前屏幕
-            screenshot = ImageGrab.grab()
-            
-            # 保存截图到临时文件
-            screenshot_path = f"screenshot_{int(time.time())}.png"
-            screenshot.save(screenshot_path)
-            
-            # 附加截图到 Allure 报告
-            with open(screenshot_path, "rb") as f:
-                allure.attach(f.read(), name=name, attachment_type=allure.attachment_type.PNG)
-            
-            # 删除临时文件
-            os.remove(screenshot_path)
-            logger.info(f"已添加截图到 Allure 报告: {name}")
-        except ImportError as e:
-            logger.warning(f"无法添加截图到 Allure 报告: {str(e)}")
+            bbox = region() if region is not None and store is not None and store.crop else None
+            image = grab_screen(bbox)
+        except Exception as e:
+            logger.warning("无法添加截图到 Allure 报告: %s", e)
+            return
+        self.attach_image(image, name)
+    
+    def attach_image(self, image: Any, name: str = "截图",
+                     region: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """将内存中的截图添加到 Allure 报告，经过截图去重和大小预算
+
+        ``region`` 为图像中当前窗口的区域，启用裁剪时只保留该区域（用于回放工作进程的整屏截图）。
+        """
+        store = self.store
+        if region is not None and store is not None and store.crop:
+            image = image.crop(region)
+        
+        encode = encode_png
+        if store is not None:
+            label = f"{self.owner}: {name}" if self.owner else name
+            key, original = store.admit(image, label)
+            if original is not None:
+                # 重复的截图只记录一条说明
+                self.attach_data(f"与 {original} 的截图相同，未重复保存".encode("utf-8"), name, "txt")
+                return
+            encode = partial(store.encode, key=key)
+        
+        if self.writer is not None:
+            # 编码交给后台线程，测试结束时由 flush 添加到报告
+            self.writer.submit(name, image, encode=encode)
+            return
+        try:
+            data = encode(image)
+            if data is not None:
+                self.attach_data(data, name)
+        except Exception as e:
+            logger.error("添加截图到 Allure 报告失败: %s", e)
+    
+    def flush(self) -> None:
+        """等待后台编码完成，将截图添加到 Allure 报告"""
+        if self.writer is None:
+            return
+        for attachment in self.writer.flush():
+            self.attach_data(attachment.data, attachment.name, attachment.file_type)
+    
+    def attach_data(self, data: bytes, name: str, file_type: str = "png") -> None:
+        """添加内存中的数据到 Allure 报告"""
+        allure = _import_allure()
+        if allure is None:
+            return
+        try:
+            allure.attach(data, name=name, attachment_type=self._get_attachment_type(file_type))
+            logger.info("已添加附件到 Allure 报告: %s", name)
         except Exception as e:
-            logger.error(f"添加截图到 Allure 报告失败: {str(e)}")
+            logger.error("添加附件到 Allure 报告失败: %s", e)
     
     def attach_file(self, file_path: str, name: str, file_type: str = "txt") -> None:
         """添加文件到 Allure 报告"""
@@ -58,7 +122,7 @@ class AllureIntegration:
             
             # 检查文件是否存在
             if not os.path.exists(file_path):
-                logger.warning(f"文件不存在，无法添加到 Allure 报告: {file_path}")
+                logger.warning("文件不存在，无法添加到 Allure 报告: %s", file_path)
                 return
             
             # 确定文件类型
@@ -68,11 +132,11 @@ class AllureIntegration:
             with open(file_path, "rb") as f:
                 allure.attach(f.read(), name=name, attachment_type=attachment_type)
             
-            logger.info(f"已添加文件到 Allure 报告: {name}")
+            logger.info("已添加文件到 Allure 报告: %s", name)
         except ImportError as e:
-            logger.warning(f"无法添加文件到 Allure 报告: {str(e)}")
+            logger.warning("无法添加文件到 Allure 报告: %s", e)
         except Exception as e:
-            logger.error(f"添加文件到 Allure 报告失败: {str(e)}")
+            logger.error("添加文件到 Allure 报告失败: %s", e)
     
     def add_tag(self, tag: str) -> None:
         """添加标签到 Allure 报告"""
@@ -100,7 +164,7 @@ class AllureIntegration:
     
     def _get_attachment_type(self, file_type: str) -> Any:
         """根据文件类型获取 Allure 附件类型"""
-        import allure
+        allure = _import_allure()
         
         type_map = {
             "txt": allure.attachment_type.TEXT,
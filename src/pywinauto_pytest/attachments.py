@@ -0,0 +1,120 @@
+import io
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+from .logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+ATTACHMENT_WRITER_PLUGIN = "pywinauto-attachments"
+
+# 等待编码的截图队列默认长度
+DEFAULT_QUEUE_SIZE = 16
+
+
+@dataclass
+class Attachment:
+    """编码完成、等待添加到报告的附件"""
+    name: str
+    data: bytes
+    file_type: str = "png"
+
+
+def grab_screen(bbox: Optional[Tuple[int, int, int, int]] = None) -> Any:
+    """截取屏幕，传入 bbox (left, top, right, bottom) 时只截取该区域，返回 PIL 图像"""
+    from PIL import ImageGrab
+    return ImageGrab.grab(bbox=bbox)
+
+
+def encode_png(image: Any) -> bytes:
+    """在内存中将图像编码为 PNG"""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def decode_png(data: bytes) -> Any:
+    """将内存中的 PNG 数据解码为 PIL 图像"""
+    from PIL import Image
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+class AttachmentWriter:
+    """在后台线程中编码截图的附件写入器
+
+    测试线程只负责截图并把图像放入有界队列，PNG 编码在后台线程中完成，
+    队列已满时 ``submit`` 会阻塞，避免截图堆积占用内存。
+    ``flush`` 等待队列中的图像全部编码完成并返回编码结果，
+    由调用方在测试线程中添加到报告（Allure 按线程记录当前测试项）。
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, encode: Callable[[Any], bytes] = encode_png):
+        self.encode = encode
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(1, maxsize))
+        self._done: List[Attachment] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.failed = 0
+
+    def submit(self, name: str, image: Any, file_type: str = "png",
+               encode: Optional[Callable[[Any], Optional[bytes]]] = None) -> None:
+        """提交待编码的图像，第一次提交时启动后台线程
+
+        ``encode`` 覆盖写入器默认的编码函数，返回 None 表示不保存该附件。
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=ATTACHMENT_WRITER_PLUGIN, daemon=True)
+            self._thread.start()
+        self.submitted += 1
+        self._queue.put((name, image, file_type, encode or self.encode))
+
+    def flush(self) -> List[Attachment]:
+        """等待已提交的图像全部编码完成，按提交顺序返回并清空编码结果"""
+        if self._thread is not None:
+            self._queue.join()
+        with self._lock:
+            done, self._done = self._done, []
+        return done
+
+    def close(self) -> None:
+        """停止后台线程，未取走的编码结果会被丢弃"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """后台线程：逐个编码队列中的图像"""
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                name, image, file_type, encode = task
+                try:
+                    data = encode(image)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error("编码附件失败: %s, 错误: %s", name, e)
+                    continue
+                if data is None:
+                    continue
+                with self._lock:
+                    self._done.append(Attachment(name, data, file_type))
+            finally:
+                self._queue.task_done()
+
+
+class AttachmentWriterPlugin:
+    """在整个测试会话中共享附件写入器的 pytest 插件"""
+
+    def __init__(self, writer: AttachmentWriter):
+        self.writer = writer
+
+    def pytest_sessionfinish(self, session):
+        """会话结束时停止后台线程"""
+        self.writer.close()
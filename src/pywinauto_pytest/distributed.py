@@ -0,0 +1,268 @@
+import heapq
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import pytest
+from .allure_integration import AllureIntegration
+from .attachments import decode_png, encode_png, grab_screen
+from .executor.backends import get_backend
+from .executor.pywinauto_executor import PywinautoExecutor
+from .executor.session_pool import SessionPool
+from .history import CaseHistory
+from .instrumentation import TimingRecord
+from .models import TestCase
+from .executor.plan import CasePlan, compile_case
+from .runner import run_suite_setup, run_suite_teardown, run_test_case
+from .logger import logger
+
+
+@dataclass
+class CaseResult:
+    """工作进程返回的测试用例执行结果
+
+    events 为按发生顺序记录的 Allure 事件（见 ``RecordingAllure``），timings 为各阶段、步骤和定位的计时记录。
+    """
+    nodeid: str
+    outcome: str
+    duration: float
+    worker: int
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+    events: List[Tuple[Any, ...]] = field(default_factory=list)
+    timings: List[TimingRecord] = field(default_factory=list)
+
+
+class RemoteCaseFailure(Exception):
+    """工作进程中执行失败的测试用例"""
+
+    def __init__(self, result: CaseResult):
+        super().__init__(result.error)
+        self.result = result
+
+
+class RecordingAllure(AllureIntegration):
+    """在工作进程中按顺序记录 Allure 步骤、附件和截图，供主进程回放
+
+    事件为 ``('step', 名称, 描述)``、``('attachment', 名称, 数据, 文件类型)``
+    或 ``('screenshot', 名称, PNG 数据, 窗口区域)``。截图不在工作进程中去重和裁剪，
+    而是整屏编码后交给主进程，由会话共享的截图去重和大小预算处理。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[Tuple[Any, ...]] = []
+
+    def start_step(self, name: str, description: Optional[str] = None) -> None:
+        """记录步骤"""
+        self.events.append(('step', name, description))
+
+    def attach_data(self, data: bytes, name: str, file_type: str = "png") -> None:
+        """记录附件"""
+        self.events.append(('attachment', name, data, file_type))
+
+    def attach_screenshot(self, name: str = "截图", region=None) -> None:
+        """在内存中截取整个屏幕并记录当前窗口的区域"""
+        try:
+            data = encode_png(grab_screen())
+        except Exception as e:
+            logger.warning("工作进程截图失败: %s", e)
+            return
+        try:
+            bbox = region() if region is not None else None
+        except Exception:
+            bbox = None
+        self.events.append(('screenshot', name, data, bbox))
+
+
+def replay_events(allure: AllureIntegration, events: List[Tuple[Any, ...]]) -> None:
+    """在主进程中按顺序回放工作进程记录的 Allure 事件"""
+    for event in events:
+        kind = event[0]
+        if kind == 'step':
+            allure.start_step(event[1], event[2])
+        elif kind == 'attachment':
+            allure.attach_data(event[2], event[1], event[3])
+        elif kind == 'screenshot':
+            try:
+                image = decode_png(event[2])
+            except Exception as e:
+                logger.warning("解码工作进程截图失败: %s", e)
+                continue
+            allure.attach_image(image, event[1], event[3])
+
+
+def timing_report(timings: List[TimingRecord]) -> Optional[bytes]:
+    """把工作进程中各阶段和步骤的耗时整理为 JSON 附件，没有记录时返回 None"""
+    phases = [
+        {'phase': record.name, 'duration': round(record.duration, 6), 'ok': record.ok}
+        for record in timings if record.kind == 'phase'
+    ]
+    steps = [
+        {'phase': record.phase, 'action': record.name, 'target': record.target, 'locator': record.locator,
+         'duration': round(record.duration, 6), 'ok': record.ok, 'error': record.error}
+        for record in timings if record.kind == 'step'
+    ]
+    if not phases and not steps:
+        return None
+    return json.dumps({'phases': phases, 'steps': steps}, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def balance_shards(durations: Dict[str, float], workers: int) -> List[List[str]]:
+    """按历史耗时将用例分配到各分片，使各分片总耗时尽量均衡
+
+    采用最长处理时间优先（LPT）的贪心策略：按耗时从大到小依次分配给当前总耗时最小的分片。
+    分片内保持原有的收集顺序。
+    """
+    workers = max(1, min(workers, len(durations)))
+    order = {nodeid: index for index, nodeid in enumerate(durations)}
+    heap = [(0.0, index) for index in range(workers)]
+    shards: List[List[str]] = [[] for _ in range(workers)]
+
+    for nodeid in sorted(durations, key=lambda n: (-durations[n], order[n])):
+        total, index = heapq.heappop(heap)
+        shards[index].append(nodeid)
+        heapq.heappush(heap, (total + durations[nodeid], index))
+
+    return [sorted(shard, key=order.__getitem__) for shard in shards if shard]
+
+
+def run_shard(worker: int, backend_options: Dict[str, Any],
+              cases: List[Tuple[str, TestCase, Optional[Tuple[str, TestCase]]]],
+              pool_options: Optional[Dict[str, Any]] = None) -> List[CaseResult]:
+    """在工作进程中顺序执行一个分片，整个分片共用一个执行器
+
+    每个用例附带所属测试套件的 (标识, setup/teardown 用例)，没有套件级 setup/teardown 时为 None。
+    分片内同一套件的用例是连续的，套件 setup 在其第一个用例前运行一次，teardown 在最后一个用例后运行；
+    setup 失败时第一个用例失败，其余用例跳过。
+    传入 ``pool_options`` 时分片内的用例通过会话池复用应用实例。
+    """
+    options = dict(backend_options)
+    backend = get_backend(options.pop('name'), **options)
+    session_pool = SessionPool(backend, **pool_options) if pool_options is not None else None
+    executor = PywinautoExecutor(backend=backend, session_pool=session_pool)
+    executor.setup()
+    results = []
+    suite_id, suite_plan, suite_error = None, None, None
+    try:
+        for nodeid, test_case, suite in cases:
+            allure = RecordingAllure()
+            started = time.perf_counter()
+            result = CaseResult(nodeid=nodeid, outcome='passed', duration=0.0, worker=worker)
+            try:
+                if (suite[0] if suite else None) != suite_id:
+                    if suite_plan is not None:
+                        _finish_suite(executor, suite_plan)
+                    suite_id, suite_plan, suite_error = (suite[0], None, None) if suite else (None, None, None)
+                    if suite:
+                        suite_plan = compile_case(PywinautoExecutor, suite[1])
+                        try:
+                            run_suite_setup(executor, suite_plan)
+                        except Exception as e:
+                            suite_error = e
+                            raise
+                elif suite_error is not None:
+                    result.outcome = 'skipped'
+                    result.error = f"测试套件 '{suite_plan.name}' 的 setup 失败: {suite_error}"
+                if result.outcome == 'passed':
+                    run_test_case(executor, test_case, allure)
+            except Exception as e:
+                result.outcome = 'failed'
+                result.error = f"{type(e).__name__}: {str(e)}"
+                result.traceback = traceback.format_exc()
+            result.duration = time.perf_counter() - started
+            result.events = allure.events
+            result.timings = executor.instrumentation.take_records()
+            results.append(result)
+            if suite_plan is None:
+                executor.release_session()
+        if suite_plan is not None:
+            _finish_suite(executor, suite_plan)
+            # 最后一个套件 teardown 的耗时并入分片最后一个用例的记录
+            results[-1].timings.extend(executor.instrumentation.take_records())
+    finally:
+        executor.teardown()
+        if session_pool is not None:
+            session_pool.close()
+    return results
+
+
+def _finish_suite(executor: PywinautoExecutor, plan: CasePlan) -> None:
+    """运行套件 teardown 并归还套件共享的应用实例"""
+    run_suite_teardown(executor, plan)
+    executor.release_session()
+
+
+class DistributedPlugin:
+    """将 pywinauto 测试用例分片到多个工作进程并行执行的 pytest 插件
+
+    在正常的执行循环开始前，按历史耗时把用例分配给各工作进程执行，
+    结果保存在对应的测试项上，随后由测试项在主进程中回放，
+    因此报告、Allure 结果和其他插件看到的仍是一次普通的 pytest 运行。
+    """
+
+    def __init__(self, config, workers: int, backend_options: Dict[str, Any],
+                 pool_options: Optional[Dict[str, Any]] = None):
+        self.config = config
+        self.workers = workers
+        self.backend_options = backend_options
+        self.pool_options = pool_options
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        """在执行循环开始前并行执行所有用例"""
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            return None
+        if session.config.option.collectonly:
+            return None
+
+        items = {item.nodeid: item for item in session.items if hasattr(item, 'remote_result')}
+        if not items:
+            return None
+
+        history = CaseHistory(getattr(self.config, 'cache', None))
+        shards = balance_shards(history.estimate(list(items)), self.workers)
+        logger.info("分布式执行: %s 个用例, %s 个工作进程", len(items), len(shards))
+
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = {
+                pool.submit(
+                    run_shard,
+                    index,
+                    self.backend_options,
+                    [(nodeid, items[nodeid].test_case, _suite_spec(items[nodeid])) for nodeid in shard],
+                    self.pool_options
+                ): shard
+                for index, shard in enumerate(shards)
+            }
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    # 工作进程异常退出，分片内的用例全部标记为失败
+                    logger.error("工作进程执行失败: %s", e)
+                    results = [
+                        CaseResult(nodeid=nodeid, outcome='failed', duration=0.0, worker=-1,
+                                   error=f"工作进程执行失败: {str(e)}")
+                        for nodeid in futures[future]
+                    ]
+                for result in results:
+                    items[result.nodeid].remote_result = result
+        return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """使用工作进程中的实际耗时"""
+        outcome = yield
+        report = outcome.get_result()
+        result = getattr(item, 'remote_result', None)
+        if report.when == 'call' and result is not None:
+            report.duration = result.duration
+
+
+def _suite_spec(item) -> Optional[Tuple[str, TestCase]]:
+    """返回测试项所属套件的 (标识, setup/teardown 用例)"""
+    suite = getattr(item, 'suite', None)
+    return (suite.id, suite.case) if suite is not None else None
@@ -1,4 +1,28 @@
 from .base_executor import BaseExecutor
 from .pywinauto_executor import PywinautoExecutor
+from .locator_cache import LocatorCache, LocatorCacheEntry
+from .session_pool import SessionPool, AppSession
+from .snapshot import ElementInfo, UISnapshot
+from .plan import ActionSpec, CasePlan, CompiledStep, PlanError, compile_case
+from .backends import BaseBackend, PywinautoBackend, FakeBackend, get_backend, register_backend
 
-__all__ = ['BaseExecutor', 'PywinautoExecutor']
+__all__ = [
+    'BaseExecutor',
+    'PywinautoExecutor',
+    'LocatorCache',
+    'LocatorCacheEntry',
+    'SessionPool',
+    'AppSession',
+    'ElementInfo',
+    'UISnapshot',
+    'ActionSpec',
+    'CasePlan',
+    'CompiledStep',
+    'PlanError',
+    'compile_case',
+    'BaseBackend',
+    'PywinautoBackend',
+    'FakeBackend',
+    'get_backend',
+    'register_backend',
+]
@@ -0,0 +1,37 @@
+from typing import Any, Callable, Dict
+from .base_backend import BaseBackend
+from .pywinauto_backend import PywinautoBackend
+from .fake_backend import FakeBackend, FakeApplication, FakeElement
+
+# 注册所有后端：名称 -> 后端工厂
+BACKENDS: Dict[str, Callable[..., BaseBackend]] = {
+    'uia': lambda **options: PywinautoBackend(backend='uia'),
+    'win32': lambda **options: PywinautoBackend(backend='win32'),
+    'fake': lambda tree_file=None, latency=None, **options: (
+        FakeBackend.from_file(tree_file, latency=latency) if tree_file else FakeBackend(latency=latency)
+    ),
+}
+
+
+def get_backend(name: str, **options: Any) -> BaseBackend:
+    """根据名称创建后端实例"""
+    factory = BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"不支持的后端: {name}")
+    return factory(**options)
+
+
+def register_backend(name: str, factory: Callable[..., BaseBackend]) -> None:
+    """注册自定义后端"""
+    BACKENDS[name] = factory
+
+
+__all__ = [
+    'BaseBackend',
+    'PywinautoBackend',
+    'FakeBackend',
+    'FakeApplication',
+    'FakeElement',
+    'get_backend',
+    'register_backend',
+]
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from ..snapshot import ElementInfo
+
+
+class BaseBackend(ABC):
+    """UI 后端抽象基类
+
+    执行器只通过后端接口操作应用程序、窗口和控件，
+    后端返回的应用、窗口和元素对象对执行器而言是不透明的句柄。
+    """
+
+    # 后端名称，用于日志和注册
+    name = "base"
+
+    @abstractmethod
+    def start(self, app_path: str) -> Any:
+        """启动应用程序，返回应用句柄"""
+        pass
+
+    @abstractmethod
+    def connect(self, app_path: str) -> Any:
+        """连接已运行的应用程序，未运行时抛出异常"""
+        pass
+
+    @abstractmethod
+    def kill(self, app: Any) -> None:
+        """关闭应用程序"""
+        pass
+
+    @abstractmethod
+    def main_window(self, app: Any) -> Any:
+        """获取应用程序的主窗口，并等待其可见"""
+        pass
+
+    @abstractmethod
+    def find_window(self, app: Any, title_re: str) -> Any:
+        """按标题正则查找窗口，等待其可见并激活"""
+        pass
+
+    @abstractmethod
+    def find_child(self, parent: Any, control_type: str, **criteria: Any) -> Optional[Any]:
+        """按控件类型和条件（title/auto_id/class_name）查找子孙控件，找不到时返回 None"""
+        pass
+
+    @abstractmethod
+    def find_children(self, parent: Any, control_type: str) -> List[Any]:
+        """返回指定控件类型的所有子孙控件"""
+        pass
+
+    @abstractmethod
+    def exists(self, element: Any) -> bool:
+        """检查元素是否仍然存在"""
+        pass
+
+    @abstractmethod
+    def is_enabled(self, element: Any) -> bool:
+        """检查元素是否可用"""
+        pass
+
+    @abstractmethod
+    def click(self, element: Any) -> None:
+        """点击元素"""
+        pass
+
+    @abstractmethod
+    def type_keys(self, element: Any, text: str) -> None:
+        """向元素输入按键"""
+        pass
+
+    @abstractmethod
+    def set_text(self, element: Any, text: str) -> None:
+        """设置元素文本"""
+        pass
+
+    @abstractmethod
+    def texts(self, element: Any) -> List[str]:
+        """读取元素文本"""
+        pass
+
+    def rectangle(self, element: Any) -> Optional[Tuple[int, int, int, int]]:
+        """返回元素在屏幕上的区域 (left, top, right, bottom)，用于裁剪截图，默认不支持"""
+        return None
+
+    def describe(self, element: Any) -> Dict[str, Any]:
+        """返回元素的标识信息，用于轨迹记录，默认只有元素的 repr"""
+        return {'repr': repr(element)}
+
+    def snapshot(self, window: Any) -> Optional[List[ElementInfo]]:
+        """一次遍历窗口的所有子孙控件，按深度优先顺序返回控件信息，默认不支持（返回 None）"""
+        return None
+
+    def is_alive(self, app: Any) -> bool:
+        """检查应用程序是否仍在运行且主窗口存在，会话池据此决定是否复用实例"""
+        try:
+            return self.exists(self.main_window(app))
+        except Exception:
+            return False
+
+    def reset(self, app: Any) -> None:
+        """将应用程序恢复到初始状态，供下一个测试用例复用，默认不做任何操作"""
+        pass
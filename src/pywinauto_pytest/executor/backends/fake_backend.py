@@ -0,0 +1,285 @@
+import json
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from .base_backend import BaseBackend
+from ..snapshot import ElementInfo
+
+
+class FakeElement:
+    """内存中的模拟控件"""
+
+    def __init__(
+        self,
+        control_type: str,
+        title: Optional[str] = None,
+        auto_id: Optional[str] = None,
+        class_name: Optional[str] = None,
+        texts: Optional[List[str]] = None,
+        enabled: bool = True,
+        visible: bool = True,
+        rect: Optional[List[int]] = None,
+        parent: Optional["FakeElement"] = None
+    ):
+        self.control_type = control_type
+        self.title = title
+        self.auto_id = auto_id
+        self.class_name = class_name
+        self.text_values = list(texts) if texts is not None else [title or '']
+        self.enabled = enabled
+        self.visible = visible
+        self.rect = list(rect) if rect else [0, 0, 0, 0]
+        self.parent = parent
+        self.children: List["FakeElement"] = []
+        self.alive = True
+        self.clicks = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], parent: Optional["FakeElement"] = None) -> "FakeElement":
+        """从字典构建控件树"""
+        element = cls(
+            control_type=data.get('control_type', 'Custom'),
+            title=data.get('title'),
+            auto_id=data.get('auto_id'),
+            class_name=data.get('class_name'),
+            texts=data.get('texts'),
+            enabled=data.get('enabled', True),
+            visible=data.get('visible', True),
+            rect=data.get('rect'),
+            parent=parent
+        )
+        for child_data in data.get('children', []):
+            element.children.append(cls.from_dict(child_data, parent=element))
+        return element
+
+    def descendants(self) -> Iterator["FakeElement"]:
+        """按深度优先顺序遍历子孙控件"""
+        stack = list(reversed(self.children))
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+    def matches(self, control_type: Optional[str], criteria: Dict[str, Any]) -> bool:
+        """检查控件是否匹配查找条件"""
+        if control_type is not None and self.control_type != control_type:
+            return False
+        return all(getattr(self, key, None) == value for key, value in criteria.items())
+
+    def __repr__(self) -> str:
+        return f"FakeElement({self.control_type}, title={self.title!r}, auto_id={self.auto_id!r})"
+
+
+class FakeApplication:
+    """内存中的模拟应用程序"""
+
+    def __init__(self, path: str, windows: List[FakeElement]):
+        self.path = path
+        self.windows = windows
+        self.running = True
+
+
+class FakeBackend(BaseBackend):
+    """确定性的内存 UI 树后端，用于在非 Windows 环境中运行和压测执行器
+
+    UI 树格式::
+
+        applications:
+          calc.exe:
+            windows:
+              - control_type: Window
+                title: Calculator
+                children:
+                  - {control_type: Button, title: "1", auto_id: num1Button}
+
+    也可以直接在顶层提供 ``windows``，此时任意应用路径都使用该窗口列表。
+    ``latency`` 可以是统一的秒数，也可以是按操作名配置的字典（``default`` 为缺省值）。
+    """
+
+    name = "fake"
+
+    def __init__(self, tree: Optional[Dict[str, Any]] = None, latency: Union[float, Dict[str, float], None] = None):
+        self.tree = tree or {}
+        self.latency = latency or 0.0
+        self.calls: Counter = Counter()
+        self.applications: Dict[str, FakeApplication] = {}
+
+    @classmethod
+    def from_file(cls, file_path: str, latency: Union[float, Dict[str, float], None] = None) -> "FakeBackend":
+        """从 JSON 或 YAML 文件加载 UI 树"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if file_path.lower().endswith(('.yaml', '.yml')):
+                import yaml
+                tree = yaml.safe_load(f)
+            else:
+                tree = json.load(f)
+        return cls(tree=tree, latency=latency)
+
+    def _record(self, operation: str) -> None:
+        """记录调用次数并注入延迟"""
+        self.calls[operation] += 1
+        if isinstance(self.latency, dict):
+            delay = self.latency.get(operation, self.latency.get('default', 0.0))
+        else:
+            delay = self.latency
+        if delay:
+            time.sleep(delay)
+
+    def _window_specs(self, app_path: str) -> List[Dict[str, Any]]:
+        """获取应用程序对应的窗口定义"""
+        applications = self.tree.get('applications', {})
+        if app_path in applications:
+            return applications[app_path].get('windows', [])
+        if 'windows' in self.tree:
+            return self.tree['windows']
+        raise RuntimeError(f"模拟 UI 树中没有定义应用程序: {app_path}")
+
+    def start(self, app_path: str) -> FakeApplication:
+        """启动应用程序，每次启动都从定义重新构建 UI 树"""
+        self._record('start')
+        windows = [FakeElement.from_dict(spec) for spec in self._window_specs(app_path)]
+        app = FakeApplication(app_path, windows)
+        self.applications[app_path] = app
+        return app
+
+    def connect(self, app_path: str) -> FakeApplication:
+        """连接已启动的应用程序"""
+        self._record('connect')
+        app = self.applications.get(app_path)
+        if app is None or not app.running:
+            raise RuntimeError(f"应用程序未运行: {app_path}")
+        return app
+
+    def kill(self, app: FakeApplication) -> None:
+        """关闭应用程序"""
+        self._record('kill')
+        app.running = False
+        self._discard_windows(app)
+        if self.applications.get(app.path) is app:
+            del self.applications[app.path]
+
+    def is_alive(self, app: FakeApplication) -> bool:
+        """检查应用程序是否仍在运行"""
+        self._record('is_alive')
+        return app.running and any(window.alive for window in app.windows)
+
+    def reset(self, app: FakeApplication) -> None:
+        """按 UI 树定义重新构建窗口，恢复到初始状态"""
+        self._record('reset')
+        self._discard_windows(app)
+        app.windows = [FakeElement.from_dict(spec) for spec in self._window_specs(app.path)]
+
+    def _discard_windows(self, app: FakeApplication) -> None:
+        """将应用程序的所有窗口和控件标记为失效"""
+        for window in app.windows:
+            window.alive = False
+            for element in window.descendants():
+                element.alive = False
+
+    def main_window(self, app: FakeApplication) -> FakeElement:
+        """获取主窗口"""
+        self._record('main_window')
+        for window in app.windows:
+            if window.visible:
+                return window
+        raise RuntimeError(f"应用程序没有可见窗口: {app.path}")
+
+    def find_window(self, app: FakeApplication, title_re: str) -> FakeElement:
+        """按标题正则查找窗口"""
+        self._record('find_window')
+        pattern = re.compile(title_re)
+        for window in app.windows:
+            if window.visible and pattern.match(window.title or ''):
+                return window
+        raise RuntimeError(f"找不到窗口: {title_re}")
+
+    def find_child(self, parent: FakeElement, control_type: str, **criteria: Any) -> Optional[FakeElement]:
+        """查找第一个匹配的子孙控件"""
+        self._record('find_child')
+        for element in parent.descendants():
+            if element.alive and element.matches(control_type, criteria):
+                return element
+        return None
+
+    def find_children(self, parent: FakeElement, control_type: str) -> List[FakeElement]:
+        """返回所有匹配的子孙控件"""
+        self._record('find_children')
+        return [e for e in parent.descendants() if e.alive and e.matches(control_type, {})]
+
+    def exists(self, element: FakeElement) -> bool:
+        """检查元素是否存在"""
+        self._record('exists')
+        return element.alive
+
+    def _check_alive(self, element: FakeElement) -> None:
+        """对已失效元素的操作会失败"""
+        if not element.alive:
+            raise RuntimeError(f"元素已失效: {element!r}")
+
+    def is_enabled(self, element: FakeElement) -> bool:
+        """检查元素是否可用"""
+        self._record('is_enabled')
+        self._check_alive(element)
+        return element.enabled
+
+    def click(self, element: FakeElement) -> None:
+        """点击元素"""
+        self._record('click')
+        self._check_alive(element)
+        element.clicks += 1
+
+    def type_keys(self, element: FakeElement, text: str) -> None:
+        """追加输入文本"""
+        self._record('type_keys')
+        self._check_alive(element)
+        if not element.text_values:
+            element.text_values = ['']
+        element.text_values[0] += text
+
+    def set_text(self, element: FakeElement, text: str) -> None:
+        """替换文本"""
+        self._record('set_text')
+        self._check_alive(element)
+        element.text_values = [text]
+
+    def texts(self, element: FakeElement) -> List[str]:
+        """读取文本"""
+        self._record('texts')
+        self._check_alive(element)
+        return list(element.text_values)
+
+    def rectangle(self, element: FakeElement) -> Optional[Tuple[int, int, int, int]]:
+        """返回 UI 树中定义的区域，未定义时返回 None"""
+        self._record('rectangle')
+        left, top, right, bottom = element.rect
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right, bottom
+
+    def describe(self, element: FakeElement) -> Dict[str, Any]:
+        """返回 UI 树中定义的控件属性"""
+        return {
+            'control_type': element.control_type,
+            'title': element.title,
+            'auto_id': element.auto_id,
+            'class_name': element.class_name,
+            'rect': list(element.rect),
+        }
+
+    def snapshot(self, window: FakeElement) -> List[ElementInfo]:
+        """一次遍历窗口的所有存活子孙控件"""
+        self._record('snapshot')
+        self._check_alive(window)
+        return [
+            ElementInfo(
+                control_type=e.control_type,
+                title=e.title,
+                auto_id=e.auto_id,
+                class_name=e.class_name,
+                texts=list(e.text_values),
+                rect=tuple(e.rect),
+                element=e
+            )
+            for e in window.descendants() if e.alive
+        ]
@@ -0,0 +1,190 @@
+import functools
+from typing import Any, Dict, List, Optional, Tuple
+from .base_backend import BaseBackend
+from ..snapshot import ElementInfo
+
+
+class PywinautoBackend(BaseBackend):
+    """基于 pywinauto 的后端，仅在 Windows 上可用"""
+
+    name = "uia"
+
+    def __init__(self, backend: str = "uia"):
+        self.backend = backend
+        self.name = backend
+
+    def start(self, app_path: str) -> Any:
+        """启动应用程序"""
+        from pywinauto import Application
+        return Application(backend=self.backend).start(app_path)
+
+    def connect(self, app_path: str) -> Any:
+        """连接已运行的应用程序"""
+        from pywinauto import Application
+        return Application(backend=self.backend).connect(path=app_path)
+
+    def kill(self, app: Any) -> None:
+        """关闭应用程序"""
+        app.kill()
+
+    def is_alive(self, app: Any) -> bool:
+        """检查进程是否仍在运行且主窗口存在"""
+        try:
+            return app.is_process_running() and app.top_window().exists()
+        except Exception:
+            return False
+
+    def reset(self, app: Any) -> None:
+        """关闭主窗口以外的对话框，回到主窗口"""
+        # 窗口按 Z 序排列，弹出的对话框在前，保留最底层的主窗口
+        windows = app.windows(visible_only=True)
+        for window in windows[:-1]:
+            if window.is_dialog():
+                window.close()
+        app.top_window().set_focus()
+
+    def main_window(self, app: Any) -> Any:
+        """获取应用程序的主窗口"""
+        window = app.top_window()
+        window.wait('visible')
+        return window
+
+    def find_window(self, app: Any, title_re: str) -> Any:
+        """按标题正则查找窗口"""
+        window = app.window(title_re=title_re)
+        window.wait('visible')
+        window.set_focus()
+        return window
+
+    def find_child(self, parent: Any, control_type: str, **criteria: Any) -> Optional[Any]:
+        """查找子孙控件，返回解析后的包装对象
+
+        ``child_window`` 返回的规格对象每次调用方法都会重新搜索控件树，
+        这里解析一次并返回包装对象，缓存后复用和存活检查不再重复搜索。
+        """
+        spec = parent.child_window(control_type=control_type, **criteria)
+        if not spec.exists():
+            return None
+        return spec.wrapper_object()
+
+    def find_children(self, parent: Any, control_type: str) -> List[Any]:
+        """返回所有子孙控件"""
+        return parent.child_windows(control_type=control_type)
+
+    def exists(self, element: Any) -> bool:
+        """检查元素是否仍然存在"""
+        # 窗口等规格对象的 exists() 会重新搜索；包装对象只读取一次 element_info 的可见属性，
+        # 控件已销毁时读取失败
+        if hasattr(element, 'wrapper_object'):
+            return bool(element.exists())
+        try:
+            return bool(element.is_visible())
+        except Exception:
+            return False
+
+    def is_enabled(self, element: Any) -> bool:
+        """检查元素是否可用"""
+        return element.is_enabled()
+
+    def click(self, element: Any) -> None:
+        """点击元素"""
+        element.click()
+
+    def type_keys(self, element: Any, text: str) -> None:
+        """向元素输入按键"""
+        element.type_keys(text)
+
+    def set_text(self, element: Any, text: str) -> None:
+        """设置元素文本"""
+        element.set_text(text)
+
+    def texts(self, element: Any) -> List[str]:
+        """读取元素文本"""
+        return list(element.texts())
+
+    def rectangle(self, element: Any) -> Optional[Tuple[int, int, int, int]]:
+        """返回元素在屏幕上的区域"""
+        rect = element.rectangle()
+        return rect.left, rect.top, rect.right, rect.bottom
+
+    def describe(self, element: Any) -> Dict[str, Any]:
+        """返回 element_info 中的控件属性"""
+        info = element.wrapper_object().element_info if hasattr(element, 'wrapper_object') else element.element_info
+        rect = info.rectangle
+        return {
+            'control_type': info.control_type,
+            'title': info.name,
+            'auto_id': getattr(info, 'automation_id', None),
+            'class_name': info.class_name,
+            'rect': [rect.left, rect.top, rect.right, rect.bottom],
+            'handle': info.handle,
+        }
+
+    def snapshot(self, window: Any) -> List[ElementInfo]:
+        """一次遍历窗口的所有子孙控件
+
+        uia 后端用 CacheRequest 在一次跨进程调用中取回所有控件的属性；
+        win32 后端一次遍历子孙控件，只读取 element_info 中的属性，不再逐个调用 ``texts()``。
+        """
+        wrapper = window.wrapper_object() if hasattr(window, 'wrapper_object') else window
+        if self.backend == 'uia':
+            return self._cached_snapshot(wrapper)
+        elements = []
+        for child in wrapper.descendants():
+            info = child.element_info
+            rect = info.rectangle
+            elements.append(ElementInfo(
+                control_type=info.control_type,
+                title=info.name,
+                class_name=info.class_name,
+                texts=[info.name or ''],
+                rect=(rect.left, rect.top, rect.right, rect.bottom),
+                element=child
+            ))
+        return elements
+
+    def _cached_snapshot(self, wrapper: Any) -> List[ElementInfo]:
+        """用 UI Automation 的 CacheRequest 一次取回所有子孙控件的属性
+
+        控件文本优先取 Value 模式的值（编辑框等），没有时取名称，与 ``texts()`` 的第一个文本一致。
+        包装对象在控件被定位到时才创建。
+        """
+        from pywinauto.uia_defines import IUIA
+
+        uia = IUIA()
+        properties = uia.UIA_dll
+        request = uia.iuia.CreateCacheRequest()
+        for property_id in (properties.UIA_ControlTypePropertyId, properties.UIA_NamePropertyId,
+                            properties.UIA_AutomationIdPropertyId, properties.UIA_ClassNamePropertyId,
+                            properties.UIA_BoundingRectanglePropertyId, properties.UIA_ValueValuePropertyId):
+            request.AddProperty(property_id)
+        found = wrapper.element_info.element.FindAllBuildCache(
+            uia.tree_scope['descendants'], uia.true_condition, request
+        )
+
+        elements = []
+        for index in range(found.Length if found else 0):
+            element = found.GetElement(index)
+            control_type = uia.known_control_type_ids.get(element.CachedControlType)
+            name = element.CachedName or ''
+            value = element.GetCachedPropertyValue(properties.UIA_ValueValuePropertyId)
+            rect = element.CachedBoundingRectangle
+            elements.append(ElementInfo(
+                control_type=control_type,
+                title=name,
+                auto_id=element.CachedAutomationId,
+                class_name=element.CachedClassName,
+                texts=[value if isinstance(value, str) and value else name],
+                rect=(rect.left, rect.top, rect.right, rect.bottom),
+                factory=functools.partial(_uia_wrapper, element, control_type)
+            ))
+        return elements
+
+
+def _uia_wrapper(element: Any, control_type: str) -> Any:
+    """按快照中缓存的控件类型创建 uia 包装对象，不再查询控件类型"""
+    from pywinauto.controls.uiawrapper import UIAWrapper, UiaMeta
+    from pywinauto.uia_element_info import UIAElementInfo
+
+    wrapper_class = UiaMeta.control_type_to_cls.get(control_type, UIAWrapper)
+    return wrapper_class(UIAElementInfo(element))
@@ -1,16 +1,46 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
+from .plan import ActionSpec, CompiledStep
 from ..models import TestStep
+from ..instrumentation import Instrumentation
 
 
 class BaseExecutor(ABC):
-    """执行器抽象基类"""
+    """执行器抽象基类
+
+    子类通过 ``_action_<action>`` 方法实现各个 action，并在 ``ACTION_SPECS`` 中声明 action 对步骤字段的要求，
+    测试用例在收集时据此编译为执行计划（见 ``plan.compile_case``）。
+    """
+    
+    # action 名称 -> 对步骤字段的要求
+    ACTION_SPECS: Dict[str, ActionSpec] = {}
+    
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        self.instrumentation = instrumentation or Instrumentation()
     
     @abstractmethod
     def execute_step(self, step: TestStep) -> None:
         """执行单个测试步骤"""
         pass
     
+    def execute_compiled(self, compiled: CompiledStep) -> None:
+        """执行已编译的步骤，默认按普通步骤执行"""
+        self.execute_step(compiled.step)
+    
+    @classmethod
+    def resolve_action(cls, action: str) -> Optional[Callable]:
+        """返回 action 对应的处理函数，不支持时返回 None"""
+        return getattr(cls, f"_action_{action}", None)
+    
+    @staticmethod
+    def _locator_strategies(locator: Optional[str]) -> Tuple[str, ...]:
+        """返回定位器适用的定位策略，按尝试顺序排列"""
+        return ()
+    
+    def window_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """返回当前窗口在屏幕上的区域，用于裁剪失败截图，默认不支持"""
+        return None
+    
     def setup(self) -> None:
         """执行器初始化操作"""
         pass
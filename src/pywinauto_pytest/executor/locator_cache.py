@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class LocatorCacheEntry:
+    """定位缓存条目：记录命中的定位策略及解析出的元素"""
+    strategy: str
+    element: Any
+
+
+class LocatorCache:
+    """按窗口缓存 (target, locator) 的定位结果
+
+    缓存只对绑定的窗口有效，窗口变化时整体失效；复用条目前通过
+    ``is_alive`` 回调做一次廉价的存活检查，失效的条目会被丢弃，
+    但其策略会作为提示返回，便于优先用该策略重新定位。
+    """
+
+    def __init__(self):
+        self._window: Any = None
+        self._entries: Dict[Tuple[str, Optional[str]], LocatorCacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+
+    def lookup(
+        self,
+        window: Any,
+        target: str,
+        locator: Optional[str],
+        is_alive: Callable[[Any], bool]
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """查找缓存，返回 (元素, 策略提示)
+
+        命中时返回 (元素, None)；条目已失效时返回 (None, 上次的策略)；
+        未命中时返回 (None, None)。
+        """
+        if window is not self._window:
+            self.misses += 1
+            return None, None
+
+        key = (target, locator)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+
+        if is_alive(entry.element):
+            self.hits += 1
+            return entry.element, None
+
+        # 元素已失效，丢弃条目并返回策略提示
+        del self._entries[key]
+        self.stale += 1
+        self.misses += 1
+        return None, entry.strategy
+
+    def put(self, window: Any, target: str, locator: Optional[str], strategy: str, element: Any) -> None:
+        """记录定位结果"""
+        if window is not self._window:
+            self._entries.clear()
+            self._window = window
+        self._entries[(target, locator)] = LocatorCacheEntry(strategy=strategy, element=element)
+
+    def invalidate(self, target: Optional[str], locator: Optional[str]) -> None:
+        """使单个条目失效"""
+        if self._entries.pop((target, locator), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空所有条目"""
+        if self._entries:
+            self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._window = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
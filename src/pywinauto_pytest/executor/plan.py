@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, Type
+from ..models import TestCase, TestStep
+
+
+class PlanError(ValueError):
+    """测试用例中存在无法执行的步骤"""
+
+    def __init__(self, case_name: str, problems: List[str]):
+        super().__init__(f"测试用例 '{case_name}' 无效:\n" + "\n".join(f"  - {p}" for p in problems))
+        self.case_name = case_name
+        self.problems = problems
+
+    def __reduce__(self):
+        return PlanError, (self.case_name, self.problems)
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """action 对步骤字段的要求"""
+    target: bool = False
+    locator: bool = False
+    data: Tuple[str, ...] = ()
+
+
+@dataclass
+class CompiledStep:
+    """已解析处理函数的步骤"""
+    step: TestStep
+    handler: Callable
+
+
+@dataclass
+class CasePlan:
+    """测试用例的执行计划"""
+    name: str
+    setup: List[CompiledStep] = field(default_factory=list)
+    steps: List[CompiledStep] = field(default_factory=list)
+    teardown: List[CompiledStep] = field(default_factory=list)
+
+
+def compile_case(executor_cls: Type, test_case: TestCase) -> CasePlan:
+    """将测试用例编译为执行计划，一次性报告所有无效的步骤
+
+    执行器类需要提供 ``resolve_action(action)`` 和 ``ACTION_SPECS``。
+    """
+    plan = CasePlan(name=test_case.name)
+    problems: List[str] = []
+    for section in ('setup', 'steps', 'teardown'):
+        compiled = getattr(plan, section)
+        for index, step in enumerate(getattr(test_case, section)):
+            location = f"{section}[{index}] ({step.action or '?'})"
+            step_problems = _validate(executor_cls, step)
+            if step_problems:
+                problems.extend(f"{location}: {problem}" for problem in step_problems)
+                continue
+            compiled.append(CompiledStep(step, executor_cls.resolve_action(step.action)))
+
+    if problems:
+        raise PlanError(test_case.name, problems)
+    return plan
+
+
+def _validate(executor_cls: Type, step: TestStep) -> List[str]:
+    """检查单个步骤，返回问题列表"""
+    if not step.action:
+        return ["缺少 action"]
+    if executor_cls.resolve_action(step.action) is None:
+        return [f"不支持的操作类型: {step.action}"]
+
+    spec: Optional[ActionSpec] = executor_cls.ACTION_SPECS.get(step.action)
+    if spec is None:
+        return []
+    problems = []
+    if spec.target and not step.target:
+        problems.append("缺少 target")
+    if spec.locator and not step.locator:
+        problems.append("缺少 locator")
+    missing = [key for key in spec.data if not step.data or key not in step.data]
+    if missing:
+        problems.append(f"data 缺少: {', '.join(missing)}")
+    return problems
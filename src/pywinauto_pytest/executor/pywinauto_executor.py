@@ -1,32 +1,92 @@
-import os
 import time
-from typing import Optional
-from pywinauto import Application
-from pywinauto.findwindows import find_window
+from typing import Any, Callable, Optional, Tuple
 from .base_executor import BaseExecutor
+from .backends import BaseBackend, get_backend
+from .locator_cache import LocatorCache
+from .plan import ActionSpec, CompiledStep
+from .session_pool import SessionPool
+from .snapshot import ElementInfo, UISnapshot
+from .waits import DEFAULT_TIMEOUT, INITIAL_INTERVAL, wait_until
+from ..instrumentation import Instrumentation
 from ..models import TestStep
 from ..logger import logger
 
+# 定位器为数字时才尝试按索引查找
+LOCATOR_STRATEGIES = ('title', 'auto_id', 'class_name')
+INDEX_LOCATOR_STRATEGIES = LOCATOR_STRATEGIES + ('index',)
+CONTROL_TYPE_STRATEGIES = ('control_type',)
+
+# 需要定位元素的 action
+TARGET = ActionSpec(target=True)
+
+# 不修改界面的 action，执行后保留控件树快照；其余 action 仍可从快照中定位要操作的元素，执行后丢弃快照
+READ_ONLY_ACTIONS = frozenset({'assert_text', 'assert_texts', 'assert_exists', 'assert_not_exists'})
+
 
 class PywinautoExecutor(BaseExecutor):
-    """基于 pywinauto 的 UI 操作执行器"""
+    """基于 pywinauto 的 UI 操作执行器
+
+    所有 UI 操作都通过 ``backend`` 完成，默认使用 pywinauto 的 uia 后端，
+    也可以传入 ``FakeBackend`` 等其他后端在非 Windows 环境中运行。
+    传入 ``session_pool`` 时应用程序从会话池中获取，关闭时归还给会话池复用。
+    ``snapshot`` 为当前窗口的控件树快照（见 ``capture_snapshot``），有快照时元素定位和只读断言
+    优先从快照的索引中读取，会修改界面的 action 执行后快照失效。
+    """
+    
+    ACTION_SPECS = {
+        'start_application': TARGET,
+        'click': TARGET,
+        'type': ActionSpec(target=True, data=('text',)),
+        'set_text': ActionSpec(target=True, data=('text',)),
+        'assert_text': TARGET,
+        'assert_texts': ActionSpec(data=('texts',)),
+        'assert_exists': TARGET,
+        'assert_not_exists': TARGET,
+        'wait_for': TARGET,
+        'wait_until_gone': TARGET,
+        'wait_for_text': TARGET,
+        'wait_enabled': TARGET,
+        'switch_window': ActionSpec(locator=True),
+    }
     
-    def __init__(self):
-        super().__init__()
-        self.app: Optional[Application] = None
+    def __init__(self, backend: Optional[BaseBackend] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 session_pool: Optional[SessionPool] = None):
+        super().__init__(instrumentation)
+        self.session_pool = session_pool
+        self.backend = backend or (session_pool.backend if session_pool else get_backend("uia"))
+        self.app: Any = None
         self.current_window = None
+        self.locator_cache = LocatorCache()
+        self.snapshot: Optional[UISnapshot] = None
     
     def execute_step(self, step: TestStep) -> None:
         """执行单个测试步骤"""
         self._validate_step(step)
-        logger.info(f"执行步骤: {step.action}, 目标: {step.target}, 定位器: {step.locator}")
         
         # 根据 action 执行不同的操作
-        action_method = getattr(self, f"_action_{step.action}", None)
+        action_method = self.resolve_action(step.action)
         if not action_method:
             raise NotImplementedError(f"不支持的操作类型: {step.action}")
-        
-        action_method(step)
+        self._dispatch(action_method, step)
+    
+    def execute_compiled(self, compiled: CompiledStep) -> None:
+        """执行已编译的步骤，跳过校验和处理函数查找"""
+        self._dispatch(compiled.handler, compiled.step)
+    
+    def _dispatch(self, handler: Callable, step: TestStep) -> None:
+        """调用 action 处理函数"""
+        logger.info("执行步骤: %s, 目标: %s, 定位器: %s", step.action, step.target, step.locator)
+        try:
+            handler(self, step)
+        except Exception:
+            # 操作失败时，缓存的定位结果可能已经不可信
+            if step.target:
+                self.locator_cache.invalidate(step.target, step.locator)
+            raise
+        finally:
+            if step.action not in READ_ONLY_ACTIONS:
+                self.snapshot = None
     
     def setup(self) -> None:
         """执行器初始化操作"""
@@ -37,9 +97,39 @@ class PywinautoExecutor(BaseExecutor):
         logger.info("清理 pywinauto 执行器")
         if self.app:
             try:
-                self.app.kill()
+                self._close_app()
             except Exception as e:
-                logger.warning(f"关闭应用程序失败: {str(e)}")
+                logger.warning("关闭应用程序失败: %s", e)
+    
+    def release_session(self) -> None:
+        """将仍在使用的应用实例归还给会话池，未使用会话池时不做任何操作"""
+        if self.session_pool is None or not self.app:
+            return
+        try:
+            self._close_app()
+        except Exception as e:
+            logger.warning("归还应用实例失败: %s", e)
+    
+    def window_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """返回当前窗口在屏幕上的区域，窗口不存在或后端不支持时返回 None"""
+        if not self.current_window:
+            return None
+        try:
+            return self.backend.rectangle(self.current_window)
+        except Exception as e:
+            logger.debug("获取窗口区域失败: %s", e)
+            return None
+    
+    def _close_app(self) -> None:
+        """关闭当前应用程序，使用会话池时归还实例"""
+        app, self.app = self.app, None
+        self.current_window = None
+        self.locator_cache.clear()
+        self.snapshot = None
+        if self.session_pool is not None:
+            self.session_pool.release(app)
+        else:
+            self.backend.kill(app)
     
     def _action_start_application(self, step: TestStep) -> None:
         """启动应用程序"""
@@ -47,97 +137,238 @@ class PywinautoExecutor(BaseExecutor):
             raise ValueError("启动应用程序必须指定 target")
         
         app_path = step.target
-        logger.info(f"启动应用程序: {app_path}")
+        logger.info("启动应用程序: %s", app_path)
+        
+        if self.session_pool is not None:
+            # 从会话池获取已预热的实例
+            if self.app:
+                self._close_app()
+            self.app = self.session_pool.acquire(app_path)
+            self.locator_cache.clear()
+            self.current_window = self.backend.main_window(self.app)
+            return
         
         # 检查应用程序是否已经在运行
         try:
-            self.app = Application(backend="uia").connect(path=app_path)
-            logger.info(f"应用程序 {app_path} 已经在运行，直接连接")
-        except:
+            self.app = self.backend.connect(app_path)
+            logger.info("应用程序 %s 已经在运行，直接连接", app_path)
+        except Exception:
             # 启动新的应用程序
-            self.app = Application(backend="uia").start(app_path)
-            logger.info(f"成功启动应用程序: {app_path}")
+            self.app = self.backend.start(app_path)
+            logger.info("成功启动应用程序: %s", app_path)
         
         # 获取主窗口
-        self.current_window = self.app.window(title_re="*")
-        self.current_window.wait('visible')
+        self.locator_cache.clear()
+        self.current_window = self.backend.main_window(self.app)
     
     def _action_close_application(self, step: TestStep) -> None:
         """关闭应用程序"""
         if self.app:
             logger.info("关闭应用程序")
-            self.app.kill()
-            self.app = None
-            self.current_window = None
+            self._close_app()
     
     def _action_click(self, step: TestStep) -> None:
         """点击操作"""
         element = self._find_element(step.target, step.locator)
-        element.click()
-        logger.info(f"成功点击元素: {step.target}({step.locator})")
+        self.backend.click(element)
+        logger.info("成功点击元素: %s(%s)", step.target, step.locator)
     
     def _action_type(self, step: TestStep) -> None:
         """输入文本操作"""
         element = self._find_element(step.target, step.locator)
         text = step.data.get('text', '') if step.data else ''
-        element.type_keys(text)
-        logger.info(f"成功输入文本: {text} 到元素: {step.target}({step.locator})")
+        self.backend.type_keys(element, text)
+        logger.info("成功输入文本: %s 到元素: %s(%s)", text, step.target, step.locator)
     
     def _action_set_text(self, step: TestStep) -> None:
         """设置文本操作"""
         element = self._find_element(step.target, step.locator)
         text = step.data.get('text', '') if step.data else ''
-        element.set_text(text)
-        logger.info(f"成功设置文本: {text} 到元素: {step.target}({step.locator})")
+        self.backend.set_text(element, text)
+        logger.info("成功设置文本: %s 到元素: %s(%s)", text, step.target, step.locator)
     
     def _action_assert_text(self, step: TestStep) -> None:
         """断言文本操作"""
-        element = self._find_element(step.target, step.locator)
-        actual_text = element.texts()[0] if element.texts() else ''
+        actual_text = self._read_text(step.target, step.locator)
         expected_text = step.expected or ''
         
         if actual_text != expected_text:
             raise AssertionError(f"文本断言失败: 实际值 '{actual_text}', 期望值 '{expected_text}'")
         
-        logger.info(f"文本断言成功: 实际值 '{actual_text}' == 期望值 '{expected_text}'")
+        logger.info("文本断言成功: 实际值 '%s' == 期望值 '%s'", actual_text, expected_text)
+    
+    def _action_assert_texts(self, step: TestStep) -> None:
+        """从一次控件树快照中批量断言多个元素的文本
+
+        ``data.texts`` 为 ``{target, locator, expected}`` 列表，所有不匹配的元素在一条错误信息中列出。
+        """
+        checks = step.data.get('texts') or []
+        if self._valid_snapshot() is None:
+            self.capture_snapshot()
+        
+        failures = []
+        for check in checks:
+            target, locator, expected = check.get('target'), check.get('locator'), check.get('expected')
+            expected_text = '' if expected is None else str(expected)
+            try:
+                actual_text = self._read_text(target, locator)
+            except Exception as e:
+                failures.append(f"{target}({locator}): {e}")
+                continue
+            if actual_text != expected_text:
+                failures.append(f"{target}({locator}): 实际值 '{actual_text}', 期望值 '{expected_text}'")
+        
+        if failures:
+            raise AssertionError(f"文本断言失败 {len(failures)}/{len(checks)}:\n" + "\n".join(f"  - {f}" for f in failures))
+        logger.info("批量文本断言成功: %d 个元素", len(checks))
+    
+    def _read_text(self, target: Optional[str], locator: Optional[str]) -> str:
+        """读取元素的第一个文本，优先使用快照"""
+        info = self._snapshot_lookup(target, locator)
+        if info is not None:
+            if self.instrumentation.listeners:
+                self._resolved('snapshot', target, locator, info.resolve())
+            return info.text
+        texts = self.backend.texts(self._find_element(target, locator))
+        return texts[0] if texts else ''
     
     def _action_assert_exists(self, step: TestStep) -> None:
         """断言元素存在"""
+        info = self._snapshot_lookup(step.target, step.locator)
+        if info is not None:
+            if self.instrumentation.listeners:
+                self._resolved('snapshot', step.target, step.locator, info.resolve())
+            logger.info("元素存在断言成功: %s(%s)", step.target, step.locator)
+            return
         element = self._find_element(step.target, step.locator)
-        if not element.exists():
+        if not self.backend.exists(element):
             raise AssertionError(f"元素不存在: {step.target}({step.locator})")
         
-        logger.info(f"元素存在断言成功: {step.target}({step.locator})")
+        logger.info("元素存在断言成功: %s(%s)", step.target, step.locator)
     
     def _action_assert_not_exists(self, step: TestStep) -> None:
         """断言元素不存在"""
+        if self._valid_snapshot() is not None and self._snapshot_lookup(step.target, step.locator) is None:
+            logger.info("元素不存在断言成功: %s(%s)", step.target, step.locator)
+            return
         try:
             element = self._find_element(step.target, step.locator)
-            if element.exists():
+            if self.backend.exists(element):
                 raise AssertionError(f"元素应该不存在，但实际存在: {step.target}({step.locator})")
         except Exception:
             # 找不到元素，断言成功
             pass
         
-        logger.info(f"元素不存在断言成功: {step.target}({step.locator})")
+        logger.info("元素不存在断言成功: %s(%s)", step.target, step.locator)
     
     def _action_wait(self, step: TestStep) -> None:
-        """等待操作"""
-        wait_time = int(step.data.get('time', 1)) if step.data else 1
-        logger.info(f"等待 {wait_time} 秒")
+        """固定时间等待，优先使用 wait_for 等条件等待"""
+        wait_time = float(step.data.get('time', 1)) if step.data else 1
+        logger.info("等待 %s 秒", wait_time)
         time.sleep(wait_time)
     
+    def _action_wait_for(self, step: TestStep) -> None:
+        """等待元素出现"""
+        self._wait_condition(step, lambda: self._try_find_element(step.target, step.locator) is not None,
+                             f"元素出现: {step.target}({step.locator})")
+    
+    def _action_wait_until_gone(self, step: TestStep) -> None:
+        """等待元素消失"""
+        self._wait_condition(step, lambda: self._try_find_element(step.target, step.locator) is None,
+                             f"元素消失: {step.target}({step.locator})")
+    
+    def _action_wait_for_text(self, step: TestStep) -> None:
+        """等待元素文本等于期望值"""
+        expected_text = step.expected or ''
+        
+        def condition() -> bool:
+            element = self._try_find_element(step.target, step.locator)
+            if element is None:
+                return False
+            texts = self.backend.texts(element)
+            return (texts[0] if texts else '') == expected_text
+        
+        self._wait_condition(step, condition, f"元素文本为 '{expected_text}': {step.target}({step.locator})")
+    
+    def _action_wait_enabled(self, step: TestStep) -> None:
+        """等待元素可用"""
+        def condition() -> bool:
+            element = self._try_find_element(step.target, step.locator)
+            return element is not None and self.backend.is_enabled(element)
+        
+        self._wait_condition(step, condition, f"元素可用: {step.target}({step.locator})")
+    
+    def _wait_condition(self, step: TestStep, condition: Callable[[], bool], description: str) -> None:
+        """轮询条件直到满足，超时抛出 TimeoutError
+
+        step.data 中可以指定 timeout（超时秒数）和 interval（首次轮询间隔秒数），
+        实际等待时间和超时预算记录在 instrumentation 中。
+        """
+        data = step.data or {}
+        timeout = float(data.get('timeout', DEFAULT_TIMEOUT))
+        interval = float(data.get('interval', INITIAL_INTERVAL))
+        
+        def safe_condition() -> bool:
+            # 每次轮询都观察实时界面，不使用之前的快照
+            self.snapshot = None
+            # 轮询期间元素可能刚好失效，视为条件尚未满足
+            try:
+                return condition()
+            except Exception as e:
+                logger.debug("检查等待条件失败: %s", e)
+                return False
+
+        logger.info("等待%s, 超时: %s 秒", description, timeout)
+        ok, waited = wait_until(safe_condition, timeout=timeout, interval=interval)
+        self.instrumentation.record_wait(step, waited, timeout, ok)
+        
+        if not ok:
+            raise TimeoutError(f"等待超时 ({timeout} 秒): {description}")
+        logger.info("等待结束: %s, 实际等待 %.3f/%s 秒", description, waited, timeout)
+    
     def _action_switch_window(self, step: TestStep) -> None:
         """切换窗口"""
         window_title = step.locator or ""
-        logger.info(f"切换到窗口: {window_title}")
+        logger.info("切换到窗口: %s", window_title)
         
         if self.app:
-            self.current_window = self.app.window(title_re=window_title)
-            self.current_window.wait('visible')
-            self.current_window.set_focus()
+            self.locator_cache.clear()
+            self.current_window = self.backend.find_window(self.app, window_title)
+    
+    def capture_snapshot(self) -> Optional[UISnapshot]:
+        """一次遍历当前窗口的整个控件树并保存为快照，后端不支持时返回 None"""
+        if not self.current_window:
+            raise RuntimeError("当前没有活跃窗口，请先启动应用程序")
+        
+        with self.instrumentation.lookup('capture_snapshot', 'Window', None) as span:
+            elements = self.backend.snapshot(self.current_window)
+            span.ok = elements is not None
+        if elements is None:
+            logger.debug("后端 %s 不支持控件树快照", self.backend.name)
+            self.snapshot = None
+            return None
+        self.snapshot = UISnapshot(self.current_window, elements)
+        logger.debug("已捕获控件树快照: %d 个控件", len(self.snapshot))
+        return self.snapshot
+    
+    def _valid_snapshot(self) -> Optional[UISnapshot]:
+        """返回属于当前窗口的快照，没有时返回 None"""
+        snapshot = self.snapshot
+        if snapshot is None or not self.current_window or snapshot.window is not self.current_window:
+            return None
+        return snapshot
     
-    def _find_element(self, target: Optional[str], locator: Optional[str]) -> any:
+    def _snapshot_lookup(self, target: Optional[str], locator: Optional[str]) -> Optional[ElementInfo]:
+        """从快照中查找元素，没有有效快照或快照中没有该元素时返回 None"""
+        snapshot = self._valid_snapshot()
+        if snapshot is None or not target or target.lower() == "window":
+            return None
+        with self.instrumentation.lookup('snapshot', target, locator) as span:
+            info = snapshot.find(target, locator, self._locator_strategies(locator))
+            span.ok = info is not None
+        return info
+    
+    def _find_element(self, target: Optional[str], locator: Optional[str]) -> Any:
         """查找元素"""
         if not self.current_window:
             raise RuntimeError("当前没有活跃窗口，请先启动应用程序")
@@ -145,53 +376,102 @@ class PywinautoExecutor(BaseExecutor):
         if not target:
             raise ValueError("查找元素必须指定 target")
         
-        logger.info(f"查找元素: {target}({locator})")
+        logger.debug("查找元素: %s(%s)", target, locator)
         
         # 根据 target 和 locator 查找元素
         if target.lower() == "window":
-            return self.current_window
+            return self._resolved('window', target, locator, self.current_window)
         
-        # 使用不同的定位方式查找元素
-        if locator:
-            # 尝试使用标题查找
-            try:
-                element = self.current_window.child_window(title=locator, control_type=target)
-                if element.exists():
-                    return element
-            except Exception as e:
-                logger.debug(f"使用标题查找元素失败: {str(e)}")
-            
-            # 尝试使用自动化 ID 查找
-            try:
-                element = self.current_window.child_window(auto_id=locator, control_type=target)
-                if element.exists():
-                    return element
-            except Exception as e:
-                logger.debug(f"使用自动化 ID 查找元素失败: {str(e)}")
-            
-            # 尝试使用类名查找
+        # 有快照时直接从快照的索引中查找
+        info = self._snapshot_lookup(target, locator)
+        if info is not None and info.resolve() is not None:
+            return self._resolved('snapshot', target, locator, info.element)
+        
+        # 其次复用缓存的定位结果
+        with self.instrumentation.lookup('cache', target, locator) as span:
+            element, hint = self.locator_cache.lookup(
+                self.current_window, target, locator, self._is_element_alive
+            )
+            span.ok = element is not None
+        if element is not None:
+            logger.debug("定位缓存命中: %s(%s)", target, locator)
+            return self._resolved('cache', target, locator, element)
+        
+        # 缓存条目已失效时，先尝试上次成功的策略
+        strategies = self._locator_strategies(locator)
+        if hint:
+            strategies = [hint] + [s for s in strategies if s != hint]
+        
+        # 数字定位器要依次尝试所有策略，最后还要枚举同类型的所有控件，不如一次遍历建立快照
+        if 'index' in strategies and self._valid_snapshot() is None and self.capture_snapshot() is not None:
+            strategy, info = self.snapshot.locate(target, locator, strategies)
+            if info is None:
+                raise RuntimeError(f"找不到元素: {target}({locator})")
+            if info.resolve() is not None:
+                self.locator_cache.put(self.current_window, target, locator, strategy, info.element)
+                return self._resolved(strategy, target, locator, info.element)
+        
+        for strategy in strategies:
+            with self.instrumentation.lookup(strategy, target, locator) as span:
+                element = self._locate_by(strategy, target, locator)
+                span.ok = element is not None
+            if element is not None:
+                self.locator_cache.put(self.current_window, target, locator, strategy, element)
+                return self._resolved(strategy, target, locator, element)
+        
+        raise RuntimeError(f"找不到元素: {target}({locator})")
+    
+    def _resolved(self, strategy: str, target: str, locator: Optional[str], element: Any) -> Any:
+        """通知计时监听器元素已定位（供轨迹记录使用），返回元素本身"""
+        if self.instrumentation.listeners and element is not None:
             try:
-                element = self.current_window.child_window(class_name=locator, control_type=target)
-                if element.exists():
-                    return element
+                identity = self.backend.describe(element)
             except Exception as e:
-                logger.debug(f"使用类名查找元素失败: {str(e)}")
-            
-            # 尝试使用索引查找
-            try:
+                identity = {'error': str(e)}
+            self.instrumentation.resolved(strategy, target, locator, identity)
+        return element
+    
+    def _try_find_element(self, target: Optional[str], locator: Optional[str]) -> Any:
+        """查找元素，找不到或元素已失效时返回 None"""
+        try:
+            element = self._find_element(target, locator)
+        except (RuntimeError, ValueError):
+            return None
+        return element if self._is_element_alive(element) else None
+    
+    @staticmethod
+    def _locator_strategies(locator: Optional[str]) -> Tuple[str, ...]:
+        """返回定位器适用的定位策略，按尝试顺序排列"""
+        if not locator:
+            return CONTROL_TYPE_STRATEGIES
+        if str(locator).isdigit():
+            return INDEX_LOCATOR_STRATEGIES
+        return LOCATOR_STRATEGIES
+    
+    def _locate_by(self, strategy: str, target: str, locator: Optional[str]) -> Any:
+        """使用指定策略查找元素，找不到时返回 None"""
+        try:
+            if strategy == 'index':
                 index = int(locator)
-                elements = self.current_window.child_windows(control_type=target)
+                elements = self.backend.find_children(self.current_window, target)
                 if elements and 0 <= index < len(elements):
                     return elements[index]
-            except Exception as e:
-                logger.debug(f"使用索引查找元素失败: {str(e)}")
-        else:
-            # 只使用 control_type 查找
-            try:
-                element = self.current_window.child_window(control_type=target)
-                if element.exists():
-                    return element
-            except Exception as e:
-                logger.debug(f"只使用 control_type 查找元素失败: {str(e)}")
-        
-        raise RuntimeError(f"找不到元素: {target}({locator})")
+                return None
+            
+            if strategy == 'control_type':
+                return self.backend.find_child(self.current_window, target)
+            criteria = {strategy: locator}
+            return self.backend.find_child(self.current_window, target, **criteria)
+        except Exception as e:
+            logger.debug("使用 %s 查找元素失败: %s", strategy, e)
+        return None
+    
+    def _is_element_alive(self, element: Any) -> bool:
+        """检查缓存的元素是否仍然有效
+
+        后端返回已解析的元素时（pywinauto 后端的包装对象、fake 后端的元素）只读取一次元素属性，不重新搜索控件树。
+        """
+        try:
+            return self.backend.exists(element)
+        except Exception:
+            return False
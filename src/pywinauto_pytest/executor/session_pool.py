@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from .backends import BaseBackend
+from ..logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+SESSION_POOL_PLUGIN = "pywinauto-session-pool"
+
+# 每个应用实例默认最多复用的次数
+DEFAULT_MAX_USES = 20
+
+
+@dataclass
+class AppSession:
+    """会话池中的一个应用实例"""
+    app_path: str
+    app: Any
+    uses: int = 0
+
+
+class SessionPool:
+    """按应用路径复用应用实例的会话池
+
+    ``acquire`` 优先返回空闲且健康的实例，没有时启动新实例；
+    ``release`` 在用例结束后做健康检查并恢复到初始状态，供下一个用例复用。
+    不健康、恢复失败或使用次数达到 ``max_uses`` 的实例会被关闭。
+    ``reset`` 默认调用后端的 ``reset``，可以传入自定义的 ``reset(backend, app)``。
+    """
+
+    def __init__(self, backend: BaseBackend, max_uses: int = DEFAULT_MAX_USES,
+                 reset: Optional[Callable[[BaseBackend, Any], None]] = None):
+        self.backend = backend
+        self.max_uses = max(1, max_uses)
+        self.reset = reset or (lambda backend, app: backend.reset(app))
+        self.idle: Dict[str, List[AppSession]] = {}
+        self.in_use: Dict[int, AppSession] = {}
+        self.starts = 0
+        self.reuses = 0
+        self.recycled = 0
+
+    def acquire(self, app_path: str) -> Any:
+        """获取应用实例，优先复用空闲实例"""
+        sessions = self.idle.get(app_path, [])
+        while sessions:
+            session = sessions.pop()
+            if self._healthy(session):
+                self.reuses += 1
+                logger.info("复用应用实例: %s, 已使用 %s 次", app_path, session.uses)
+                return self._lend(session)
+            self._kill(session, "健康检查失败")
+
+        logger.info("会话池启动新的应用实例: %s", app_path)
+        session = AppSession(app_path=app_path, app=self.backend.start(app_path))
+        self.starts += 1
+        return self._lend(session)
+
+    def release(self, app: Any) -> None:
+        """归还应用实例，决定复用还是关闭"""
+        session = self.in_use.pop(id(app), None)
+        if session is None:
+            # 不是会话池启动的实例，直接关闭
+            self.backend.kill(app)
+            return
+
+        if session.uses >= self.max_uses:
+            self._kill(session, f"已达到最大使用次数 {self.max_uses}")
+            return
+        if not self._healthy(session):
+            self._kill(session, "健康检查失败")
+            return
+        try:
+            self.reset(self.backend, app)
+        except Exception as e:
+            self._kill(session, f"恢复初始状态失败: {str(e)}")
+            return
+        self.idle.setdefault(session.app_path, []).append(session)
+
+    def close(self) -> None:
+        """关闭所有应用实例"""
+        sessions = [s for idle in self.idle.values() for s in idle] + list(self.in_use.values())
+        self.idle.clear()
+        self.in_use.clear()
+        for session in sessions:
+            try:
+                self.backend.kill(session.app)
+            except Exception as e:
+                logger.warning("关闭应用实例失败: %s, 错误: %s", session.app_path, e)
+
+    def _lend(self, session: AppSession) -> Any:
+        """借出实例并增加使用次数"""
+        session.uses += 1
+        self.in_use[id(session.app)] = session
+        return session.app
+
+    def _healthy(self, session: AppSession) -> bool:
+        """检查实例是否仍可使用"""
+        try:
+            return self.backend.is_alive(session.app)
+        except Exception:
+            return False
+
+    def _kill(self, session: AppSession, reason: str) -> None:
+        """关闭实例"""
+        logger.info("回收应用实例: %s, 原因: %s", session.app_path, reason)
+        self.recycled += 1
+        try:
+            self.backend.kill(session.app)
+        except Exception as e:
+            logger.warning("关闭应用实例失败: %s, 错误: %s", session.app_path, e)
+
+
+class SessionPoolPlugin:
+    """在整个测试会话中共享应用会话池的 pytest 插件"""
+
+    def __init__(self, pool: SessionPool):
+        self.pool = pool
+
+    def pytest_sessionfinish(self, session):
+        """会话结束时关闭所有应用实例"""
+        self.pool.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出会话池统计"""
+        pool = self.pool
+        if pool.starts:
+            terminalreporter.write_line(
+                f"pywinauto 应用会话池: 启动 {pool.starts} 次, 复用 {pool.reuses} 次, 回收 {pool.recycled} 次"
+            )
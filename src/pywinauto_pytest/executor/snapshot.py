@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class ElementInfo:
+    """快照中的一个控件：一次遍历时读取的属性、文本、区域和后端元素句柄
+
+    后端可以只提供 ``factory``，在第一次调用 ``resolve`` 时才创建元素句柄，
+    快照中没有被定位到的控件不需要创建。
+    """
+    control_type: str
+    title: Optional[str] = None
+    auto_id: Optional[str] = None
+    class_name: Optional[str] = None
+    texts: List[str] = field(default_factory=list)
+    rect: Optional[Tuple[int, int, int, int]] = None
+    element: Any = None
+    factory: Optional[Callable[[], Any]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """第一个文本，与 ``assert_text`` 比较的值相同"""
+        return self.texts[0] if self.texts else ''
+
+    def resolve(self) -> Any:
+        """返回后端元素句柄，需要时用 ``factory`` 创建"""
+        if self.element is None and self.factory is not None:
+            self.element, self.factory = self.factory(), None
+        return self.element
+
+
+# 建立哈希索引的控件属性，与执行器的按条件定位策略一一对应
+INDEXED_ATTRIBUTES = ('title', 'auto_id', 'class_name')
+
+
+class UISnapshot:
+    """窗口控件树的内存快照
+
+    由后端一次遍历窗口的所有子孙控件构建。快照按控件类型分组并保持深度优先顺序（用于 index 定位），
+    并为 ``(控件类型, 属性, 值)`` 建立哈希索引，同一键对应多个控件时保留遍历顺序中的第一个，
+    与实时的 ``find_child`` 结果一致。每次查找都是常数时间，不随控件树大小增长。
+    快照不会随界面变化更新，由执行器决定何时丢弃。
+    """
+
+    def __init__(self, window: Any, elements: Iterable[ElementInfo]):
+        self.window = window
+        self.elements: List[ElementInfo] = list(elements)
+        self._by_type: Dict[str, List[ElementInfo]] = {}
+        self._index: Dict[Tuple[str, str, str], ElementInfo] = {}
+        for info in self.elements:
+            self._by_type.setdefault(info.control_type, []).append(info)
+            for attribute in INDEXED_ATTRIBUTES:
+                value = getattr(info, attribute)
+                if value is not None:
+                    self._index.setdefault((info.control_type, attribute, value), info)
+
+    def locate(self, control_type: str, locator: Optional[str],
+               strategies: Sequence[str]) -> Tuple[Optional[str], Optional[ElementInfo]]:
+        """按定位策略的顺序查找控件，返回 (命中的策略, 控件)，找不到时返回 (None, None)"""
+        candidates = self._by_type.get(control_type)
+        if not candidates:
+            return None, None
+        for strategy in strategies:
+            if strategy == 'control_type':
+                return strategy, candidates[0]
+            if strategy == 'index':
+                index = int(locator)
+                if 0 <= index < len(candidates):
+                    return strategy, candidates[index]
+                continue
+            info = self._index.get((control_type, strategy, str(locator)))
+            if info is not None:
+                return strategy, info
+        return None, None
+
+    def find(self, control_type: str, locator: Optional[str], strategies: Sequence[str]) -> Optional[ElementInfo]:
+        """按定位策略的顺序查找控件，找不到时返回 None"""
+        return self.locate(control_type, locator, strategies)[1]
+
+    def __len__(self) -> int:
+        return len(self.elements)
@@ -0,0 +1,36 @@
+import time
+from typing import Callable, Tuple
+
+# 默认等待超时（秒）
+DEFAULT_TIMEOUT = 10.0
+
+# 首次轮询间隔（秒），之后按 BACKOFF 倍数增长，最大不超过 MAX_INTERVAL
+INITIAL_INTERVAL = 0.05
+MAX_INTERVAL = 1.0
+BACKOFF = 1.5
+
+
+def wait_until(
+    condition: Callable[[], bool],
+    timeout: float = DEFAULT_TIMEOUT,
+    interval: float = INITIAL_INTERVAL,
+    max_interval: float = MAX_INTERVAL,
+    backoff: float = BACKOFF,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep
+) -> Tuple[bool, float]:
+    """轮询条件直到满足或超时，返回 (是否满足, 实际等待秒数)
+
+    轮询间隔从 ``interval`` 开始按 ``backoff`` 倍数增长，条件很快满足时只需等待很短的时间，
+    长时间等待时也不会过于频繁地访问 UI。最后一次等待不会超过截止时间。
+    """
+    started = clock()
+    deadline = started + timeout
+    while True:
+        if condition():
+            return True, clock() - started
+        now = clock()
+        if now >= deadline:
+            return False, now - started
+        sleep(min(interval, deadline - now))
+        interval = min(interval * backoff, max_interval)
@@ -1,13 +1,12 @@
 import pytest
 from typing import Optional
-from .executor.pywinauto_executor import PywinautoExecutor
-from .allure_integration import AllureIntegration
+from .plugin import create_allure, create_executor
 
 
 @pytest.fixture(scope="session")
-def pywinauto_executor():
+def pywinauto_executor(request):
     """pywinauto 执行器 fixture，会话级别"""
-    executor = PywinautoExecutor()
+    executor = create_executor(request.config)
     executor.setup()
     yield executor
     executor.teardown()
@@ -24,9 +23,11 @@ def app(pywinauto_executor):
 
 
 @pytest.fixture(scope="function")
-def allure_integration():
-    """Allure 报告集成 fixture"""
-    return AllureIntegration()
+def allure_integration(request):
+    """Allure 报告集成 fixture，测试结束时添加后台编码的截图"""
+    integration = create_allure(request.config, request.node.nodeid)
+    yield integration
+    integration.flush()
 
 
 @pytest.fixture(scope="function")
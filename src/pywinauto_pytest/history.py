@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional
+from .logger import logger
+
+# pytest 缓存中保存执行历史的键
+HISTORY_CACHE_KEY = "pywinauto/history"
+
+# 注册到 pytest 插件管理器时使用的名称
+HISTORY_PLUGIN = "pywinauto-history"
+
+# 每个用例保留的历史耗时数量
+MAX_DURATIONS = 5
+
+
+class CaseHistory:
+    """测试用例执行历史，按 nodeid 记录最近的耗时和结果，保存在 pytest 缓存中"""
+
+    def __init__(self, cache: Any = None):
+        self.cache = cache
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if cache is not None:
+            self.entries = cache.get(HISTORY_CACHE_KEY, {})
+
+    def duration(self, nodeid: str) -> Optional[float]:
+        """返回用例最近几次耗时的平均值，没有历史时返回 None"""
+        durations = self.entries.get(nodeid, {}).get('durations')
+        if not durations:
+            return None
+        return sum(durations) / len(durations)
+
+    def estimate(self, nodeids: List[str], default: float = 1.0) -> Dict[str, float]:
+        """估算用例耗时，没有历史的用例使用已知耗时的平均值"""
+        known = {nodeid: self.duration(nodeid) for nodeid in nodeids}
+        values = [d for d in known.values() if d is not None]
+        fallback = sum(values) / len(values) if values else default
+        return {nodeid: fallback if d is None else d for nodeid, d in known.items()}
+
+    def record(self, nodeid: str, duration: Optional[float], outcome: str,
+               fingerprint: Optional[str] = None) -> None:
+        """记录一次执行结果，``fingerprint`` 为执行时测试用例内容的指纹
+
+        ``duration`` 为 None 时只更新结果，不计入历史耗时。
+        """
+        entry = self.entries.setdefault(nodeid, {})
+        durations = entry.setdefault('durations', [])
+        if duration is not None:
+            durations.append(round(duration, 4))
+            del durations[:-MAX_DURATIONS]
+        entry['outcome'] = outcome
+        if fingerprint is not None:
+            entry['fingerprint'] = fingerprint
+
+    def is_unchanged(self, nodeid: str, fingerprint: str) -> bool:
+        """用例上次执行通过且内容没有变化"""
+        entry = self.entries.get(nodeid)
+        return bool(entry) and entry.get('outcome') == 'passed' and entry.get('fingerprint') == fingerprint
+
+    def save(self) -> None:
+        """写回 pytest 缓存"""
+        if self.cache is None:
+            return
+        try:
+            self.cache.set(HISTORY_CACHE_KEY, self.entries)
+        except Exception as e:
+            logger.warning("保存执行历史失败: %s", e)
+
+
+class HistoryPlugin:
+    """记录 pywinauto 测试用例耗时和结果的 pytest 插件"""
+
+    def __init__(self, config):
+        self.history = CaseHistory(getattr(config, 'cache', None))
+        self.items: Dict[str, Any] = {}
+
+    def pytest_collection_modifyitems(self, items):
+        """记录需要跟踪的 pywinauto 测试用例"""
+        self.items = {item.nodeid: item for item in items if hasattr(item, 'test_case')}
+
+    def pytest_runtest_logreport(self, report):
+        """记录用例的执行耗时、结果和内容指纹
+
+        setup 和 teardown 阶段出错或被跳过（例如测试套件 setup 失败）时只记录结果，
+        这些用例没有执行 call 阶段，下次增量执行时不会被当作已通过。
+        """
+        item = self.items.get(report.nodeid)
+        if item is None:
+            return
+        if report.when == 'call':
+            self.history.record(report.nodeid, report.duration, report.outcome, item.fingerprint)
+        elif report.outcome != 'passed':
+            self.history.record(report.nodeid, None, report.outcome, item.fingerprint)
+
+    def pytest_sessionfinish(self, session):
+        """会话结束时保存历史"""
+        self.history.save()
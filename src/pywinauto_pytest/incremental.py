@@ -0,0 +1,64 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from .history import CaseHistory
+from .models import TestCase, TestStep
+
+# 注册到 pytest 插件管理器时使用的名称
+INCREMENTAL_PLUGIN = "pywinauto-incremental"
+
+
+def fingerprint(test_case: TestCase, params: Optional[Dict[str, Any]] = None,
+                suite: Optional[TestCase] = None) -> str:
+    """计算测试用例内容的指纹
+
+    只包含影响执行结果的内容：setup、steps、teardown 中每个步骤的 action、target、locator、
+    expected 和 data，数据驱动用例的数据行，以及所属测试套件的 setup/teardown 步骤
+    （``suite`` 为 ``suite_case`` 包装的套件用例）。名称、描述和标签的变化不会改变指纹。
+    """
+    content = {
+        'setup': [_normalize(step) for step in test_case.setup],
+        'steps': [_normalize(step) for step in test_case.steps],
+        'teardown': [_normalize(step) for step in test_case.teardown],
+        'params': params,
+        'suite_setup': [_normalize(step) for step in suite.setup] if suite is not None else [],
+        'suite_teardown': [_normalize(step) for step in suite.teardown] if suite is not None else [],
+    }
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _normalize(step: TestStep) -> List[Any]:
+    """将步骤转换为可以稳定序列化的列表"""
+    return [step.action, step.target, step.locator, step.expected, step.data or None]
+
+
+class IncrementalPlugin:
+    """只执行新增、内容有变化或上次未通过的测试用例的 pytest 插件
+
+    测试用例的内容指纹和上次的执行结果由 ``HistoryPlugin`` 记录在执行历史中，
+    上次通过且指纹相同的用例在收集后被取消选择。
+    """
+
+    def __init__(self, config, history: CaseHistory):
+        self.config = config
+        self.history = history
+        self.unchanged = 0
+
+    def pytest_collection_modifyitems(self, config, items):
+        """取消选择未变化的用例"""
+        selected, deselected = [], []
+        for item in items:
+            if hasattr(item, 'fingerprint') and self.history.is_unchanged(item.nodeid, item.fingerprint):
+                deselected.append(item)
+            else:
+                selected.append(item)
+        if not deselected:
+            return
+        self.unchanged = len(deselected)
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出跳过的用例数量"""
+        terminalreporter.write_line(f"pywinauto 增量执行: 跳过 {self.unchanged} 个未变化的测试用例")
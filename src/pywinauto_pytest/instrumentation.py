@@ -0,0 +1,242 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+import pytest
+from .models import TestStep
+from .logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+INSTRUMENTATION_PLUGIN = "pywinauto-instrumentation"
+
+
+@dataclass
+class TimingRecord:
+    """一次计时记录
+
+    kind 为 step（测试步骤）、lookup（定位策略尝试）、phase（setup/steps/teardown 阶段）
+    或 wait（条件等待），name 分别为 action、定位策略名称、阶段名称或等待 action。
+    条件等待的 budget 为超时时间，duration 为实际等待的时间。区间内抛出异常时 error 为异常信息。
+    """
+    kind: str
+    name: str
+    duration: float
+    case: Optional[str] = None
+    phase: Optional[str] = None
+    target: Optional[str] = None
+    locator: Optional[str] = None
+    ok: bool = True
+    budget: Optional[float] = None
+    error: Optional[str] = None
+
+
+class Span:
+    """计时中的区间，调用方可以在区间结束前修改 ok"""
+
+    def __init__(self, record: TimingRecord):
+        self.record = record
+        self.ok = True
+
+
+class Instrumentation:
+    """记录测试步骤、定位策略和执行阶段耗时的计时器
+
+    监听器是实现了 ``before_step(step)``、``after_step(step, record)``、
+    ``before_lookup(strategy, target, locator)``、``after_lookup(record)``、
+    ``after_resolve(strategy, target, locator, element)`` 中任意方法的对象，通过 ``add_listener`` 注册。
+    ``keep_records`` 为 False 时只通知监听器，不保存记录，用于没有启用计时的长时间会话。
+    """
+
+    def __init__(self, keep_records: bool = True):
+        self.keep_records = keep_records
+        self.records: List[TimingRecord] = []
+        self.listeners: List[Any] = []
+        self.current_case: Optional[str] = None
+        self.current_phase: Optional[str] = None
+
+    def add_listener(self, listener: Any) -> None:
+        """注册监听器"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Any) -> None:
+        """移除监听器"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _emit(self, event: str, *args) -> None:
+        """通知监听器，监听器中的异常只记录警告，不影响测试执行"""
+        for listener in self.listeners:
+            callback = getattr(listener, event, None)
+            if callback is None:
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.warning("计时监听器 %s 执行失败: %s", event, e)
+
+    @contextmanager
+    def case(self, name: str) -> Iterator[None]:
+        """标记当前执行的测试用例"""
+        previous, self.current_case = self.current_case, name
+        try:
+            yield
+        finally:
+            self.current_case = previous
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Span]:
+        """记录 setup/steps/teardown 阶段的耗时"""
+        previous, self.current_phase = self.current_phase, name
+        span = Span(TimingRecord(kind='phase', name=name, duration=0.0, case=self.current_case))
+        try:
+            with self._measure(span):
+                yield span
+        finally:
+            self.current_phase = previous
+
+    @contextmanager
+    def step(self, step: TestStep) -> Iterator[Span]:
+        """记录单个测试步骤的耗时"""
+        span = Span(TimingRecord(
+            kind='step', name=step.action, duration=0.0, case=self.current_case,
+            phase=self.current_phase, target=step.target, locator=step.locator
+        ))
+        self._emit('before_step', step)
+        try:
+            with self._measure(span):
+                yield span
+        finally:
+            self._emit('after_step', step, span.record)
+
+    @contextmanager
+    def lookup(self, strategy: str, target: str, locator: Optional[str]) -> Iterator[Span]:
+        """记录一次定位策略尝试的耗时，找不到元素时调用方应将 ok 设为 False"""
+        span = Span(TimingRecord(
+            kind='lookup', name=strategy, duration=0.0, case=self.current_case,
+            phase=self.current_phase, target=target, locator=locator
+        ))
+        self._emit('before_lookup', strategy, target, locator)
+        try:
+            with self._measure(span):
+                yield span
+        finally:
+            self._emit('after_lookup', span.record)
+
+    def resolved(self, strategy: str, target: str, locator: Optional[str], element: Dict[str, Any]) -> None:
+        """通知监听器元素已定位，element 为后端给出的元素标识（见 ``BaseBackend.describe``）"""
+        self._emit('after_resolve', strategy, target, locator, element)
+
+    def record_wait(self, step: TestStep, waited: float, budget: float, ok: bool) -> TimingRecord:
+        """记录一次条件等待的实际等待时间和超时预算"""
+        record = TimingRecord(
+            kind='wait', name=step.action, duration=waited, case=self.current_case,
+            phase=self.current_phase, target=step.target, locator=step.locator, ok=ok, budget=budget
+        )
+        if self.keep_records:
+            self.records.append(record)
+        return record
+
+    @contextmanager
+    def _measure(self, span: Span) -> Iterator[None]:
+        """测量区间耗时并保存记录，区间内抛出异常时标记为失败"""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            span.ok = False
+            span.record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.record.duration = time.perf_counter() - started
+            span.record.ok = span.ok
+            if self.keep_records:
+                self.records.append(span.record)
+
+    def take_records(self) -> List[TimingRecord]:
+        """取出并清空已有的记录"""
+        records, self.records = self.records, []
+        return records
+
+    def extend(self, records: List[TimingRecord]) -> None:
+        """合并其他进程中产生的记录"""
+        if self.keep_records:
+            self.records.extend(records)
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """按 action、定位策略、阶段和条件等待汇总耗时，并列出最慢的步骤
+
+        条件等待额外汇总超时预算和实际等待时间占预算的最大比例（max_ratio），用于收紧超时设置。
+        """
+        groups: Dict[str, Dict[str, Dict[str, Any]]] = {'actions': {}, 'strategies': {}, 'phases': {}, 'waits': {}}
+        keys = {'step': 'actions', 'lookup': 'strategies', 'phase': 'phases', 'wait': 'waits'}
+        for record in self.records:
+            stats = groups[keys[record.kind]].setdefault(
+                record.name, {'count': 0, 'failed': 0, 'total': 0.0, 'max': 0.0}
+            )
+            stats['count'] += 1
+            stats['failed'] += 0 if record.ok else 1
+            stats['total'] += record.duration
+            stats['max'] = max(stats['max'], record.duration)
+            if record.budget:
+                stats['budget'] = stats.get('budget', 0.0) + record.budget
+                stats['max_ratio'] = max(stats.get('max_ratio', 0.0), record.duration / record.budget)
+
+        for group in groups.values():
+            for stats in group.values():
+                stats['mean'] = stats['total'] / stats['count']
+
+        steps = [record for record in self.records if record.kind == 'step']
+        slowest = sorted(steps, key=lambda r: r.duration, reverse=True)[:top]
+        return dict(groups, slowest=[asdict(record) for record in slowest])
+
+    def write_json(self, path: str, top: int = 10) -> None:
+        """将汇总结果和所有记录写入 JSON 文件"""
+        data = self.summary(top)
+        data['records'] = [asdict(record) for record in self.records]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def format_slowest(self, top: int = 10) -> List[str]:
+        """格式化最慢步骤表格"""
+        slowest = self.summary(top)['slowest']
+        if not slowest:
+            return []
+        lines = [f"{'耗时(s)':>10}  {'action':<20} {'目标':<30} 测试用例"]
+        for record in slowest:
+            target = f"{record['target'] or ''}({record['locator'] or ''})"
+            lines.append(
+                f"{record['duration']:>10.4f}  {record['name']:<20} {target:<30} {record['case'] or ''}"
+            )
+        return lines
+
+
+class InstrumentationPlugin:
+    """收集 pywinauto 步骤耗时并在会话结束时输出汇总的 pytest 插件"""
+
+    def __init__(self, config, output: Optional[str], top: int = 10):
+        self.config = config
+        self.output = output
+        self.top = top
+        self.instrumentation = Instrumentation()
+
+    def pytest_sessionfinish(self, session):
+        """写出 JSON 汇总"""
+        if not self.output:
+            return
+        try:
+            self.instrumentation.write_json(self.output, self.top)
+        except Exception as e:
+            logger.warning("写入计时汇总失败: %s", e)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出最慢步骤表格"""
+        lines = self.instrumentation.format_slowest(self.top)
+        if not lines:
+            return
+        terminalreporter.write_sep("=", f"pywinauto 最慢的 {len(lines) - 1} 个步骤")
+        for line in lines:
+            terminalreporter.write_line(line)
+        if self.output:
+            terminalreporter.write_line(f"计时汇总已写入: {self.output}")
@@ -1,9 +1,16 @@
+import copy
+import json
 import logging
 import logging.config
 import os
+import queue
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 
-# 默认日志配置
+# 默认日志配置，logger 的级别取处理器中最低的级别（见 setup_logging）
 DEFAULT_LOG_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -24,7 +31,7 @@ DEFAULT_LOG_CONFIG = {
         },
         'file': {
             'class': 'logging.FileHandler',
-            'level': 'DEBUG',
+            'level': 'INFO',
             'formatter': 'detailed',
             'filename': 'pywinauto-pytest.log',
             'mode': 'a',
@@ -33,7 +40,7 @@ DEFAULT_LOG_CONFIG = {
     },
     'loggers': {
         'pywinauto_pytest': {
-            'level': 'DEBUG',
+            'level': 'INFO',
             'handlers': ['console', 'file'],
             'propagate': False
         }
@@ -56,12 +63,16 @@ def setup_logging(config_path=None, log_level=None):
             print("Using default logging configuration instead.")
     
     # 否则使用默认配置
-    config = DEFAULT_LOG_CONFIG.copy()
+    config = copy.deepcopy(DEFAULT_LOG_CONFIG)
     
-    # 如果指定了日志级别，则覆盖默认级别
+    # 如果指定了日志级别，则覆盖处理器的默认级别
     if log_level:
         config['handlers']['console']['level'] = log_level
-        config['loggers']['pywinauto_pytest']['level'] = log_level
+        config['handlers']['file']['level'] = log_level
+    
+    # logger 的级别取处理器中最低的级别，所有处理器都不输出的日志在创建记录之前就被过滤
+    lowest = min(logging.getLevelName(handler['level']) for handler in config['handlers'].values())
+    config['loggers']['pywinauto_pytest']['level'] = logging.getLevelName(lowest)
     
     # 配置日志系统
     logging.config.dictConfig(config)
@@ -71,3 +82,149 @@ setup_logging()
 
 # 创建并导出 logger 实例
 logger = logging.getLogger('pywinauto_pytest')
+
+# 注册到 pytest 插件管理器时使用的名称
+LOG_PIPELINE_PLUGIN = "pywinauto-log-pipeline"
+
+# 当前测试用例和步骤的关联字段（test、test_id、step、step_id）
+_log_context: ContextVar[Dict[str, Any]] = ContextVar('pywinauto_log_context', default={})
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """在上下文中为日志记录附加关联字段，嵌套时合并外层的字段"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """把当前的关联字段写入日志记录，需要在产生日志的线程中执行"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.__dict__.update(_log_context.get())
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """将日志记录格式化为一行 JSON，包含测试用例和步骤的关联字段"""
+
+    CONTEXT_FIELDS = ('test', 'test_id', 'step', 'step_id')
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'file': record.filename,
+            'line': record.lineno,
+        }
+        for name in self.CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _PipelineHandler(QueueHandler):
+    """把日志记录放入队列的处理器
+
+    分布式执行时工作进程由主进程 fork 而来，没有后台监听线程，此时直接交给目标处理器处理。
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue", handlers: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.handlers = handlers
+        self.pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """只复制日志记录，消息插值和异常格式化留给后台线程中的处理器
+
+        标准库的 ``QueueHandler.prepare`` 会在测试线程中调用 ``format``，这里保留 args 和 exc_info。
+        """
+        return copy.copy(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if os.getpid() == self.pid:
+            super().emit(record)
+            return
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class LogPipeline:
+    """非阻塞的日志管道
+
+    启用后 ``pywinauto_pytest`` logger 的处理器替换为一个队列处理器，
+    格式化和磁盘 I/O 由后台监听线程完成，测试线程只负责把日志记录放入队列。
+    传入 ``json_file`` 时额外写入 JSON Lines 格式的结构化日志，
+    每条记录带有 ``log_context`` 设置的测试用例和步骤关联字段。
+    ``use_queue`` 为 False 时只添加结构化日志，仍同步写入。
+    """
+
+    def __init__(self, target: logging.Logger, json_file: Optional[str] = None, use_queue: bool = True):
+        self.logger = target
+        self.json_file = json_file
+        self.use_queue = use_queue
+        self._handlers: List[logging.Handler] = []
+        self._installed: List[logging.Handler] = []
+        self._json_handler: Optional[logging.Handler] = None
+        self._filter = ContextFilter()
+        self._listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        """替换 logger 的处理器并启动后台监听线程"""
+        self._handlers = list(self.logger.handlers)
+        handlers = list(self._handlers)
+        if self.json_file:
+            self._json_handler = logging.FileHandler(self.json_file, mode='a', encoding='utf-8')
+            self._json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(self._json_handler)
+
+        if self.use_queue:
+            # 关联字段保存在测试线程的上下文中，必须在放入队列之前写入日志记录
+            log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+            self._installed = [_PipelineHandler(log_queue, handlers)]
+            self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+        else:
+            self._installed = handlers
+        for handler in self._installed:
+            handler.addFilter(self._filter)
+
+        for handler in self._handlers:
+            self.logger.removeHandler(handler)
+        for handler in self._installed:
+            self.logger.addHandler(handler)
+
+    def stop(self) -> None:
+        """写完队列中剩余的日志，停止后台监听线程并恢复原来的处理器"""
+        for handler in self._installed:
+            self.logger.removeHandler(handler)
+            handler.removeFilter(self._filter)
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._json_handler is not None:
+            self._json_handler.close()
+            self._json_handler = None
+        for handler in self._handlers:
+            self.logger.addHandler(handler)
+        self._installed = []
+
+
+class LogPipelinePlugin:
+    """在测试会话结束时停止日志管道的 pytest 插件"""
+
+    def __init__(self, pipeline: LogPipeline):
+        self.pipeline = pipeline
+
+    def pytest_unconfigure(self, config):
+        """写完剩余的日志并恢复原来的处理器"""
+        self.pipeline.stop()
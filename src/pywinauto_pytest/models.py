@@ -1,29 +1,104 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
 
 
+class FrozenDict(dict):
+    """只读字典，用于在所有没有数据的步骤之间共享同一个空 data"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("步骤数据为只读，请为步骤设置新的 data 字典")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return _frozen_dict, (dict(self),)
+
+
+def _frozen_dict(items: Dict[str, Any]) -> FrozenDict:
+    """反序列化时复用共享的空字典"""
+    return FrozenDict(items) if items else EMPTY_DATA
+
+
+# 所有没有数据的步骤共享的空 data
+EMPTY_DATA = FrozenDict()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """驻留字符串，重复出现的 action/target/locator 只保留一份"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _slotted(cls):
+    """为 dataclass 重新生成带 __slots__ 的类，实例不再持有 __dict__
+
+    等价于 Python 3.10 的 ``dataclass(slots=True)``，兼容更早的版本。
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
 @dataclass
 class TestStep:
-    """测试步骤数据模型"""
+    """测试步骤数据模型
+
+    action/target/locator 在创建时驻留，空 data 共享只读的 EMPTY_DATA，
+    生成大量步骤时可以显著减少内存占用。
+    """
     action: str
     target: Optional[str] = None
     locator: Optional[str] = None
     expected: Optional[str] = None
-    data: Optional[Dict[str, Any]] = field(default_factory=dict)
+    data: Optional[Dict[str, Any]] = field(default_factory=lambda: EMPTY_DATA)
     description: Optional[str] = None
 
+    def __post_init__(self):
+        self.action = _intern(self.action)
+        self.target = _intern(self.target)
+        self.locator = _intern(self.locator)
+        if self.data is not None and not self.data and self.data is not EMPTY_DATA:
+            self.data = EMPTY_DATA
+
 
+@_slotted
+@dataclass
+class Dataset:
+    """数据驱动测试用例的数据集
+
+    rows 为内联的数据行；file 为 CSV 或 Excel 文件的绝对路径，sheet 为 Excel 工作表名称（默认活动工作表）。
+    """
+    rows: Optional[List[Dict[str, Any]]] = None
+    file: Optional[str] = None
+    sheet: Optional[str] = None
+
+
+@_slotted
 @dataclass
 class TestCase:
-    """测试用例数据模型"""
+    """测试用例数据模型
+
+    指定 dataset 时测试用例是一个模板，收集时按数据集的每一行展开为一个测试项，
+    步骤中的 ``${变量}`` 由数据行中的同名列替换。
+    """
     name: str
     steps: List[TestStep]
     teardown: List[TestStep] = field(default_factory=list)
     setup: List[TestStep] = field(default_factory=list)
     tags: List[str] = field(default_factory=list)
     description: Optional[str] = None
+    dataset: Optional[Dataset] = None
 
 
+@_slotted
 @dataclass
 class TestSuite:
     """测试套件数据模型"""
@@ -0,0 +1,93 @@
+import fnmatch
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import pytest
+from .models import TestSuite
+from .parser import get_parser
+from .parser.base_parser import BaseParser
+from .suite_cache import SUITE_CACHE_PLUGIN
+from .logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+PARALLEL_COLLECT_PLUGIN = "pywinauto-parallel-collect"
+
+
+def _parse_file(parser: BaseParser, file_path: str) -> Tuple[str, Optional[List[TestSuite]], Optional[Exception]]:
+    """在工作进程中解析单个文件，异常作为结果返回以便归属到对应的文件"""
+    try:
+        return file_path, list(parser.iter_suites(file_path)), None
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            # 无法跨进程传递的异常转换为 RuntimeError，保留原始信息
+            e = RuntimeError(f"{type(e).__name__}: {str(e)}")
+        return file_path, None, e
+
+
+class ParallelCollector:
+    """收集开始前并行预解析测试目录中所有受支持文件的 pytest 插件
+
+    预解析的结果（TestSuite 列表或解析异常）按文件路径保存，
+    PywinautoFile 收集时直接取用，异常会在对应文件的收集中重新抛出。
+    """
+
+    def __init__(self, config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.prepared: Dict[str, Union[List[TestSuite], Exception]] = {}
+
+    def scan(self, root: str) -> List[str]:
+        """扫描目录下所有受支持的测试文件，跳过 norecursedirs 匹配的目录"""
+        patterns = self.config.getini("norecursedirs")
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(
+                d for d in dirnames if not any(fnmatch.fnmatch(d, pattern) for pattern in patterns)
+            )
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                if get_parser(file_path):
+                    files.append(file_path)
+        return files
+
+    def prepare(self, files: List[str]) -> None:
+        """并行解析文件，已缓存的文件直接从解析缓存加载"""
+        suite_cache = self.config.pluginmanager.get_plugin(SUITE_CACHE_PLUGIN)
+        pending = []
+        for file_path in files:
+            parser = get_parser(file_path)
+            suites = suite_cache.load(file_path, parser) if suite_cache else None
+            if suites is not None:
+                self.prepared[file_path] = suites
+            else:
+                pending.append((parser, file_path))
+
+        if not pending:
+            return
+
+        logger.info("并行解析 %s 个测试文件, 工作进程数: %s", len(pending), self.workers)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+            parsers, paths = zip(*pending)
+            for file_path, suites, error in pool.map(_parse_file, parsers, paths, chunksize=4):
+                if error is not None:
+                    self.prepared[file_path] = error
+                    continue
+                self.prepared[file_path] = suites
+                if suite_cache:
+                    suite_cache.store(file_path, get_parser(file_path), suites)
+
+    def take(self, file_path: str) -> Optional[Union[List[TestSuite], Exception]]:
+        """取出预解析的结果"""
+        return self.prepared.pop(os.path.abspath(file_path), None)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session):
+        """在收集开始前预解析测试目录"""
+        pywinauto_path = self.config.getoption("--pywinauto-path")
+        if not pywinauto_path or self.config.getoption("--pywinauto-file"):
+            return None
+        self.prepare(self.scan(os.path.abspath(pywinauto_path)))
+        return None
@@ -0,0 +1,178 @@
+import csv
+import os
+import re
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+from .models import Dataset, TestCase, TestStep
+
+# 占位符格式：${变量名}
+PLACEHOLDER_RE = re.compile(r'\$\{([^}]+)\}')
+
+# 步骤中支持占位符的字符串字段
+STEP_FIELDS = ('action', 'target', 'locator', 'expected', 'description')
+
+
+def parse_dataset(spec: Union[str, list, Dict[str, Any], None], base_dir: str) -> Optional[Dataset]:
+    """解析测试用例中的 dataset 定义
+
+    支持三种写法：数据行列表（内联数据）、文件路径字符串、
+    或者包含 rows / file / sheet 的字典。文件路径相对于测试文件所在目录。
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, list):
+        return Dataset(rows=spec)
+    if isinstance(spec, str):
+        spec = {'file': spec}
+    if not isinstance(spec, dict) or ('rows' not in spec and 'file' not in spec):
+        raise ValueError(f"无效的 dataset 定义: {spec!r}")
+
+    file = spec.get('file')
+    if file:
+        file = os.path.normpath(os.path.join(base_dir, file))
+    return Dataset(rows=spec.get('rows'), file=file, sheet=spec.get('sheet'))
+
+
+def iter_rows(dataset: Dataset) -> Iterator[Dict[str, Any]]:
+    """逐行读取数据集，CSV 和 Excel 文件以流式读取"""
+    if dataset.rows is not None:
+        yield from dataset.rows
+        return
+
+    ext = os.path.splitext(dataset.file)[1].lower()
+    if ext == '.csv':
+        with open(dataset.file, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+    elif ext in ('.xlsx', '.xlsm'):
+        yield from _iter_excel_rows(dataset.file, dataset.sheet)
+    else:
+        raise ValueError(f"不支持的数据集文件格式: {dataset.file}")
+
+
+def _iter_excel_rows(file_path: str, sheet_name: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """以只读模式读取 Excel 工作表，第一行为列名"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        columns = [str(name) if name is not None else None for name in header]
+        for values in rows:
+            if not any(value is not None for value in values):
+                continue
+            yield {name: value for name, value in zip(columns, values) if name is not None}
+    finally:
+        workbook.close()
+
+
+def placeholders(test_case: TestCase) -> Set[str]:
+    """收集测试用例模板中用到的所有变量名"""
+    names = set(PLACEHOLDER_RE.findall(test_case.name))
+    for step in (*test_case.setup, *test_case.steps, *test_case.teardown):
+        for name in STEP_FIELDS:
+            value = getattr(step, name)
+            if isinstance(value, str):
+                names.update(PLACEHOLDER_RE.findall(value))
+        names.update(_data_placeholders(step.data))
+    return names
+
+
+def action_placeholders(test_case: TestCase) -> bool:
+    """测试用例模板中是否有 action 由数据行决定的步骤"""
+    return any(
+        '${' in step.action
+        for step in (*test_case.setup, *test_case.steps, *test_case.teardown)
+        if isinstance(step.action, str)
+    )
+
+
+def _data_placeholders(value: Any) -> Set[str]:
+    """递归收集 data 中的变量名"""
+    if isinstance(value, str):
+        return set(PLACEHOLDER_RE.findall(value))
+    if isinstance(value, dict):
+        return set().union(*(_data_placeholders(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_data_placeholders(v) for v in value)) if value else set()
+    return set()
+
+
+def expand(test_case: TestCase) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """按数据集展开测试用例，返回 (测试项名称, 数据行)
+
+    没有数据集的测试用例原样返回一项，数据行为 None。数据行缺少模板中用到的变量时抛出 ValueError。
+    测试项名称为渲染后的用例名称加上数据行的 id 列或行号。
+    """
+    if test_case.dataset is None:
+        yield test_case.name, None
+        return
+
+    required = placeholders(test_case)
+    for index, row in enumerate(iter_rows(test_case.dataset)):
+        missing = required.difference(row)
+        if missing:
+            raise ValueError(f"测试用例 '{test_case.name}' 的第 {index} 行数据缺少变量: {', '.join(sorted(missing))}")
+        row_id = row.get('id')
+        yield f"{render_text(test_case.name, row)}[{index if row_id in (None, '') else row_id}]", row
+
+
+def render_case(test_case: TestCase, params: Dict[str, Any]) -> TestCase:
+    """用数据行渲染测试用例模板，不含占位符的步骤直接复用模板中的对象"""
+    return TestCase(
+        name=render_text(test_case.name, params),
+        steps=[render_step(step, params) for step in test_case.steps],
+        teardown=[render_step(step, params) for step in test_case.teardown],
+        setup=[render_step(step, params) for step in test_case.setup],
+        tags=test_case.tags,
+        description=test_case.description
+    )
+
+
+def render_step(step: TestStep, params: Dict[str, Any]) -> TestStep:
+    """渲染单个步骤，没有占位符时返回原对象"""
+    values = {}
+    for name in STEP_FIELDS:
+        value = getattr(step, name)
+        values[name] = render_text(value, params) if isinstance(value, str) else value
+    data = render_value(step.data, params)
+    if data is step.data and all(values[name] is getattr(step, name) for name in STEP_FIELDS):
+        return step
+    return TestStep(data=data, **values)
+
+
+def render_value(value: Any, params: Dict[str, Any]) -> Any:
+    """递归替换字符串、字典和列表中的占位符，没有变化时返回原对象
+
+    整个字符串只有一个占位符时保留数据行中的原始类型（例如数字），否则按字符串拼接。
+    """
+    if isinstance(value, str):
+        if '${' not in value:
+            return value
+        match = PLACEHOLDER_RE.fullmatch(value)
+        if match:
+            return params[match.group(1)]
+        return render_text(value, params)
+    if isinstance(value, dict):
+        rendered = {key: render_value(item, params) for key, item in value.items()}
+        changed = any(rendered[key] is not item for key, item in value.items())
+        return rendered if changed else value
+    if isinstance(value, list):
+        rendered = [render_value(item, params) for item in value]
+        changed = any(new is not old for new, old in zip(rendered, value))
+        return rendered if changed else value
+    return value
+
+
+def render_text(text: str, params: Dict[str, Any]) -> str:
+    """替换字符串中的占位符"""
+    if '${' not in text:
+        return text
+    return PLACEHOLDER_RE.sub(lambda m: _format(params[m.group(1)]), text)
+
+
+def _format(value: Any) -> str:
+    """将数据行中的值转换为字符串，空值为空字符串"""
+    return '' if value is None else str(value)
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 from ..models import TestSuite
 
 
 class BaseParser(ABC):
     """解析器抽象基类"""
     
+    # 解析器版本，解析结果可能变化时需要递增，使已缓存的解析结果失效
+    version = "1"
+    
     @abstractmethod
     def parse(self, file_path: str) -> TestSuite:
         """解析测试文件，返回 TestSuite 对象"""
@@ -16,6 +19,14 @@ class BaseParser(ABC):
         """检查是否支持该文件格式"""
         pass
     
+    def iter_suites(self, file_path: str) -> Iterator[TestSuite]:
+        """逐个返回文件中的测试套件，一个文件可以包含多个测试套件"""
+        yield self.parse(file_path)
+    
+    def cache_token(self) -> str:
+        """返回影响解析结果的版本和配置，用于判断缓存的解析结果是否有效"""
+        return self.version
+    
     def _get_file_extension(self, file_path: str) -> str:
         """获取文件扩展名"""
         return file_path.split('.')[-1].lower()
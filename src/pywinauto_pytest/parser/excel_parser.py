@@ -1,83 +1,102 @@
 from openpyxl import load_workbook
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, Tuple, Any
 from .base_parser import BaseParser
 from ..models import TestSuite, TestCase, TestStep
 
+# 每行读取的列数：用例名称/Teardown 标记、Action、Target、Locator、Expected
+COLUMNS = 5
+
 
 class ExcelParser(BaseParser):
-    """Excel 格式测试用例解析器"""
-    
+    """Excel 格式测试用例解析器
+
+    使用 openpyxl 的只读模式逐行读取单元格值，不加载样式，也不在内存中保留整个工作表。
+    默认只解析活动工作表；``all_sheets`` 为 True 时每个工作表解析为一个测试套件。
+    """
+
+    version = "2"
+
+    def __init__(self, all_sheets: bool = False):
+        self.all_sheets = all_sheets
+
     def parse(self, file_path: str) -> TestSuite:
-        """解析 Excel 文件，返回 TestSuite 对象"""
-        workbook = load_workbook(file_path)
-        sheet = workbook.active
-        
-        # 解析测试套件信息（假设在 A1 单元格）
-        test_suite_name = sheet['A1'].value if sheet['A1'].value else 'Unnamed Suite'
-        test_suite = TestSuite(name=test_suite_name, tests=[])
-        
-        # 解析测试用例
-        test_cases = self._parse_test_cases(sheet)
-        test_suite.tests = test_cases
-        
-        return test_suite
-    
+        """解析 Excel 文件的活动工作表，返回 TestSuite 对象"""
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            return self._parse_sheet(workbook.active)
+        finally:
+            workbook.close()
+
+    def iter_suites(self, file_path: str) -> Iterator[TestSuite]:
+        """逐个解析测试套件，启用 all_sheets 时每个工作表对应一个测试套件"""
+        if not self.all_sheets:
+            yield self.parse(file_path)
+            return
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                yield self._parse_sheet(sheet)
+        finally:
+            workbook.close()
+
     def supports(self, file_path: str) -> bool:
         """检查是否支持 Excel 文件"""
         ext = self._get_file_extension(file_path)
         return ext in ['xlsx', 'xls']
-    
-    def _parse_test_cases(self, sheet) -> List[TestCase]:
-        """解析测试用例"""
-        test_cases = []
+
+    def cache_token(self) -> str:
+        """解析结果取决于是否解析所有工作表"""
+        return f"{self.version}:{'all' if self.all_sheets else 'active'}"
+
+    def _parse_sheet(self, sheet) -> TestSuite:
+        """解析单个工作表"""
+        rows = sheet.iter_rows(values_only=True)
+
+        # 解析测试套件信息（A1 单元格），第 2 行为列标题
+        first_row = next(rows, None)
+        test_suite_name = first_row[0] if first_row and first_row[0] else 'Unnamed Suite'
+        next(rows, None)
+
+        return TestSuite(name=test_suite_name, tests=list(self._parse_test_cases(rows)))
+
+    def _parse_test_cases(self, rows: Iterable[Tuple[Any, ...]]) -> Iterator[TestCase]:
+        """从行迭代器中逐个解析测试用例"""
         current_test = None
-        current_steps = []
-        current_teardown = []
-        
-        # 假设测试用例从第 3 行开始
-        for row in sheet.iter_rows(min_row=3, values_only=True):
+
+        for row in rows:
+            # 只读模式下行的长度可能不足，补齐到固定列数
+            if len(row) < COLUMNS:
+                row = tuple(row) + (None,) * (COLUMNS - len(row))
+
             # 跳过空行
             if not any(row):
                 continue
-            
+
             # 解析测试用例名称（以 "## " 开头）
             if row[0] and isinstance(row[0], str) and row[0].startswith('## '):
-                # 如果已有未完成的测试用例，保存它
+                # 如果已有未完成的测试用例，先返回它
                 if current_test:
-                    current_test.steps = current_steps
-                    current_test.teardown = current_teardown
-                    test_cases.append(current_test)
-                    current_steps = []
-                    current_teardown = []
-                
+                    yield current_test
+
                 # 创建新的测试用例
-                test_name = row[0][3:]
-                current_test = TestCase(name=test_name, steps=[])
-            
+                current_test = TestCase(name=row[0][3:], steps=[])
+
             # 解析测试步骤
             elif current_test and row[1] and isinstance(row[1], str):
-                action = row[1]
-                target = row[2] if row[2] else None
-                locator = row[3] if row[3] else None
-                expected = row[4] if row[4] else None
-                
                 step = TestStep(
-                    action=action,
-                    target=target,
-                    locator=locator,
-                    expected=expected
+                    action=row[1],
+                    target=row[2] if row[2] else None,
+                    locator=row[3] if row[3] else None,
+                    expected=row[4] if row[4] else None
                 )
-                
+
                 # 判断是主要步骤还是 teardown 步骤
                 if row[0] and isinstance(row[0], str) and row[0].startswith('Teardown'):
-                    current_teardown.append(step)
+                    current_test.teardown.append(step)
                 else:
-                    current_steps.append(step)
-        
-        # 保存最后一个测试用例
+                    current_test.steps.append(step)
+
+        # 返回最后一个测试用例
         if current_test:
-            current_test.steps = current_steps
-            current_test.teardown = current_teardown
-            test_cases.append(current_test)
-        
-        return test_cases
+            yield current_test
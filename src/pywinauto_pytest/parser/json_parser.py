@@ -1,70 +1,44 @@
 import json
-from typing import Dict, Any, List
+from typing import Any
 from .base_parser import BaseParser
-from ..models import TestSuite, TestCase, TestStep
+from .schema import SpecError, decode_suite
+from ..models import TestSuite
+
+try:
+    # 可选依赖：orjson 的解码速度是标准库 json 的数倍，未安装时使用标准库
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(file_path: str) -> Any:
+    """读取并解码 JSON 文件，语法错误或不是 UTF-8 编码时抛出 SpecError"""
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    try:
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content.decode('utf-8-sig'))
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，无效的 UTF-8 也报告为 JSONDecodeError
+        raise SpecError(file_path, f"第 {e.lineno} 行第 {e.colno} 列", f"JSON 语法错误: {e.msg}") from None
+    except UnicodeDecodeError as e:
+        raise SpecError(file_path, f"第 {e.start} 字节", f"文件不是 UTF-8 编码: {e.reason}") from None
 
 
 class JSONParser(BaseParser):
-    """JSON 格式测试用例解析器"""
-    
+    """JSON 格式测试用例解析器
+
+    安装了 orjson 时使用 orjson 解码，解码结果一次遍历校验并构建为测试套件模型（见 ``schema.SuiteDecoder``）。
+    """
+
+    version = "1.1"
+
     def parse(self, file_path: str) -> TestSuite:
         """解析 JSON 文件，返回 TestSuite 对象"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 解析测试套件
-        test_suite = TestSuite(
-            name=data.get('test_suite', 'Unnamed Suite'),
-            tests=[]
-        )
-        
-        # 解析测试套件级别的 setup 和 teardown
-        if 'setup' in data:
-            test_suite.setup = self._parse_steps(data['setup'])
-        if 'teardown' in data:
-            test_suite.teardown = self._parse_steps(data['teardown'])
-        
-        # 解析测试用例
-        for test_data in data.get('tests', []):
-            test_case = TestCase(
-                name=test_data.get('name', 'Unnamed Test'),
-                steps=self._parse_steps(test_data.get('steps', []))
-            )
-            
-            # 解析测试用例级别的 setup 和 teardown
-            if 'setup' in test_data:
-                test_case.setup = self._parse_steps(test_data['setup'])
-            if 'teardown' in test_data:
-                test_case.teardown = self._parse_steps(test_data['teardown'])
-            
-            # 解析测试标签
-            if 'tags' in test_data:
-                test_case.tags = test_data['tags']
-            
-            # 解析测试描述
-            if 'description' in test_data:
-                test_case.description = test_data['description']
-            
-            test_suite.tests.append(test_case)
-        
-        return test_suite
-    
+        return decode_suite(load_json(file_path), file_path)
+
     def supports(self, file_path: str) -> bool:
         """检查是否支持 JSON 文件"""
         ext = self._get_file_extension(file_path)
         return ext == 'json'
-    
-    def _parse_steps(self, steps_data: List[Dict[str, Any]]) -> List[TestStep]:
-        """解析测试步骤"""
-        steps = []
-        for step_data in steps_data:
-            step = TestStep(
-                action=step_data.get('action', ''),
-                target=step_data.get('target'),
-                locator=step_data.get('locator'),
-                expected=step_data.get('expected'),
-                data=step_data.get('data', {}),
-                description=step_data.get('description')
-            )
-            steps.append(step)
-        return steps
@@ -1,82 +1,185 @@
-import markdown
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+import re
+from typing import List, Optional
 from .base_parser import BaseParser
 from ..models import TestSuite, TestCase, TestStep
 
+# 有序列表步骤：1. **action**: rest
+ORDERED_STEP_RE = re.compile(r'^\s*\d+\.\s+\*\*(?P<action>.+?)\*\*(?P<rest>.*)$')
+
+# 无序列表步骤（Teardown 部分）：- **action**: rest
+BULLET_STEP_RE = re.compile(r'^\s*[-*+]\s+\*\*(?P<action>.+?)\*\*(?P<rest>.*)$')
+
+# Teardown 标记：**Teardown**: 或 Teardown:
+TEARDOWN_RE = re.compile(r'^\s*(\*\*)?Teardown\b')
+
 
 class MarkdownParser(BaseParser):
-    """Markdown 格式测试用例解析器"""
-    
+    """Markdown 格式测试用例解析器
+
+    逐行扫描文件直接构建 TestSuite，解析时间与文件行数成线性关系：
+    ``# `` 为测试套件名称，``## `` 开始一个测试用例，有序列表为测试步骤，
+    ``**Teardown**`` 之后的列表项为清理步骤。代码块中的内容会被忽略。
+    """
+
+    version = "2"
+
     def parse(self, file_path: str) -> TestSuite:
         """解析 Markdown 文件，返回 TestSuite 对象"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return self._parse_lines(f)
+
+    def supports(self, file_path: str) -> bool:
+        """检查是否支持 Markdown 文件"""
+        ext = self._get_file_extension(file_path)
+        return ext in ['md', 'markdown']
+
+    def _parse_lines(self, lines) -> TestSuite:
+        """单次遍历所有行，构建测试套件"""
+        test_suite_name = None
+        test_cases: List[TestCase] = []
+        current_test: Optional[TestCase] = None
+        in_teardown = False
+        in_code_block = False
+
+        for line in lines:
+            stripped = line.strip()
+
+            # 跳过代码块
+            if stripped.startswith('```') or stripped.startswith('~~~'):
+                in_code_block = not in_code_block
+                continue
+            if in_code_block or not stripped:
+                continue
+
+            # 测试套件名称（第一个 h1）
+            if stripped.startswith('# '):
+                if test_suite_name is None:
+                    test_suite_name = stripped[2:].strip()
+                continue
+
+            # 新的测试用例（h2）
+            if stripped.startswith('## '):
+                current_test = TestCase(name=stripped[3:].strip(), steps=[])
+                test_cases.append(current_test)
+                in_teardown = False
+                continue
+
+            if current_test is None:
+                continue
+
+            # Teardown 部分
+            if TEARDOWN_RE.match(stripped):
+                in_teardown = True
+                continue
+
+            if in_teardown:
+                match = BULLET_STEP_RE.match(stripped)
+                if match:
+                    current_test.teardown.append(self._parse_step(match.group('action'), match.group('rest')))
+                continue
+
+            match = ORDERED_STEP_RE.match(stripped)
+            if match:
+                current_test.steps.append(self._parse_step(match.group('action'), match.group('rest')))
+
+        return TestSuite(name=test_suite_name or 'Unnamed Suite', tests=test_cases)
+
+    def _parse_step(self, action: str, rest: str) -> TestStep:
+        """解析单个测试步骤：action 后面为 target(locator) == expected"""
+        action = action.strip()
+
+        # 移除前面的冒号和空格
+        rest = rest.strip()
+        if rest.startswith(':'):
+            rest = rest[1:].strip()
+
+        if not rest:
+            return TestStep(action=action)
+
+        target = None
+        locator = None
+        expected = None
+
+        # 处理预期结果
+        if ' == ' in rest:
+            main_part, expected = rest.split(' == ', 1)
+            expected = expected.strip()
+        else:
+            main_part = rest
+
+        # 处理 target 和 locator
+        if '(' in main_part and ')' in main_part:
+            target_end = main_part.index('(')
+            target = main_part[:target_end].strip()
+            locator = main_part[target_end + 1:-1].strip()
+        else:
+            target = main_part.strip()
+
+        return TestStep(
+            action=action,
+            target=target,
+            locator=locator,
+            expected=expected
+        )
+
+    def parse_html(self, file_path: str) -> TestSuite:
+        """通过 Markdown -> HTML -> BeautifulSoup 解析文件
+
+        这是早期版本的实现，保留用于对比验证和性能基准测试。
+        """
+        import markdown
+        from bs4 import BeautifulSoup
+
         with open(file_path, 'r', encoding='utf-8') as f:
             md_content = f.read()
-        
+
         # 将 Markdown 转换为 HTML，便于解析
         html_content = markdown.markdown(md_content)
         soup = BeautifulSoup(html_content, 'html.parser')
-        
+
         # 解析测试套件名称（h1 标签）
         h1_tag = soup.find('h1')
         test_suite_name = h1_tag.text if h1_tag else 'Unnamed Suite'
         test_suite = TestSuite(name=test_suite_name, tests=[])
-        
+
         # 解析测试用例（h2 标签）
-        h2_tags = soup.find_all('h2')
-        for h2_tag in h2_tags:
-            test_case = self._parse_test_case(h2_tag)
-            test_suite.tests.append(test_case)
-        
+        for h2_tag in soup.find_all('h2'):
+            test_suite.tests.append(self._parse_html_test_case(h2_tag))
+
         return test_suite
-    
-    def supports(self, file_path: str) -> bool:
-        """检查是否支持 Markdown 文件"""
-        ext = self._get_file_extension(file_path)
-        return ext in ['md', 'markdown']
-    
-    def _parse_test_case(self, h2_tag) -> TestCase:
-        """解析单个测试用例"""
-        test_case_name = h2_tag.text.strip()
-        test_case = TestCase(name=test_case_name, steps=[])
-        
-        steps = []
-        teardown_steps = []
-        
+
+    def _parse_html_test_case(self, h2_tag) -> TestCase:
+        """解析单个测试用例（HTML 实现）"""
+        test_case = TestCase(name=h2_tag.text.strip(), steps=[])
+
         # 使用 find_next 方法查找下一个 ol 标签，跳过中间的文本节点
         ol_tag = h2_tag.find_next('ol')
         if ol_tag:
             for li in ol_tag.find_all('li'):
-                step = self._parse_step(li)
+                step = self._parse_html_step(li)
                 if step:
-                    steps.append(step)
-        
+                    test_case.steps.append(step)
+
         # 查找 Teardown 部分
         p_tag = h2_tag.find_next('p')
         while p_tag:
             if p_tag.text.strip().startswith('Teardown'):
                 # 直接解析 p 标签内的 strong 标签
-                strong_tags = p_tag.find_all('strong')
-                for strong_tag in strong_tags:
+                for strong_tag in p_tag.find_all('strong'):
                     if strong_tag.text == 'close_application':
-                        step = TestStep(action='close_application')
-                        teardown_steps.append(step)
+                        test_case.teardown.append(TestStep(action='close_application'))
                 break
             p_tag = p_tag.find_next('p')
-        
-        test_case.steps = steps
-        test_case.teardown = teardown_steps
+
         return test_case
-    
-    def _parse_step(self, li_tag) -> TestStep:
-        """解析单个测试步骤"""
+
+    def _parse_html_step(self, li_tag) -> Optional[TestStep]:
+        """解析单个测试步骤（HTML 实现）"""
         # 从 li 标签中提取 action（strong 标签的文本）
         strong_tag = li_tag.find('strong')
         if not strong_tag:
             return None
-        
-        action = strong_tag.text.strip()
-        
+
         # 提取 strong 标签后面的文本
         rest = ''
         next_sibling = strong_tag.next_sibling
@@ -84,33 +187,5 @@ class MarkdownParser(BaseParser):
             if hasattr(next_sibling, 'text'):
                 rest += next_sibling.text
             next_sibling = next_sibling.next_sibling
-        
-        # 移除前面的冒号和空格
-        if rest.startswith(':'):
-            rest = rest[1:].strip()
-        
-        target = None
-        locator = None
-        expected = None
-        
-        # 处理预期结果
-        if ' == ' in rest:
-            main_part, expected = rest.split(' == ', 1)
-            expected = expected.strip()
-        else:
-            main_part = rest
-        
-        # 处理 target 和 locator
-        if '(' in main_part and ')' in main_part:
-            target_end = main_part.index('(')
-            target = main_part[:target_end].strip()
-            locator = main_part[target_end + 1:-1].strip()
-        else:
-            target = main_part.strip()
-        
-        return TestStep(
-            action=action,
-            target=target,
-            locator=locator,
-            expected=expected
-        )
+
+        return self._parse_step(strong_tag.text, rest)
@@ -0,0 +1,139 @@
+import os
+from typing import Any, Dict, List, Optional
+from ..models import TestSuite, TestCase, TestStep
+from ..parametrize import parse_dataset
+
+# 步骤中的字符串字段，数字等标量值会转换为字符串
+STEP_STRING_FIELDS = ('target', 'locator', 'expected', 'description')
+
+# YAML/JSON 中的标量类型
+SCALAR_TYPES = (str, int, float, bool)
+
+
+class SpecError(ValueError):
+    """测试文件的结构不符合规范，location 为出错的位置，例如 ``tests[2].steps[0].data``"""
+
+    def __init__(self, file_path: str, location: str, message: str):
+        super().__init__(f"{file_path}: {location}: {message}" if location else f"{file_path}: {message}")
+        self.file_path = file_path
+        self.location = location
+        self.message = message
+
+    def __reduce__(self):
+        return SpecError, (self.file_path, self.location, self.message)
+
+
+def _kind(value: Any) -> str:
+    """值的类型名称，用于错误信息"""
+    if isinstance(value, dict):
+        return "对象"
+    if isinstance(value, list):
+        return "列表"
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+class SuiteDecoder:
+    """把 JSON/YAML 解码出的数据一次遍历校验并构建为测试套件模型
+
+    只检查结构和类型，出错时抛出带有位置的 ``SpecError``；步骤是否可执行（例如缺少 action）
+    仍由收集阶段的执行计划编译一次性报告。未知的字段会被忽略。
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.base_dir = os.path.dirname(os.path.abspath(file_path))
+
+    def error(self, location: str, message: str) -> SpecError:
+        """创建指向当前文件的错误"""
+        return SpecError(self.file_path, location, message)
+
+    def decode(self, data: Any, location: str = '') -> TestSuite:
+        """解码整个测试套件"""
+        if not isinstance(data, dict):
+            raise self.error(location, f"测试文件的顶层应为对象，实际为{_kind(data)}")
+        prefix = f"{location}." if location else ''
+        suite = TestSuite(
+            name=self._string(data.get('test_suite', 'Unnamed Suite'), f"{prefix}test_suite"),
+            tests=[]
+        )
+        if 'setup' in data:
+            suite.setup = self._steps(data['setup'], f"{prefix}setup")
+        if 'teardown' in data:
+            suite.teardown = self._steps(data['teardown'], f"{prefix}teardown")
+        if 'description' in data:
+            suite.description = self._optional_string(data['description'], f"{prefix}description")
+
+        tests = data.get('tests', [])
+        if not isinstance(tests, list):
+            raise self.error(f"{prefix}tests", f"应为列表，实际为{_kind(tests)}")
+        suite.tests = [self._case(test, f"{prefix}tests[{index}]") for index, test in enumerate(tests)]
+        return suite
+
+    def _case(self, data: Any, location: str) -> TestCase:
+        """解码测试用例"""
+        if not isinstance(data, dict):
+            raise self.error(location, f"测试用例应为对象，实际为{_kind(data)}")
+        case = TestCase(
+            name=self._string(data.get('name', 'Unnamed Test'), f"{location}.name"),
+            steps=self._steps(data.get('steps', []), f"{location}.steps")
+        )
+        if 'setup' in data:
+            case.setup = self._steps(data['setup'], f"{location}.setup")
+        if 'teardown' in data:
+            case.teardown = self._steps(data['teardown'], f"{location}.teardown")
+        if 'tags' in data:
+            tags = data['tags']
+            if not isinstance(tags, list):
+                raise self.error(f"{location}.tags", f"应为列表，实际为{_kind(tags)}")
+            case.tags = [self._string(tag, f"{location}.tags[{i}]") for i, tag in enumerate(tags)]
+        if 'description' in data:
+            case.description = self._optional_string(data['description'], f"{location}.description")
+        if 'dataset' in data:
+            # 数据集的文件路径相对于测试文件所在目录
+            try:
+                case.dataset = parse_dataset(data['dataset'], self.base_dir)
+            except ValueError as e:
+                raise self.error(f"{location}.dataset", str(e)) from None
+        return case
+
+    def _steps(self, data: Any, location: str) -> List[TestStep]:
+        """解码步骤列表，null 视为空列表"""
+        if data is None:
+            return []
+        if not isinstance(data, list):
+            raise self.error(location, f"应为步骤列表，实际为{_kind(data)}")
+        return [self._step(step, f"{location}[{index}]") for index, step in enumerate(data)]
+
+    def _step(self, data: Any, location: str) -> TestStep:
+        """解码单个步骤"""
+        if not isinstance(data, dict):
+            raise self.error(location, f"步骤应为对象，实际为{_kind(data)}")
+        action = data.get('action', '')
+        if not isinstance(action, str):
+            raise self.error(f"{location}.action", f"应为字符串，实际为{_kind(action)}")
+        values = [self._optional_string(data.get(name), f"{location}.{name}") for name in STEP_STRING_FIELDS]
+        step_data = data.get('data', {})
+        if step_data is not None and not isinstance(step_data, dict):
+            raise self.error(f"{location}.data", f"应为对象，实际为{_kind(step_data)}")
+        target, locator, expected, description = values
+        return TestStep(action=action, target=target, locator=locator, expected=expected,
+                        data=step_data, description=description)
+
+    def _string(self, value: Any, location: str) -> str:
+        """必需的字符串字段，数字等标量转换为字符串"""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, SCALAR_TYPES):
+            return str(value)
+        raise self.error(location, f"应为字符串，实际为{_kind(value)}")
+
+    def _optional_string(self, value: Any, location: str) -> Optional[str]:
+        """可选的字符串字段"""
+        return None if value is None else self._string(value, location)
+
+
+def decode_suite(data: Dict[str, Any], file_path: str, location: str = '') -> TestSuite:
+    """把解码出的数据校验并构建为测试套件，location 为数据在文件中的位置"""
+    return SuiteDecoder(file_path).decode(data, location)
@@ -1,70 +1,47 @@
 import yaml
-from typing import Dict, Any, List
+from typing import Iterator
 from .base_parser import BaseParser
-from ..models import TestSuite, TestCase, TestStep
+from .schema import decode_suite
+from ..models import TestSuite
+
+# PyYAML 编译了 libyaml 时使用 C 实现的加载器，速度是纯 Python 实现的数倍
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 class YAMLParser(BaseParser):
-    """YAML 格式测试用例解析器"""
-    
+    """YAML 格式测试用例解析器
+
+    一个文件可以用 ``---`` 分隔多个文档，每个文档是一个测试套件。
+    文档按需逐个加载，解析大文件时只需在内存中保留当前文档。
+    """
+
+    version = "1.2"
+
     def parse(self, file_path: str) -> TestSuite:
-        """解析 YAML 文件，返回 TestSuite 对象"""
+        """解析 YAML 文件的第一个测试套件，返回 TestSuite 对象"""
+        return next(self.iter_suites(file_path))
+
+    def iter_suites(self, file_path: str) -> Iterator[TestSuite]:
+        """逐个解析文件中的测试套件，跳过空文档，文件中没有任何非空文档时抛出 SpecError
+
+        只有一个文档时错误位置与单文档文件相同，多个文档时以 ``documents[序号]`` 开头。
+        """
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
-        # 解析测试套件
-        test_suite = TestSuite(
-            name=data.get('test_suite', 'Unnamed Suite'),
-            tests=[]
-        )
-        
-        # 解析测试套件级别的 setup 和 teardown
-        if 'setup' in data:
-            test_suite.setup = self._parse_steps(data['setup'])
-        if 'teardown' in data:
-            test_suite.teardown = self._parse_steps(data['teardown'])
-        
-        # 解析测试用例
-        for test_data in data.get('tests', []):
-            test_case = TestCase(
-                name=test_data.get('name', 'Unnamed Test'),
-                steps=self._parse_steps(test_data.get('steps', []))
-            )
-            
-            # 解析测试用例级别的 setup 和 teardown
-            if 'setup' in test_data:
-                test_case.setup = self._parse_steps(test_data['setup'])
-            if 'teardown' in test_data:
-                test_case.teardown = self._parse_steps(test_data['teardown'])
-            
-            # 解析测试标签
-            if 'tags' in test_data:
-                test_case.tags = test_data['tags']
-            
-            # 解析测试描述
-            if 'description' in test_data:
-                test_case.description = test_data['description']
-            
-            test_suite.tests.append(test_case)
-        
-        return test_suite
-    
+            documents = ((index, data) for index, data in enumerate(yaml.load_all(f, Loader=SafeLoader))
+                         if data is not None)
+            current = next(documents, None)
+            following = next(documents, None)
+            if following is None:
+                # 空文件与单文档文件一样校验，顶层为 null 时报告错误
+                yield decode_suite(current[1] if current is not None else None, file_path)
+                return
+
+            while current is not None:
+                index, data = current
+                yield decode_suite(data, file_path, f"documents[{index}]")
+                current, following = following, next(documents, None)
+
     def supports(self, file_path: str) -> bool:
         """检查是否支持 YAML 文件"""
         ext = self._get_file_extension(file_path)
         return ext in ['yaml', 'yml']
-    
-    def _parse_steps(self, steps_data: List[Dict[str, Any]]) -> List[TestStep]:
-        """解析测试步骤"""
-        steps = []
-        for step_data in steps_data:
-            step = TestStep(
-                action=step_data.get('action', ''),
-                target=step_data.get('target'),
-                locator=step_data.get('locator'),
-                expected=step_data.get('expected'),
-                data=step_data.get('data', {}),
-                description=step_data.get('description')
-            )
-            steps.append(step)
-        return steps
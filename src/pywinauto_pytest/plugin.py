@@ -1,93 +1,298 @@
+import itertools
 import os
 import pytest
-from typing import List, Optional, Type
-from pytest import Collector, Item, File
-from .parser import get_parser
-from .models import TestSuite
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from pytest import Item, File
+from .parser import PARSERS, get_parser
+from .parser.excel_parser import ExcelParser
+from .parser.schema import SpecError
 from .executor.pywinauto_executor import PywinautoExecutor
+from .executor.plan import CasePlan, PlanError, compile_case
+from .executor.backends import BaseBackend, get_backend
+from .executor.session_pool import SESSION_POOL_PLUGIN, SessionPool, SessionPoolPlugin
 from .allure_integration import AllureIntegration
-from .logger import logger
+from .attachments import ATTACHMENT_WRITER_PLUGIN, AttachmentWriter, AttachmentWriterPlugin
+from .screenshots import SCREENSHOT_STORE_PLUGIN, ScreenshotStore, ScreenshotStorePlugin
+from .distributed import DistributedPlugin, RemoteCaseFailure, replay_events, timing_report
+from .history import HISTORY_PLUGIN, HistoryPlugin
+from .incremental import INCREMENTAL_PLUGIN, IncrementalPlugin, fingerprint
+from .scheduling import SCHEDULER_PLUGIN, SchedulerPlugin
+from .instrumentation import INSTRUMENTATION_PLUGIN, Instrumentation, InstrumentationPlugin
+from .trace import TRACE_PLUGIN, TracePlugin
+from .suite_cache import SUITE_CACHE_PLUGIN, SuiteCache
+from .parallel_collect import PARALLEL_COLLECT_PLUGIN, ParallelCollector
+from .runner import run_suite_setup, run_suite_teardown, run_test_case, suite_case
+from .parametrize import action_placeholders, expand, render_case
+from .logger import LOG_PIPELINE_PLUGIN, LogPipeline, LogPipelinePlugin, logger
+
+# 会话共享的后端，fake 后端的 UI 树文件只加载一次
+BACKEND_KEY = pytest.StashKey[BaseBackend]()
+
+
+@dataclass
+class SuiteFixture:
+    """测试套件级别的 setup/teardown
+
+    同一文件中属于该套件的测试项共用一个执行器，setup 在第一个测试项执行前运行一次，
+    teardown 在文件的所有测试项结束后运行一次。
+    """
+    id: str
+    case: Any
+    plan: CasePlan
+    executor: Optional[PywinautoExecutor] = None
+    error: Optional[BaseException] = None
 
 
 class PywinautoTestItem(Item):
-    """自定义测试用例项"""
-    def __init__(self, name, parent, test_case):
-        super().__init__(name, parent)
-        self.test_case = test_case
-        self.executor = PywinautoExecutor()
-        self.allure = AllureIntegration()
+    """自定义测试用例项
+
+    数据驱动的测试项只保存共享的用例模板和自己的数据行，访问 test_case 时才渲染出具体的测试用例。
+    执行器在 setup 阶段才创建，所属测试套件定义了 setup/teardown 时使用套件共享的执行器。
+    """
+    def __init__(self, *, test_case, params: Optional[Dict[str, Any]] = None,
+                 plan: Optional[CasePlan] = None, suite: Optional[SuiteFixture] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.template = test_case
+        self.params = params
+        # 收集阶段编译的执行计划，数据驱动的测试项在执行时按渲染后的用例编译
+        self.plan = plan
+        self.suite = suite
+        self.executor: Optional[PywinautoExecutor] = None
+        self.allure = create_allure(self.config, self.nodeid)
+        # 分布式执行模式下由工作进程返回的执行结果
+        self.remote_result = None
+    
+    @property
+    def fingerprint(self) -> str:
+        """测试用例内容的指纹，用于增量执行"""
+        return fingerprint(self.template, self.params, self.suite.case if self.suite is not None else None)
+    
+    @property
+    def test_case(self):
+        """测试用例，数据驱动时用数据行渲染模板"""
+        if self.params is None:
+            return self.template
+        return render_case(self.template, self.params)
+    
+    def setup(self):
+        """创建执行器，所属测试套件定义了 setup/teardown 时使用套件共享的执行器"""
+        if self.suite is not None and self.remote_result is None:
+            self.executor = self.parent.suite_executor(self.suite)
+        else:
+            self.executor = create_executor(self.config)
     
     def runtest(self):
         """执行测试用例"""
-        logger.info(f"开始执行测试用例: {self.test_case.name}")
-        
+        if self.remote_result is not None:
+            self._replay_remote_result()
+            return
         try:
-            # 执行测试用例的 setup 步骤
-            for step in self.test_case.setup:
-                self.allure.start_step(step.action, step.description)
-                self.executor.execute_step(step)
-                self.allure.stop_step()
-            
-            # 执行测试用例的主要步骤
-            for step in self.test_case.steps:
-                self.allure.start_step(step.action, step.description)
-                self.executor.execute_step(step)
-                self.allure.stop_step()
-            
-            logger.info(f"测试用例执行成功: {self.test_case.name}")
-        except Exception as e:
-            self.allure.attach_screenshot("失败截图")
-            logger.error(f"测试用例执行失败: {self.test_case.name}, 错误: {str(e)}")
-            raise
+            run_test_case(self.executor, self.test_case, self.allure, plan=self.plan)
         finally:
-            # 执行测试用例的 teardown 步骤
-            for step in self.test_case.teardown:
-                try:
-                    self.allure.start_step(step.action, "清理步骤")
-                    self.executor.execute_step(step)
-                    self.allure.stop_step()
-                except Exception as e:
-                    logger.warning(f"清理步骤执行失败: {step.action}, 错误: {str(e)}")
+            # 测试项结束时把后台编码的截图添加到报告
+            self.allure.flush()
+    
+    def teardown(self):
+        """用例结束后将未关闭的应用实例归还给会话池，套件共享的应用实例由套件 teardown 处理"""
+        if self.suite is None and self.executor is not None:
+            self.executor.release_session()
+    
+    def _replay_remote_result(self):
+        """在主进程中回放工作进程的执行结果"""
+        result = self.remote_result
+        self.executor.instrumentation.extend(result.timings)
+        replay_events(self.allure, result.events)
+        report = timing_report(result.timings)
+        if report is not None:
+            self.allure.attach_data(report, "工作进程步骤耗时", "json")
+        self.allure.flush()
+        if result.outcome == 'skipped':
+            pytest.skip(result.error)
+        if result.outcome != 'passed':
+            raise RemoteCaseFailure(result)
 
     def repr_failure(self, excinfo):
         """自定义失败信息"""
-        return f"测试用例 '{self.test_case.name}' 执行失败: {excinfo.value}"
+        message = f"测试用例 '{self.test_case.name}' 执行失败: {excinfo.value}"
+        if isinstance(excinfo.value, RemoteCaseFailure) and excinfo.value.result.traceback:
+            message += f"\n\n工作进程 {excinfo.value.result.worker} 的异常信息:\n{excinfo.value.result.traceback}"
+        return message
 
     def reportinfo(self):
         """报告信息"""
-        return self.fspath, 0, f"测试用例: {self.test_case.name}"
+        return self.path, 0, f"测试用例: {self.test_case.name}"
+
+
+def backend_options(config) -> Dict[str, Any]:
+    """从命令行选项中读取后端配置"""
+    return {
+        'name': config.getoption("--pywinauto-backend"),
+        'tree_file': config.getoption("--pywinauto-fake-tree"),
+        'latency': config.getoption("--pywinauto-fake-latency"),
+    }
+
+
+def session_pool_options(config) -> Optional[Dict[str, Any]]:
+    """从命令行选项中读取会话池配置，未启用时返回 None"""
+    if not config.getoption("--pywinauto-reuse-app"):
+        return None
+    return {'max_uses': config.getoption("--pywinauto-app-max-uses")}
+
+
+def create_allure(config, owner: Optional[str] = None) -> AllureIntegration:
+    """创建 Allure 集成，使用会话共享的附件写入器和截图去重"""
+    writer_plugin = config.pluginmanager.get_plugin(ATTACHMENT_WRITER_PLUGIN)
+    store_plugin = config.pluginmanager.get_plugin(SCREENSHOT_STORE_PLUGIN)
+    return AllureIntegration(
+        writer=writer_plugin.writer if writer_plugin is not None else None,
+        store=store_plugin.store if store_plugin is not None else None,
+        owner=owner
+    )
+
+
+def session_backend(config) -> BaseBackend:
+    """返回会话共享的后端，第一次调用时根据命令行选项创建"""
+    backend = config.stash.get(BACKEND_KEY, None)
+    if backend is None:
+        options = backend_options(config)
+        backend = get_backend(options.pop('name'), **options)
+        config.stash[BACKEND_KEY] = backend
+    return backend
+
+
+def create_executor(config) -> PywinautoExecutor:
+    """根据命令行选项创建执行器，所有执行器共用会话的后端"""
+    # 启用计时时所有执行器共用同一个计时器，否则计时器只通知监听器（例如轨迹记录），不保存记录
+    plugin = config.pluginmanager.get_plugin(INSTRUMENTATION_PLUGIN)
+    instrumentation = plugin.instrumentation if plugin is not None else Instrumentation(keep_records=False)
+    
+    # 启用会话池时所有执行器共用会话池及其后端
+    pool_plugin = config.pluginmanager.get_plugin(SESSION_POOL_PLUGIN)
+    if pool_plugin is not None:
+        return PywinautoExecutor(instrumentation=instrumentation, session_pool=pool_plugin.pool)
+    
+    return PywinautoExecutor(backend=session_backend(config), instrumentation=instrumentation)
+
 
+class PywinautoFile(File):
+    """自定义文件收集器
 
-class PywinautoFile(Collector):
-    """自定义文件收集器"""
-    def __init__(self, fspath, parent):
-        super().__init__(fspath, parent)
+    测试套件的 setup/teardown 由文件收集器管理：第一个依赖它的测试项执行前运行 setup，
+    文件的所有测试项结束后运行 teardown。
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._started_suites: List[SuiteFixture] = []
+    
+    def suite_executor(self, suite: SuiteFixture) -> PywinautoExecutor:
+        """返回套件共享的执行器，第一次调用时运行套件 setup
+
+        setup 失败时第一个测试项报告错误，之后依赖该套件的测试项被跳过。
+        """
+        if suite.executor is None:
+            suite.executor = create_executor(self.config)
+            suite.executor.setup()
+            self._started_suites.append(suite)
+            trace_plugin = self.config.pluginmanager.get_plugin(TRACE_PLUGIN)
+            try:
+                # 记录轨迹时保存套件 setup 的步骤，写入该套件每个测试用例的轨迹
+                with trace_plugin.record_suite_setup(suite.id, suite.executor) if trace_plugin else nullcontext():
+                    run_suite_setup(suite.executor, suite.plan)
+            except Exception as e:
+                suite.error = e
+                raise
+        elif suite.error is not None:
+            pytest.skip(f"测试套件 '{suite.plan.name}' 的 setup 失败: {suite.error}")
+        return suite.executor
+    
+    def teardown(self):
+        """运行已启动套件的 teardown 并关闭共享的应用实例
+
+        测试项被重新排序时同一文件可能再次执行，此时套件 setup 会重新运行。
+        """
+        started, self._started_suites = self._started_suites, []
+        for suite in started:
+            executor, suite.executor, suite.error = suite.executor, None, None
+            try:
+                run_suite_teardown(executor, suite.plan)
+            finally:
+                executor.teardown()
     
     def collect(self) -> List[PywinautoTestItem]:
         """收集测试用例"""
-        logger.info(f"正在收集测试用例: {self.fspath}")
+        logger.info("正在收集测试用例: %s", self.path)
         
         # 获取文件对应的解析器
-        parser = get_parser(self.fspath.strpath)
+        parser = get_parser(str(self.path))
         if not parser:
-            logger.warning(f"不支持的文件格式: {self.fspath}")
+            logger.warning("不支持的文件格式: %s", self.path)
             return []
         
         try:
-            # 解析测试用例
-            test_suite = parser.parse(self.fspath.strpath)
+            # 解析测试用例，一个文件可以包含多个测试套件，逐个解析时预读下一个套件以判断是否有多个
+            test_suites = iter(self._parse(parser))
+            lookahead = list(itertools.islice(test_suites, 2))
+            multiple = len(lookahead) > 1
             
-            # 创建测试用例项
+            # 创建测试用例项，数据驱动的用例按数据行展开，多个测试套件时用套件名称区分同名用例
             items = []
-            for test_case in test_suite.tests:
-                item = PywinautoTestItem(test_case.name, self, test_case)
-                items.append(item)
+            for index, test_suite in enumerate(itertools.chain(lookahead, test_suites)):
+                suite = None
+                case = suite_case(test_suite)
+                if case is not None:
+                    suite = SuiteFixture(f"{self.nodeid}::{index}", case, compile_case(PywinautoExecutor, case))
+                for test_case in test_suite.tests:
+                    # 编译执行计划，无效的步骤在收集阶段报错；action 由数据行决定时按每个渲染后的数据行校验
+                    plan = None
+                    if test_case.dataset is None or not action_placeholders(test_case):
+                        plan = compile_case(PywinautoExecutor, test_case)
+                    for case_name, params in self._expand(test_case):
+                        if plan is None:
+                            compile_case(PywinautoExecutor, render_case(test_case, params))
+                        name = f"{case_name}[{test_suite.name}]" if multiple else case_name
+                        item = PywinautoTestItem.from_parent(
+                            self, name=name, test_case=test_case, params=params,
+                            plan=plan if params is None else None, suite=suite
+                        )
+                        items.append(item)
             
-            logger.info(f"成功收集到 {len(items)} 个测试用例")
+            logger.info("成功收集到 %s 个测试用例", len(items))
             return items
+        except (PlanError, SpecError):
+            raise
         except Exception as e:
-            logger.error(f"解析测试文件失败: {self.fspath}, 错误: {str(e)}")
+            logger.error("解析测试文件失败: %s, 错误: %s", self.path, e)
             return []
+    
+    def repr_failure(self, excinfo):
+        """无效的测试用例只显示问题列表或出错的位置"""
+        if isinstance(excinfo.value, (PlanError, SpecError)):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+    
+    def _expand(self, test_case):
+        """按数据集展开测试用例，数据集文件无法读取或数据行缺少变量时抛出 SpecError"""
+        try:
+            yield from expand(test_case)
+        except Exception as e:
+            raise SpecError(str(self.path), f"测试用例 '{test_case.name}' 的 dataset", str(e)) from e
+    
+    def _parse(self, parser):
+        """解析测试文件，优先使用并行预解析的结果和解析缓存，否则逐个解析测试套件"""
+        parallel_collector = self.config.pluginmanager.get_plugin(PARALLEL_COLLECT_PLUGIN)
+        if parallel_collector is not None:
+            prepared = parallel_collector.take(str(self.path))
+            if isinstance(prepared, Exception):
+                raise prepared
+            if prepared is not None:
+                return prepared
+        
+        suite_cache = self.config.pluginmanager.get_plugin(SUITE_CACHE_PLUGIN)
+        if suite_cache is not None:
+            return suite_cache.parse(str(self.path), parser)
+        return parser.iter_suites(str(self.path))
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -104,11 +309,238 @@ def pytest_addoption(parser):
         action="store",
         help="指定 pywinauto 测试文件目录路径"
     )
+    group.addoption(
+        "--pywinauto-backend",
+        action="store",
+        default="uia",
+        help="指定 UI 后端 (uia, win32, fake)，默认 uia"
+    )
+    group.addoption(
+        "--pywinauto-fake-tree",
+        action="store",
+        help="fake 后端使用的 UI 树文件 (JSON/YAML)"
+    )
+    group.addoption(
+        "--pywinauto-fake-latency",
+        action="store",
+        type=float,
+        default=0.0,
+        help="fake 后端每次操作注入的延迟（秒）"
+    )
+    group.addoption(
+        "--pywinauto-workers",
+        action="store",
+        type=int,
+        default=0,
+        help="并行执行测试用例的工作进程数，大于 1 时启用分布式执行"
+    )
+    group.addoption(
+        "--pywinauto-no-suite-cache",
+        action="store_true",
+        default=False,
+        help="禁用测试文件解析结果缓存"
+    )
+    group.addoption(
+        "--pywinauto-collect-workers",
+        action="store",
+        type=int,
+        default=0,
+        help="并行解析 --pywinauto-path 目录下测试文件的进程数，大于 1 时启用"
+    )
+    group.addoption(
+        "--pywinauto-excel-all-sheets",
+        action="store_true",
+        default=False,
+        help="解析 Excel 文件的所有工作表，每个工作表作为一个测试套件"
+    )
+    group.addoption(
+        "--pywinauto-reuse-app",
+        action="store_true",
+        default=False,
+        help="在测试用例之间复用应用实例，用例结束后恢复到初始状态而不是关闭"
+    )
+    group.addoption(
+        "--pywinauto-app-max-uses",
+        action="store",
+        type=int,
+        default=20,
+        help="每个应用实例最多复用的次数，达到后关闭并重新启动，默认 20"
+    )
+    group.addoption(
+        "--pywinauto-profile",
+        action="store",
+        metavar="PATH",
+        help="记录每个步骤、定位策略和执行阶段的耗时，会话结束时将汇总写入指定的 JSON 文件"
+    )
+    group.addoption(
+        "--pywinauto-profile-top",
+        action="store",
+        type=int,
+        default=0,
+        help="会话结束时输出最慢的 N 个步骤，大于 0 时启用计时"
+    )
+    group.addoption(
+        "--pywinauto-trace",
+        action="store",
+        metavar="DIR",
+        help="为每个测试用例把执行的步骤、定位过程和结果追加写入 DIR 下的压缩轨迹文件，可在 fake 后端上重放"
+    )
+    group.addoption(
+        "--pywinauto-attachment-queue",
+        action="store",
+        type=int,
+        default=16,
+        help="后台编码截图的队列长度，默认 16，为 0 时在测试线程中同步编码"
+    )
+    group.addoption(
+        "--pywinauto-changed-only",
+        action="store_true",
+        default=False,
+        help="只执行新增、内容有变化或上次未通过的测试用例"
+    )
+    group.addoption(
+        "--pywinauto-failed-first",
+        action="store_true",
+        default=False,
+        help="上次未通过的测试用例优先执行"
+    )
+    group.addoption(
+        "--pywinauto-spread-long",
+        action="store_true",
+        default=False,
+        help="按历史耗时把长用例均匀分散到其他用例之间"
+    )
+    group.addoption(
+        "--pywinauto-max-failures",
+        action="store",
+        type=int,
+        default=0,
+        help="失败的用例达到 N 个时停止执行，为 0 时不限制"
+    )
+    group.addoption(
+        "--pywinauto-time-budget",
+        action="store",
+        type=float,
+        default=0.0,
+        metavar="MINUTES",
+        help="执行时间超过指定分钟数后停止执行，为 0 时不限制"
+    )
+    group.addoption(
+        "--pywinauto-log-queue",
+        action="store_true",
+        default=False,
+        help="日志由后台线程格式化和写入，测试线程只负责把日志记录放入队列"
+    )
+    group.addoption(
+        "--pywinauto-log-json",
+        action="store",
+        metavar="PATH",
+        help="额外写入 JSON Lines 格式的结构化日志，每条记录带有测试用例和步骤的关联字段"
+    )
+    group.addoption(
+        "--pywinauto-screenshot-budget",
+        action="store",
+        type=float,
+        default=50.0,
+        help="整个测试会话保存截图的总大小上限（MB），超出后缩小或丢弃截图，默认 50，为 0 时不限制"
+    )
+    group.addoption(
+        "--pywinauto-screenshot-dedup",
+        action="store",
+        choices=("exact", "perceptual", "off"),
+        default="exact",
+        help="截图去重方式：exact（内容哈希）、perceptual（感知哈希，可能合并只有细微差别的截图）、off（不去重），默认 exact"
+    )
+    group.addoption(
+        "--pywinauto-screenshot-crop",
+        action="store_true",
+        default=False,
+        help="失败截图只截取当前窗口的区域"
+    )
+
+
+def pytest_configure(config):
+    """注册插件组件"""
+    for parser in PARSERS:
+        if isinstance(parser, ExcelParser):
+            parser.all_sheets = config.getoption("--pywinauto-excel-all-sheets")
+    
+    log_queue = config.getoption("--pywinauto-log-queue")
+    log_json = config.getoption("--pywinauto-log-json")
+    if log_queue or log_json:
+        pipeline = LogPipeline(logger, json_file=log_json, use_queue=log_queue)
+        pipeline.start()
+        config.pluginmanager.register(LogPipelinePlugin(pipeline), LOG_PIPELINE_PLUGIN)
+    
+    history_plugin = HistoryPlugin(config)
+    config.pluginmanager.register(history_plugin, HISTORY_PLUGIN)
+    if config.getoption("--pywinauto-changed-only"):
+        config.pluginmanager.register(IncrementalPlugin(config, history_plugin.history), INCREMENTAL_PLUGIN)
+    
+    scheduler = SchedulerPlugin(
+        history_plugin.history,
+        failures_first=config.getoption("--pywinauto-failed-first"),
+        spread=config.getoption("--pywinauto-spread-long"),
+        max_failures=config.getoption("--pywinauto-max-failures"),
+        time_budget=config.getoption("--pywinauto-time-budget") * 60
+    )
+    if scheduler.failures_first or scheduler.spread or scheduler.max_failures or scheduler.time_budget:
+        config.pluginmanager.register(scheduler, SCHEDULER_PLUGIN)
+    
+    profile = config.getoption("--pywinauto-profile")
+    profile_top = config.getoption("--pywinauto-profile-top")
+    if profile or profile_top > 0:
+        config.pluginmanager.register(
+            InstrumentationPlugin(config, profile, profile_top or 10),
+            INSTRUMENTATION_PLUGIN
+        )
+    
+    trace_dir = config.getoption("--pywinauto-trace")
+    if trace_dir:
+        config.pluginmanager.register(TracePlugin(trace_dir), TRACE_PLUGIN)
+    
+    attachment_queue = config.getoption("--pywinauto-attachment-queue")
+    if attachment_queue > 0:
+        config.pluginmanager.register(
+            AttachmentWriterPlugin(AttachmentWriter(attachment_queue)),
+            ATTACHMENT_WRITER_PLUGIN
+        )
+    
+    config.pluginmanager.register(
+        ScreenshotStorePlugin(ScreenshotStore(
+            budget=int(config.getoption("--pywinauto-screenshot-budget") * 1024 * 1024),
+            dedup=config.getoption("--pywinauto-screenshot-dedup"),
+            crop=config.getoption("--pywinauto-screenshot-crop")
+        )),
+        SCREENSHOT_STORE_PLUGIN
+    )
+    
+    cache = getattr(config, 'cache', None)
+    if cache is not None and not config.getoption("--pywinauto-no-suite-cache"):
+        config.pluginmanager.register(SuiteCache(cache.mkdir("pywinauto_suites")), SUITE_CACHE_PLUGIN)
+    
+    collect_workers = config.getoption("--pywinauto-collect-workers")
+    if collect_workers and collect_workers > 1:
+        config.pluginmanager.register(ParallelCollector(config, collect_workers), PARALLEL_COLLECT_PLUGIN)
+    
+    workers = config.getoption("--pywinauto-workers")
+    if workers and workers > 1:
+        # 分布式执行时每个工作进程使用自己的会话池
+        config.pluginmanager.register(
+            DistributedPlugin(config, workers, backend_options(config), session_pool_options(config)),
+            "pywinauto-distributed"
+        )
+    else:
+        pool_options = session_pool_options(config)
+        if pool_options is not None:
+            pool = SessionPool(session_backend(config), **pool_options)
+            config.pluginmanager.register(SessionPoolPlugin(pool), SESSION_POOL_PLUGIN)
 
 
 @pytest.hookimpl(trylast=True)
-def pytest_collect_file(parent, path):
+def pytest_collect_file(parent, file_path):
     """收集测试文件"""
+    path = str(file_path)
     # 获取命令行参数
     pywinauto_file = parent.config.getoption("--pywinauto-file")
     pywinauto_path = parent.config.getoption("--pywinauto-path")
@@ -116,14 +548,15 @@ def pytest_collect_file(parent, path):
     # 检查是否需要处理当前文件
     if pywinauto_file:
         # 只处理指定的单个文件
-        if path.strpath == pywinauto_file:
-            return PywinautoFile.from_parent(parent=parent, fspath=path)
+        if path == os.path.abspath(pywinauto_file):
+            return PywinautoFile.from_parent(parent=parent, path=file_path)
     elif pywinauto_path:
         # 处理指定目录下的所有支持的文件
-        if os.path.commonpath([pywinauto_path, path.strpath]) == pywinauto_path:
-            parser = get_parser(path.strpath)
+        pywinauto_path = os.path.abspath(pywinauto_path)
+        if os.path.commonpath([pywinauto_path, path]) == pywinauto_path:
+            parser = get_parser(path)
             if parser:
-                return PywinautoFile.from_parent(parent=parent, fspath=path)
+                return PywinautoFile.from_parent(parent=parent, path=file_path)
     
     # 默认不处理
     return None
@@ -0,0 +1,92 @@
+import uuid
+from typing import Optional
+from .executor.base_executor import BaseExecutor
+from .executor.plan import CasePlan, compile_case
+from .allure_integration import AllureIntegration
+from .models import TestCase, TestSuite
+from .logger import log_context, logger
+
+
+def run_test_case(executor: BaseExecutor, test_case: TestCase, allure: AllureIntegration,
+                  plan: Optional[CasePlan] = None) -> None:
+    """使用指定执行器执行测试用例，失败时抛出异常
+
+    测试项和分布式执行的工作进程共用此函数，保证两种模式下的执行语义一致。
+    未传入执行计划时先编译测试用例，无效的步骤在启动应用程序之前就会报错。
+    每个阶段和步骤的耗时记录在执行器的 ``instrumentation`` 中，
+    日志记录带有测试用例和步骤的关联字段（见 ``log_context``）。
+    """
+    if plan is None:
+        plan = compile_case(type(executor), test_case)
+    instrumentation = executor.instrumentation
+
+    with instrumentation.case(test_case.name), log_context(test=test_case.name, test_id=uuid.uuid4().hex[:12]):
+        logger.info("开始执行测试用例: %s", test_case.name)
+        try:
+            # 执行测试用例的 setup 步骤
+            with instrumentation.phase('setup'):
+                for index, compiled in enumerate(plan.setup):
+                    allure.start_step(compiled.step.action, compiled.step.description)
+                    with instrumentation.step(compiled.step), \
+                            log_context(step=compiled.step.action, step_id=f"setup[{index}]"):
+                        executor.execute_compiled(compiled)
+                    allure.stop_step()
+
+            # 执行测试用例的主要步骤
+            with instrumentation.phase('steps'):
+                for index, compiled in enumerate(plan.steps):
+                    allure.start_step(compiled.step.action, compiled.step.description)
+                    with instrumentation.step(compiled.step), \
+                            log_context(step=compiled.step.action, step_id=f"steps[{index}]"):
+                        executor.execute_compiled(compiled)
+                    allure.stop_step()
+
+            logger.info("测试用例执行成功: %s", test_case.name)
+        except Exception as e:
+            allure.attach_screenshot("失败截图", region=executor.window_rect)
+            logger.error("测试用例执行失败: %s, 错误: %s", test_case.name, e)
+            raise
+        finally:
+            # 执行测试用例的 teardown 步骤
+            with instrumentation.phase('teardown'):
+                for index, compiled in enumerate(plan.teardown):
+                    try:
+                        allure.start_step(compiled.step.action, "清理步骤")
+                        with instrumentation.step(compiled.step), \
+                                log_context(step=compiled.step.action, step_id=f"teardown[{index}]"):
+                            executor.execute_compiled(compiled)
+                        allure.stop_step()
+                    except Exception as e:
+                        logger.warning("清理步骤执行失败: %s, 错误: %s", compiled.step.action, e)
+
+
+def suite_case(test_suite: TestSuite) -> Optional[TestCase]:
+    """把测试套件的 setup/teardown 包装为测试用例，便于编译执行计划，没有时返回 None"""
+    if not test_suite.setup and not test_suite.teardown:
+        return None
+    return TestCase(name=test_suite.name, steps=[], setup=test_suite.setup, teardown=test_suite.teardown)
+
+
+def run_suite_setup(executor: BaseExecutor, plan: CasePlan) -> None:
+    """执行测试套件的 setup 步骤，失败时抛出异常"""
+    instrumentation = executor.instrumentation
+    logger.info("执行测试套件 setup: %s", plan.name)
+    with instrumentation.case(plan.name), log_context(test=plan.name), instrumentation.phase('suite_setup'):
+        for index, compiled in enumerate(plan.setup):
+            with instrumentation.step(compiled.step), \
+                    log_context(step=compiled.step.action, step_id=f"suite_setup[{index}]"):
+                executor.execute_compiled(compiled)
+
+
+def run_suite_teardown(executor: BaseExecutor, plan: CasePlan) -> None:
+    """执行测试套件的 teardown 步骤，单个步骤失败时记录警告并继续"""
+    instrumentation = executor.instrumentation
+    logger.info("执行测试套件 teardown: %s", plan.name)
+    with instrumentation.case(plan.name), log_context(test=plan.name), instrumentation.phase('suite_teardown'):
+        for index, compiled in enumerate(plan.teardown):
+            try:
+                with instrumentation.step(compiled.step), \
+                        log_context(step=compiled.step.action, step_id=f"suite_teardown[{index}]"):
+                    executor.execute_compiled(compiled)
+            except Exception as e:
+                logger.warning("测试套件清理步骤执行失败: %s, 错误: %s", compiled.step.action, e)
@@ -0,0 +1,115 @@
+import time
+from typing import Dict, List, Optional, TypeVar
+import pytest
+from .history import CaseHistory
+from .logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+SCHEDULER_PLUGIN = "pywinauto-scheduler"
+
+# 耗时超过已知耗时中位数的倍数时视为长用例
+LONG_CASE_FACTOR = 2.0
+
+T = TypeVar('T')
+
+
+def failed_first(nodeids: List[str], history: CaseHistory) -> List[str]:
+    """上次未通过的用例排在前面，其余保持原有顺序"""
+    failed = [n for n in nodeids if history.entries.get(n, {}).get('outcome') == 'failed']
+    if not failed:
+        return list(nodeids)
+    failed_set = set(failed)
+    return failed + [n for n in nodeids if n not in failed_set]
+
+
+def spread_long(nodeids: List[str], durations: Dict[str, float], factor: float = LONG_CASE_FACTOR) -> List[str]:
+    """把耗时超过中位数 ``factor`` 倍的长用例均匀地分散到其他用例之间
+
+    长用例之间以及其他用例之间保持原有的相对顺序。
+    """
+    if len(nodeids) < 3:
+        return list(nodeids)
+    values = sorted(durations[n] for n in nodeids)
+    threshold = values[len(values) // 2] * factor
+    long_cases = [n for n in nodeids if durations[n] > threshold]
+    if not long_cases:
+        return list(nodeids)
+    long_set = set(long_cases)
+    others = [n for n in nodeids if n not in long_set]
+
+    # 第 k 个长用例放在其他用例的 (k + 0.5) / len(long_cases) 位置
+    result: List[str] = []
+    position = 0
+    for k, nodeid in enumerate(long_cases):
+        target = int((k + 0.5) * len(others) / len(long_cases))
+        result.extend(others[position:target])
+        position = max(position, target)
+        result.append(nodeid)
+    result.extend(others[position:])
+    return result
+
+
+def reorder(items: List[T], history: CaseHistory, failures_first: bool = True, spread: bool = False) -> List[T]:
+    """按执行历史重新排列测试项"""
+    by_nodeid = {item.nodeid: item for item in items}
+    nodeids = list(by_nodeid)
+    if spread:
+        nodeids = spread_long(nodeids, history.estimate(nodeids))
+    if failures_first:
+        nodeids = failed_first(nodeids, history)
+    return [by_nodeid[n] for n in nodeids]
+
+
+class SchedulerPlugin:
+    """按执行历史安排 pywinauto 测试用例执行顺序，并在达到失败数或时间预算时提前停止的 pytest 插件
+
+    ``failures_first`` 把上次未通过的用例排在前面，``spread`` 把长用例均匀分散，
+    ``max_failures`` 和 ``time_budget``（秒）为 0 时不限制。
+    """
+
+    def __init__(self, history: CaseHistory, failures_first: bool = False, spread: bool = False,
+                 max_failures: int = 0, time_budget: float = 0.0):
+        self.history = history
+        self.failures_first = failures_first
+        self.spread = spread
+        self.max_failures = max_failures
+        self.time_budget = time_budget
+        self.failures = 0
+        self.started: Optional[float] = None
+        self.session = None
+        self.stop_reason: Optional[str] = None
+
+    def pytest_collection_modifyitems(self, items):
+        """重新排列测试项"""
+        if self.failures_first or self.spread:
+            items[:] = reorder(items, self.history, self.failures_first, self.spread)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        """记录开始执行的时间"""
+        self.session = session
+        self.started = time.monotonic()
+
+    def pytest_runtest_logreport(self, report):
+        """统计失败的用例，达到失败数或时间预算时停止执行"""
+        if report.failed and (report.when == 'call' or report.when == 'setup'):
+            self.failures += 1
+            if self.max_failures and self.failures >= self.max_failures:
+                self._stop(f"失败 {self.failures} 个用例，达到上限 {self.max_failures}")
+        if report.when == 'teardown' and self.time_budget and self.started is not None:
+            elapsed = time.monotonic() - self.started
+            if elapsed >= self.time_budget:
+                self._stop(f"已执行 {elapsed / 60:.1f} 分钟，超过时间预算 {self.time_budget / 60:.1f} 分钟")
+
+    def _stop(self, reason: str) -> None:
+        """通知 pytest 在当前用例结束后停止执行"""
+        if self.session is None or self.stop_reason is not None:
+            return
+        self.stop_reason = reason
+        self.session.shouldstop = f"pywinauto 快速失败: {reason}"
+        logger.warning("提前停止执行: %s", reason)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出提前停止的原因"""
+        if self.stop_reason is not None:
+            terminalreporter.write_line(f"pywinauto 快速失败: {self.stop_reason}，剩余用例未执行")
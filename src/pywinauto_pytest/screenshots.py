@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .attachments import encode_png
+
+# 注册到 pytest 插件管理器时使用的名称
+SCREENSHOT_STORE_PLUGIN = "pywinauto-screenshots"
+
+# 每个测试会话默认的截图总大小上限（字节）
+DEFAULT_BUDGET = 50 * 1024 * 1024
+
+# 感知哈希的边长，哈希共 HASH_SIZE * HASH_SIZE 位
+HASH_SIZE = 16
+
+# 缩小截图时短边的下限，再小就丢弃
+MIN_SIDE = 160
+
+# 去重方式：内容哈希、感知哈希、不去重
+DEDUP_MODES = ('exact', 'perceptual', 'off')
+
+
+def frame_hash(image: Any, hash_size: int = HASH_SIZE) -> int:
+    """计算图像的差值哈希（dHash），几乎相同的画面得到相同的哈希"""
+    gray = image.convert('L').resize((hash_size + 1, hash_size))
+    pixels = gray.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def content_hash(image: Any) -> str:
+    """计算图像像素内容的哈希，只有完全相同的画面才相同"""
+    return hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+
+
+class ScreenshotStore:
+    """截图去重和大小预算
+
+    ``admit`` 在测试线程中按画面哈希登记截图，重复的截图只保存第一次出现的那张；
+    ``encode`` 负责编码，已保存的总大小超过 ``budget`` 时逐次缩小一半，
+    缩到短边小于 ``min_side`` 仍放不下时丢弃。``crop`` 为 True 时截图裁剪到当前窗口。
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, dedup: str = 'exact', crop: bool = False,
+                 min_side: int = MIN_SIDE):
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"不支持的截图去重方式: {dedup}")
+        self.budget = budget
+        self.dedup = dedup
+        self.crop = crop
+        self.min_side = min_side
+        self._lock = threading.Lock()
+        # 画面哈希 -> 首次出现的截图名称
+        self._seen: Dict[Hashable, str] = {}
+        # 画面哈希 -> 编码后的大小
+        self._sizes: Dict[Hashable, int] = {}
+        self._duplicates: Counter = Counter()
+        self.captured = 0
+        self.stored = 0
+        self.stored_bytes = 0
+        self.downscaled = 0
+        self.dropped = 0
+        self._shrunk_bytes = 0
+
+    def key(self, image: Any) -> Optional[Hashable]:
+        """返回用于去重的画面哈希，不去重时返回 None"""
+        if self.dedup == 'perceptual':
+            return image.size, frame_hash(image)
+        if self.dedup == 'exact':
+            return image.size, image.mode, content_hash(image)
+        return None
+
+    def admit(self, image: Any, label: str) -> Tuple[Optional[Hashable], Optional[str]]:
+        """登记截图，返回 (画面哈希, 重复时首次出现的截图名称)"""
+        key = self.key(image)
+        with self._lock:
+            self.captured += 1
+            if key is None:
+                return None, None
+            original = self._seen.get(key)
+            if original is not None:
+                self._duplicates[key] += 1
+                return key, original
+            self._seen[key] = label
+        return key, None
+
+    def encode(self, image: Any, key: Optional[Hashable] = None) -> Optional[bytes]:
+        """按剩余预算编码截图，放不下时返回 None
+
+        截图被丢弃或编码失败时注销 ``admit`` 登记的画面哈希，之后相同的截图重新保存，
+        不会指向一张不存在的截图。
+        """
+        try:
+            data = encode_png(image)
+            full_size = len(data)
+            shrunk = False
+            with self._lock:
+                remaining = self.budget - self.stored_bytes if self.budget > 0 else None
+            while remaining is not None and len(data) > remaining:
+                width, height = image.size
+                if min(width, height) // 2 < self.min_side:
+                    with self._lock:
+                        self.dropped += 1
+                        self._shrunk_bytes += full_size
+                        self._forget(key)
+                    return None
+                image = image.resize((width // 2, height // 2))
+                data = encode_png(image)
+                shrunk = True
+        except Exception:
+            with self._lock:
+                self._forget(key)
+            raise
+
+        with self._lock:
+            self.stored += 1
+            self.stored_bytes += len(data)
+            if shrunk:
+                self.downscaled += 1
+                self._shrunk_bytes += full_size - len(data)
+            if key is not None:
+                self._sizes[key] = len(data)
+        return data
+
+    def _forget(self, key: Optional[Hashable]) -> None:
+        """注销未保存的截图的画面哈希，调用方持有锁"""
+        if key is not None:
+            self._seen.pop(key, None)
+
+    @property
+    def duplicates(self) -> int:
+        """重复截图的数量"""
+        return sum(self._duplicates.values())
+
+    @property
+    def saved_bytes(self) -> int:
+        """去重、缩小和丢弃节省的字节数，重复截图按首次保存的大小计算"""
+        with self._lock:
+            deduplicated = sum(self._sizes.get(key, 0) * count for key, count in self._duplicates.items())
+            return deduplicated + self._shrunk_bytes
+
+
+class ScreenshotStorePlugin:
+    """在整个测试会话中共享截图去重和预算的 pytest 插件"""
+
+    def __init__(self, store: ScreenshotStore):
+        self.store = store
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出截图统计"""
+        store = self.store
+        if store.captured:
+            terminalreporter.write_line(
+                f"pywinauto 截图: 截取 {store.captured} 张, 保存 {store.stored} 张 "
+                f"({store.stored_bytes / 1024:.1f} KB), 重复 {store.duplicates} 张, "
+                f"缩小 {store.downscaled} 张, 丢弃 {store.dropped} 张, "
+                f"节省 {store.saved_bytes / 1024:.1f} KB"
+            )
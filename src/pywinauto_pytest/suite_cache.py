@@ -0,0 +1,145 @@
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from .models import TestSuite
+from .parser.base_parser import BaseParser
+from .logger import logger
+
+# 缓存文件格式版本，数据模型或存储格式变化时需要递增
+CACHE_FORMAT = 4
+
+# 注册到 pytest 插件管理器时使用的名称
+SUITE_CACHE_PLUGIN = "pywinauto-suite-cache"
+
+
+def parser_key(parser: BaseParser) -> str:
+    """返回标识解析器实现及其版本的键"""
+    cls = type(parser)
+    return f"{cls.__module__}.{cls.__qualname__}:{parser.cache_token()}"
+
+
+class SuiteCache:
+    """已解析测试套件的磁盘缓存
+
+    每个测试文件对应一个缓存文件，文件头记录路径、修改时间、大小、内容哈希和解析器版本。
+    修改时间和大小均未变化时直接复用；否则比较内容哈希，内容未变时仍然复用并刷新文件头。
+    文件中的 TestSuite 列表使用 pickle 序列化后以 zlib 压缩存储。
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, file_path: str) -> Path:
+        """返回测试文件对应的缓存文件路径"""
+        digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return self.directory / f"{digest}.bin"
+
+    def _read_entry(self, file_path: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """读取缓存文件，返回 (文件头, 压缩的 TestSuite 列表)"""
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, 'rb') as f:
+                header, payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("读取解析缓存失败: %s, 错误: %s", entry_path, e)
+            return None
+        if header.get('format') != CACHE_FORMAT:
+            return None
+        return header, payload
+
+    def _write_entry(self, file_path: str, header: Dict[str, Any], payload: bytes) -> None:
+        """写入缓存文件，先写临时文件再替换，避免并发读到不完整的内容"""
+        entry_path = self._entry_path(file_path)
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump((header, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            logger.warning("写入解析缓存失败: %s, 错误: %s", entry_path, e)
+
+    def load(self, file_path: str, parser: BaseParser) -> Optional[List[TestSuite]]:
+        """从缓存加载测试套件并统计命中率，缓存无效时返回 None"""
+        suites = self._load(file_path, parser)
+        if suites is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.debug("解析缓存命中: %s", file_path)
+        return suites
+
+    def _load(self, file_path: str, parser: BaseParser) -> Optional[List[TestSuite]]:
+        """从缓存加载测试套件"""
+        entry = self._read_entry(file_path)
+        if entry is None:
+            return None
+        header, payload = entry
+        if header.get('path') != os.path.abspath(file_path) or header.get('parser') != parser_key(parser):
+            return None
+
+        stat = os.stat(file_path)
+        if (header.get('mtime_ns'), header.get('size')) != (stat.st_mtime_ns, stat.st_size):
+            # 修改时间变化但内容可能未变，比较内容哈希
+            if header.get('digest') != self._digest(file_path):
+                return None
+            header = dict(header, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._write_entry(file_path, header, payload)
+
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.debug("解析缓存内容无效: %s, 错误: %s", file_path, e)
+            return None
+
+    def store(self, file_path: str, parser: BaseParser, suites: List[TestSuite]) -> None:
+        """保存解析结果"""
+        stat = os.stat(file_path)
+        header = {
+            'format': CACHE_FORMAT,
+            'path': os.path.abspath(file_path),
+            'parser': parser_key(parser),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'digest': self._digest(file_path),
+        }
+        payload = zlib.compress(pickle.dumps(suites, protocol=pickle.HIGHEST_PROTOCOL))
+        self._write_entry(file_path, header, payload)
+
+    def parse(self, file_path: str, parser: BaseParser) -> List[TestSuite]:
+        """优先从缓存加载，未命中时解析文件中的所有测试套件并写入缓存"""
+        suites = self.load(file_path, parser)
+        if suites is not None:
+            return suites
+
+        suites = list(parser.iter_suites(file_path))
+        self.store(file_path, parser, suites)
+        return suites
+
+    @staticmethod
+    def _digest(file_path: str) -> str:
+        """计算文件内容哈希"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @property
+    def hit_rate(self) -> float:
+        """缓存命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def pytest_report_collectionfinish(self, config):
+        """在收集完成后报告缓存命中率"""
+        total = self.hits + self.misses
+        if total:
+            return f"pywinauto 解析缓存: 命中 {self.hits}/{total} ({self.hit_rate:.0%})"
@@ -0,0 +1,319 @@
+import gzip
+import itertools
+import json
+import os
+import re
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pytest
+from .executor.base_executor import BaseExecutor
+from .instrumentation import TimingRecord
+from .models import TestStep
+from .logger import logger
+
+# 注册到 pytest 插件管理器时使用的名称
+TRACE_PLUGIN = "pywinauto-trace"
+
+# 轨迹文件格式版本，读取时跳过不认识的版本
+TRACE_VERSION = 1
+
+TRACE_SUFFIX = ".trace.gz"
+
+
+@dataclass
+class TraceStep:
+    """轨迹中的一个步骤：步骤定义、定位过程、定位到的元素和执行结果
+
+    lookups 为 (定位策略, 是否找到, 耗时) 列表，element 为后端给出的元素标识。
+    """
+    step: TestStep
+    phase: Optional[str] = None
+    ok: bool = True
+    duration: float = 0.0
+    error: Optional[str] = None
+    lookups: List[Tuple[str, bool, float]] = field(default_factory=list)
+    strategy: Optional[str] = None
+    element: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class TraceRun:
+    """测试用例的一次执行"""
+    case: str
+    nodeid: Optional[str] = None
+    backend: Optional[str] = None
+    started: float = 0.0
+    steps: List[TraceStep] = field(default_factory=list)
+
+
+class StepRecorder:
+    """把执行的步骤转换为轨迹事件的计时监听器，事件保存在内存中
+
+    用于记录测试套件的 setup：套件 setup 只执行一次，记录的事件写入该套件每个测试用例的轨迹开头。
+    """
+
+    def __init__(self):
+        self.events: List[List[Any]] = []
+        self._lookups: List[List[Any]] = []
+        self._resolved: Optional[List[Any]] = None
+        self.steps = 0
+
+    def _write(self, event: List[Any]) -> None:
+        """保存一个事件"""
+        self.events.append(event)
+
+    def before_step(self, step: TestStep) -> None:
+        """开始记录新步骤的定位过程"""
+        self._lookups = []
+        self._resolved = None
+
+    def after_lookup(self, record: TimingRecord) -> None:
+        """记录一次定位策略尝试"""
+        self._lookups.append([record.name, record.ok, round(record.duration, 6)])
+
+    def after_resolve(self, strategy: str, target: str, locator: Optional[str], element: Dict[str, Any]) -> None:
+        """记录最终定位到的元素，一个步骤定位多个元素时保留最后一个"""
+        self._resolved = [strategy, element]
+
+    def after_step(self, step: TestStep, record: TimingRecord) -> None:
+        """写入步骤事件"""
+        strategy, element = self._resolved or (None, None)
+        self._write([
+            'step', record.phase, step.action, step.target, step.locator, step.expected,
+            dict(step.data) if step.data else None, step.description,
+            record.ok, round(record.duration, 6), record.error, self._lookups, strategy, element
+        ])
+        self.steps += 1
+
+
+class TraceRecorder(StepRecorder):
+    """把执行的步骤追加写入 gzip 压缩轨迹文件的计时监听器
+
+    每个事件是一行紧凑的 JSON 数组：``run`` 标记一次执行的开始，``step`` 记录一个步骤及其定位过程和结果。
+    同一个文件可以追加多次执行，每次执行是一个独立的 gzip 成员；每个事件写入后同步刷新，
+    进程异常退出时已完成的步骤仍然可以读出。``case`` 为 None 时不写入 ``run`` 事件，
+    步骤属于文件中的上一次执行（用于追加测试套件的 teardown）；文件在写入第一个事件时才打开。
+    """
+
+    def __init__(self, path: str, case: Optional[str] = None, nodeid: Optional[str] = None,
+                 backend: Optional[str] = None):
+        super().__init__()
+        self.path = path
+        self._file = None
+        if case is not None:
+            self._write(['run', TRACE_VERSION, case, nodeid, backend, time.time()])
+
+    def _write(self, event: List[Any]) -> None:
+        """写入一个事件并刷新到磁盘"""
+        if self._file is None:
+            self._file = gzip.open(self.path, 'ab')
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':'), default=str)
+        self._file.write(line.encode('utf-8') + b'\n')
+        self._file.flush()
+
+    def write_events(self, events: List[List[Any]]) -> None:
+        """写入 ``StepRecorder`` 记录的事件"""
+        for event in events:
+            self._write(event)
+
+    def close(self) -> None:
+        """结束当前 gzip 成员"""
+        if self._file is not None:
+            self._file.close()
+
+
+def read_trace(path: str) -> List[TraceRun]:
+    """读取轨迹文件中的所有执行，文件末尾不完整时返回已完整写入的部分
+
+    版本不支持的执行连同它的步骤一起跳过，直到下一个支持的执行开始。
+    """
+    runs: List[TraceRun] = []
+    skipping = False
+    with gzip.open(path, 'rb') as f:
+        try:
+            for line in f:
+                event = json.loads(line)
+                if event[0] == 'run':
+                    skipping = event[1] != TRACE_VERSION
+                    if skipping:
+                        logger.warning("跳过不支持的轨迹版本 %s: %s", event[1], path)
+                        continue
+                    runs.append(TraceRun(case=event[2], nodeid=event[3], backend=event[4], started=event[5]))
+                elif event[0] == 'step' and runs and not skipping:
+                    (_, phase, action, target, locator, expected, data, description,
+                     ok, duration, error, lookups, strategy, element) = event
+                    runs[-1].steps.append(TraceStep(
+                        step=TestStep(action=action, target=target, locator=locator, expected=expected,
+                                      data=data or {}, description=description),
+                        phase=phase, ok=ok, duration=duration, error=error,
+                        lookups=[tuple(lookup) for lookup in lookups], strategy=strategy, element=element
+                    ))
+        except (EOFError, zlib.error, ValueError) as e:
+            logger.warning("轨迹文件不完整，只读取了完整的部分: %s (%s)", path, e)
+    return runs
+
+
+@dataclass
+class ReplayStep:
+    """重放的一个步骤，与轨迹中的原始结果对照"""
+    original: TraceStep
+    ok: bool
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def diverged(self) -> bool:
+        """重放结果与原始结果不一致"""
+        return self.ok != self.original.ok
+
+
+def replay(run: TraceRun, executor: BaseExecutor) -> List[ReplayStep]:
+    """在执行器上按原始顺序重新执行轨迹中的步骤
+
+    轨迹记录的是实际执行过的步骤（包括失败后执行的 teardown），因此步骤失败时继续执行后面的步骤。
+    每个步骤的耗时和定位过程记录在执行器的 ``instrumentation`` 中，可以像正常执行一样分析。
+    """
+    instrumentation = executor.instrumentation
+    results: List[ReplayStep] = []
+    with instrumentation.case(run.case):
+        for phase, steps in itertools.groupby(run.steps, key=lambda s: s.phase):
+            with instrumentation.phase(phase or 'steps'):
+                for traced in steps:
+                    started = time.perf_counter()
+                    error = None
+                    try:
+                        with instrumentation.step(traced.step):
+                            executor.execute_step(traced.step)
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                    results.append(ReplayStep(traced, error is None, time.perf_counter() - started, error))
+    return results
+
+
+def fake_tree(runs: List[TraceRun]) -> Dict[str, Any]:
+    """根据轨迹中定位到的元素构建 fake 后端的 UI 树，不需要原始桌面即可重放
+
+    每个窗口（主窗口和 ``switch_window`` 切换到的窗口）的子控件是在该窗口中定位到的元素，按首次出现的顺序排列；
+    原始执行中通过的 ``assert_text`` 的期望值作为控件的初始文本。
+    树中只有轨迹涉及的控件，按序号定位（index）的步骤可能定位到不同的控件。
+    """
+    windows: Dict[str, Dict[str, Any]] = {}
+    seen: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def window(title: str) -> Dict[str, Any]:
+        if title not in windows:
+            windows[title] = {'control_type': 'Window', 'title': title, 'children': []}
+        return windows[title]
+
+    current = window('Main')
+    for run in runs:
+        for traced in run.steps:
+            step = traced.step
+            if step.action == 'start_application':
+                current = windows['Main']
+            elif step.action == 'switch_window' and traced.ok:
+                current = window(step.locator or '')
+            if not traced.element or traced.strategy == 'window' or 'control_type' not in traced.element:
+                continue
+            element = traced.element
+            key = (current['title'], element['control_type'], element.get('title'),
+                   element.get('auto_id'), element.get('class_name'))
+            spec = seen.get(key)
+            if spec is None:
+                spec = {k: element[k] for k in ('control_type', 'title', 'auto_id', 'class_name', 'rect')
+                        if element.get(k) is not None}
+                current['children'].append(spec)
+                seen[key] = spec
+            if step.action == 'assert_text' and traced.ok and 'texts' not in spec:
+                spec['texts'] = [step.expected or '']
+    return {'windows': list(windows.values())}
+
+
+def trace_path(directory: str, nodeid: str) -> str:
+    """测试项对应的轨迹文件路径"""
+    name = re.sub(r'[^\w.-]+', '_', nodeid).strip('_')
+    return os.path.join(directory, name + TRACE_SUFFIX)
+
+
+class TracePlugin:
+    """为每个 pywinauto 测试项记录执行轨迹的 pytest 插件
+
+    轨迹覆盖测试项的执行阶段（测试用例的 setup/steps/teardown）。属于定义了 setup/teardown 的测试套件时，
+    套件 setup 的步骤写在每个测试用例的轨迹开头，套件 teardown 的步骤追加到在它之前结束的测试用例的轨迹中，
+    单独重放任意一个测试用例时都会先执行套件 setup。
+    分布式执行模式下步骤在工作进程中执行，不记录轨迹。
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.paths: List[str] = []
+        # 测试套件 id -> 套件 setup 的步骤事件
+        self.suite_setups: Dict[str, List[List[Any]]] = {}
+
+    @contextmanager
+    def record_suite_setup(self, suite_id: str, executor: BaseExecutor) -> Iterator[None]:
+        """记录测试套件 setup 执行的步骤，setup 失败时也保留已执行的步骤"""
+        recorder = StepRecorder()
+        executor.instrumentation.add_listener(recorder)
+        try:
+            yield
+        finally:
+            executor.instrumentation.remove_listener(recorder)
+            self.suite_setups[suite_id] = recorder.events
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        """在测试项执行期间把记录器注册到执行器的计时器上"""
+        executor = getattr(item, 'executor', None)
+        if executor is None or getattr(item, 'remote_result', None) is not None:
+            yield
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = trace_path(self.directory, item.nodeid)
+        suite = getattr(item, 'suite', None)
+        try:
+            backend = getattr(getattr(executor, 'backend', None), 'name', None)
+            recorder = TraceRecorder(path, item.test_case.name, item.nodeid, backend)
+            if suite is not None:
+                recorder.write_events(self.suite_setups.get(suite.id, []))
+        except OSError as e:
+            logger.warning("创建轨迹文件失败: %s", e)
+            yield
+            return
+
+        executor.instrumentation.add_listener(recorder)
+        try:
+            yield
+        finally:
+            executor.instrumentation.remove_listener(recorder)
+            recorder.close()
+            self.paths.append(path)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        """测试套件的 teardown 在最后一个测试项的 teardown 阶段执行，把它的步骤追加到该测试项的轨迹"""
+        executor = getattr(item, 'executor', None)
+        path = trace_path(self.directory, item.nodeid)
+        if getattr(item, 'suite', None) is None or executor is None or path not in self.paths:
+            yield
+            return
+
+        recorder = TraceRecorder(path)
+        executor.instrumentation.add_listener(recorder)
+        try:
+            yield
+        finally:
+            executor.instrumentation.remove_listener(recorder)
+            try:
+                recorder.close()
+            except OSError as e:
+                logger.warning("写入轨迹文件失败: %s", e)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """输出轨迹目录"""
+        if self.paths:
+            terminalreporter.write_line(f"pywinauto 执行轨迹: {len(self.paths)} 个测试用例，已写入 {self.directory}")
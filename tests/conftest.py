@@ -3,6 +3,7 @@ import pytest
 import os
 from pathlib import Path
 
+pytest_plugins = ["pytester"]
 
 @pytest.fixture(scope="session")
 def test_dir():
@@ -87,3 +88,64 @@ def sample_md_content():
 **Teardown**:
 - **close_application**
 """
+
+
+@pytest.fixture(scope="session")
+def fake_spec_content():
+    """可在 fake 后端上运行的 YAML 测试用例内容"""
+    return """
+test_suite: Fake Calculator Suite
+tests:
+  - name: 设置文本
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: set_text
+        target: Edit
+        locator: CalculatorResults
+        data:
+          text: "42"
+      - action: assert_text
+        target: Edit
+        expected: "42"
+    teardown:
+      - action: close_application
+  - name: 点击按钮
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: click
+        target: Button
+        locator: "1"
+    teardown:
+      - action: close_application
+  - name: 切换窗口
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: switch_window
+        locator: About
+      - action: click
+        target: Button
+        locator: okButton
+    teardown:
+      - action: close_application
+  - name: 断言失败
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: assert_text
+        target: Edit
+        expected: "999"
+    teardown:
+      - action: close_application
+"""
+
+
+@pytest.fixture
+def fake_run_args(test_data_dir):
+    """使用 fake 后端运行插件的命令行参数"""
+    return [
+        "--pywinauto-backend=fake",
+        f"--pywinauto-fake-tree={test_data_dir / 'calculator_tree.yaml'}",
+    ]
@@ -0,0 +1,83 @@
+"""测试后台附件写入器"""
+import threading
+from PIL import Image
+from pywinauto_pytest import allure_integration
+from pywinauto_pytest.allure_integration import AllureIntegration
+from pywinauto_pytest.attachments import AttachmentWriter, encode_png
+
+
+class TestAttachmentWriter:
+    """测试后台编码截图"""
+
+    def test_encodes_in_background(self):
+        """测试在后台线程中编码，flush 按提交顺序返回结果"""
+        threads = []
+
+        def encode(image):
+            threads.append(threading.current_thread())
+            return encode_png(image)
+
+        writer = AttachmentWriter(maxsize=2, encode=encode)
+        try:
+            for index in range(5):
+                writer.submit(f"截图{index}", Image.new("RGB", (4, 4)))
+            attachments = writer.flush()
+        finally:
+            writer.close()
+
+        assert [a.name for a in attachments] == [f"截图{index}" for index in range(5)]
+        assert all(a.data.startswith(b"\x89PNG") for a in attachments)
+        assert threading.current_thread() not in threads
+        assert writer.flush() == []
+
+    def test_encode_failure_is_skipped(self):
+        """测试编码失败的附件被跳过，不影响后续附件"""
+        def encode(image):
+            if image is None:
+                raise ValueError("无效图像")
+            return b"data"
+
+        writer = AttachmentWriter(encode=encode)
+        writer.submit("失败", None)
+        writer.submit("成功", object())
+        attachments = writer.flush()
+        writer.close()
+
+        assert [a.name for a in attachments] == ["成功"]
+        assert writer.failed == 1
+
+    def test_flush_without_submit(self):
+        """测试没有提交过附件时不会启动后台线程"""
+        writer = AttachmentWriter()
+        assert writer.flush() == []
+        writer.close()
+
+
+class TestAllureIntegration:
+    """测试 Allure 截图附件"""
+
+    def test_screenshot_attached_on_flush(self, monkeypatch):
+        """测试启用写入器时截图在 flush 时才添加到报告"""
+        monkeypatch.setattr(allure_integration, "grab_screen", lambda bbox=None: Image.new("RGB", (4, 4)))
+        writer = AttachmentWriter()
+        integration = AllureIntegration(writer)
+        attached = []
+        monkeypatch.setattr(integration, "attach_data", lambda data, name, file_type="png": attached.append(name))
+
+        integration.attach_screenshot("失败截图")
+        assert attached == []
+        integration.flush()
+        writer.close()
+
+        assert attached == ["失败截图"]
+
+    def test_screenshot_without_writer(self, monkeypatch):
+        """测试未启用写入器时在内存中同步编码"""
+        monkeypatch.setattr(allure_integration, "grab_screen", lambda bbox=None: Image.new("RGB", (4, 4)))
+        integration = AllureIntegration()
+        attached = []
+        monkeypatch.setattr(integration, "attach_data", lambda data, name, file_type="png": attached.append(data))
+
+        integration.attach_screenshot()
+
+        assert attached and attached[0].startswith(b"\x89PNG")
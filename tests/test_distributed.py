@@ -0,0 +1,108 @@
+"""测试分布式执行"""
+import json
+from PIL import Image
+from pywinauto_pytest import distributed
+from pywinauto_pytest.allure_integration import AllureIntegration
+from pywinauto_pytest.distributed import RecordingAllure, balance_shards, replay_events, timing_report
+from pywinauto_pytest.history import CaseHistory
+from pywinauto_pytest.instrumentation import TimingRecord
+from pywinauto_pytest.screenshots import ScreenshotStore
+
+
+class TestBalanceShards:
+    """测试按耗时分片"""
+
+    def test_balances_by_duration(self):
+        """测试各分片总耗时均衡"""
+        durations = {"a": 4.0, "b": 3.0, "c": 3.0, "d": 2.0}
+        shards = balance_shards(durations, 2)
+
+        totals = [sum(durations[n] for n in shard) for shard in shards]
+        assert totals == [6.0, 6.0]
+        assert sorted(n for shard in shards for n in shard) == list("abcd")
+
+    def test_keeps_collection_order(self):
+        """测试分片内保持收集顺序"""
+        shards = balance_shards({"a": 1.0, "b": 5.0, "c": 1.0, "d": 1.0}, 2)
+        assert ["b"] in shards
+        assert ["a", "c", "d"] in shards
+
+    def test_more_workers_than_cases(self):
+        """测试工作进程数多于用例数"""
+        assert len(balance_shards({"a": 1.0}, 4)) == 1
+
+
+class TestCaseHistory:
+    """测试执行历史"""
+
+    def test_estimate_uses_known_average(self):
+        """测试没有历史的用例使用已知平均耗时"""
+        history = CaseHistory()
+        history.record("a", 2.0, "passed")
+        history.record("a", 4.0, "passed")
+        history.record("b", 6.0, "failed")
+
+        assert history.estimate(["a", "b", "c"]) == {"a": 3.0, "b": 6.0, "c": 4.5}
+
+
+class TestReplayEvents:
+    """测试在主进程中回放工作进程的 Allure 事件"""
+
+    def test_replay_in_order(self, monkeypatch):
+        """测试步骤、附件和截图按原始顺序回放，截图经过主进程的裁剪和去重"""
+        monkeypatch.setattr(distributed, "grab_screen", lambda bbox=None: Image.new("RGB", (64, 48), (200, 0, 0)))
+        recording = RecordingAllure()
+        recording.start_step("click", "点击按钮")
+        recording.attach_data(b"log", "日志", "txt")
+        recording.attach_screenshot("失败截图", region=lambda: (0, 0, 32, 24))
+        recording.attach_screenshot("失败截图")
+
+        replayed = []
+        allure = AllureIntegration(store=ScreenshotStore(crop=True, dedup="exact"), owner="用例")
+        monkeypatch.setattr(allure, "start_step", lambda name, description=None: replayed.append(("step", name)))
+        monkeypatch.setattr(allure, "attach_data",
+                            lambda data, name, file_type="png": replayed.append((file_type, name, data)))
+        replay_events(allure, recording.events)
+
+        assert [event[:2] for event in replayed] == [
+            ("step", "click"), ("txt", "日志"), ("png", "失败截图"), ("png", "失败截图")
+        ]
+        assert replayed[1][2] == b"log"
+        assert distributed.decode_png(replayed[2][2]).size == (32, 24)
+        assert distributed.decode_png(replayed[3][2]).size == (64, 48)
+        assert allure.store.captured == 2
+
+    def test_timing_report(self):
+        """测试阶段和步骤耗时整理为 JSON 附件"""
+        timings = [
+            TimingRecord(kind="lookup", name="title", duration=0.1),
+            TimingRecord(kind="step", name="click", duration=0.2, phase="steps", target="Button", locator="1"),
+            TimingRecord(kind="phase", name="steps", duration=0.3),
+        ]
+        report = json.loads(timing_report(timings))
+        assert report["phases"] == [{"phase": "steps", "duration": 0.3, "ok": True}]
+        assert [step["action"] for step in report["steps"]] == ["click"]
+        assert timing_report([]) is None
+
+
+class TestDistributedRun:
+    """测试分布式执行的端到端流程"""
+
+    def test_results_merged_into_one_run(self, pytester, fake_spec_content, fake_run_args):
+        """测试工作进程的结果合并到同一次 pytest 运行中"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), "--pywinauto-workers=2", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3, failed=1)
+        result.stdout.fnmatch_lines(["*工作进程*异常信息*", "*AssertionError*"])
+
+    def test_records_history(self, pytester, fake_spec_content, fake_run_args):
+        """测试执行后记录用例耗时"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+
+        history = CaseHistory(pytester.parseconfigure().cache)
+        assert len(history.entries) == 4
+        assert history.entries[next(n for n in history.entries if "断言失败" in n)]["outcome"] == "failed"
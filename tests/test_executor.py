@@ -0,0 +1,474 @@
+"""测试执行器功能"""
+import threading
+import time
+import pytest
+from pywinauto_pytest.executor import get_backend
+from pywinauto_pytest.executor.backends import FakeBackend
+from pywinauto_pytest.executor.pywinauto_executor import PywinautoExecutor
+from pywinauto_pytest.executor.locator_cache import LocatorCache
+from pywinauto_pytest.executor.waits import wait_until
+from pywinauto_pytest.models import TestStep
+
+
+@pytest.fixture
+def fake_backend(test_data_dir):
+    """加载计算器 UI 树的 fake 后端"""
+    return FakeBackend.from_file(str(test_data_dir / "calculator_tree.yaml"))
+
+
+@pytest.fixture
+def executor(fake_backend):
+    """已启动计算器的执行器"""
+    executor = PywinautoExecutor(backend=fake_backend)
+    executor.execute_step(TestStep(action="start_application", target="calc.exe"))
+    return executor
+
+
+def _probes(backend):
+    """统计查找控件的次数"""
+    return backend.calls["find_child"] + backend.calls["find_children"]
+
+
+class TestFakeBackend:
+    """测试 fake 后端"""
+
+    def test_get_backend(self, test_data_dir):
+        """测试通过注册表创建后端"""
+        backend = get_backend("fake", tree_file=str(test_data_dir / "calculator_tree.yaml"))
+        assert isinstance(backend, FakeBackend)
+        with pytest.raises(ValueError):
+            get_backend("unknown")
+
+    def test_run_steps(self, executor, fake_backend):
+        """测试在 fake 后端上执行步骤"""
+        executor.execute_step(TestStep(action="click", target="Button", locator="1"))
+        executor.execute_step(TestStep(action="set_text", target="Edit", locator="CalculatorResults",
+                                       data={"text": "12"}))
+        executor.execute_step(TestStep(action="type", target="Edit", locator="TextBox", data={"text": "3"}))
+        executor.execute_step(TestStep(action="assert_text", target="Edit", expected="123"))
+        executor.execute_step(TestStep(action="assert_exists", target="Button", locator="plusButton"))
+        assert fake_backend.calls["click"] == 1
+
+    def test_assert_text_failure(self, executor):
+        """测试文本断言失败"""
+        with pytest.raises(AssertionError):
+            executor.execute_step(TestStep(action="assert_text", target="Edit", expected="42"))
+
+    def test_switch_window(self, executor):
+        """测试切换窗口"""
+        executor.execute_step(TestStep(action="switch_window", locator="About"))
+        assert executor.current_window.title == "About"
+        executor.execute_step(TestStep(action="click", target="Button", locator="OK"))
+
+    def test_connect_to_running_application(self, executor, fake_backend):
+        """测试应用程序已运行时直接连接"""
+        app = executor.app
+        executor.execute_step(TestStep(action="start_application", target="calc.exe"))
+        assert executor.app is app
+        assert fake_backend.calls["start"] == 1
+
+    def test_close_application(self, executor, fake_backend):
+        """测试关闭应用程序"""
+        executor.execute_step(TestStep(action="close_application"))
+        assert executor.app is None
+        assert "calc.exe" not in fake_backend.applications
+
+    def test_latency(self):
+        """测试按操作注入延迟"""
+        backend = FakeBackend(tree={"windows": []}, latency={"start": 0.01})
+        started = time.perf_counter()
+        backend.start("any.exe")
+        assert time.perf_counter() - started >= 0.01
+
+
+class TestLocatorCache:
+    """测试定位缓存"""
+
+    def test_cache_hit_skips_probes(self, executor, fake_backend):
+        """测试缓存命中时不再探测"""
+        first = executor._find_element("Button", "num2Button")
+        probes = _probes(fake_backend)
+
+        second = executor._find_element("Button", "num2Button")
+
+        assert first is second
+        assert _probes(fake_backend) == probes
+        assert executor.locator_cache.hits == 1
+        assert executor.locator_cache.misses == 1
+
+    def test_remembers_strategy(self, executor):
+        """测试记录命中的定位策略"""
+        executor._find_element("Edit", "TextBox")
+        entry = executor.locator_cache._entries[("Edit", "TextBox")]
+        assert entry.strategy == "class_name"
+
+    def test_index_lookup_cached(self, executor):
+        """测试索引定位结果被缓存"""
+        element = executor._find_element("Button", "4")
+        assert element.auto_id == "equalButton"
+        assert executor.locator_cache._entries[("Button", "4")].strategy == "index"
+
+    def test_stale_entry_is_refreshed(self, executor, fake_backend):
+        """测试失效条目会被重新定位"""
+        old = executor._find_element("Button", "plusButton")
+        old.alive = False
+        replacement = old.__class__("Button", auto_id="plusButton", parent=old.parent)
+        old.parent.children.append(replacement)
+        probes = _probes(fake_backend)
+
+        element = executor._find_element("Button", "plusButton")
+
+        assert element is replacement
+        # 优先使用上次成功的策略，一次探测即可
+        assert _probes(fake_backend) == probes + 1
+        assert executor.locator_cache.stale == 1
+
+    def test_switch_window_invalidates(self, executor):
+        """测试切换窗口时缓存失效"""
+        executor._find_element("Button", "1")
+        executor.execute_step(TestStep(action="switch_window", locator="Calculator"))
+        executor._find_element("Button", "1")
+        assert executor.locator_cache.hits == 0
+
+    def test_close_application_clears(self, executor):
+        """测试关闭应用程序后清空缓存"""
+        executor._find_element("Button", "1")
+        executor.execute_step(TestStep(action="close_application"))
+        assert len(executor.locator_cache) == 0
+
+    def test_failed_action_invalidates(self, executor, fake_backend):
+        """测试操作失败时使条目失效"""
+        executor._find_element("Button", "1")
+
+        def broken_click(element):
+            raise RuntimeError("点击失败")
+
+        fake_backend.click = broken_click
+
+        with pytest.raises(RuntimeError):
+            executor.execute_step(TestStep(action="click", target="Button", locator="1"))
+
+        assert ("Button", "1") not in executor.locator_cache._entries
+        assert executor.locator_cache.invalidations == 1
+
+    def test_stats(self):
+        """测试统计信息"""
+        cache = LocatorCache()
+        assert cache.stats()["hit_rate"] == 0.0
+        cache.put("w", "Button", "OK", "title", object())
+        cache.lookup("w", "Button", "OK", lambda e: True)
+        cache.lookup("w", "Edit", None, lambda e: True)
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class SpecDouble:
+    """模拟 pywinauto 的 WindowSpecification：每次 exists()/wrapper_object() 都重新搜索"""
+
+    def __init__(self, wrapper=None):
+        self.wrapper = wrapper
+        self.searches = 0
+
+    def child_window(self, **criteria):
+        return self
+
+    def exists(self):
+        self.searches += 1
+        return self.wrapper is not None
+
+    def wrapper_object(self):
+        self.searches += 1
+        return self.wrapper
+
+
+class WrapperDouble:
+    """模拟解析后的 pywinauto 包装对象"""
+
+    def __init__(self):
+        self.destroyed = False
+
+    def is_visible(self):
+        if self.destroyed:
+            raise RuntimeError("元素已失效")
+        return True
+
+
+class TestPywinautoBackend:
+    """测试 pywinauto 后端返回解析后的包装对象"""
+
+    def test_find_child_returns_wrapper(self):
+        """测试查找结果是包装对象，存活检查不再搜索控件树"""
+        from pywinauto_pytest.executor.backends.pywinauto_backend import PywinautoBackend
+        backend = PywinautoBackend()
+        wrapper = WrapperDouble()
+        window = SpecDouble(wrapper)
+
+        element = backend.find_child(window, "Button", title="OK")
+        searches = window.searches
+
+        assert element is wrapper
+        assert backend.exists(element)
+        assert window.searches == searches
+        wrapper.destroyed = True
+        assert not backend.exists(element)
+
+    def test_find_child_missing(self):
+        """测试找不到控件时返回 None"""
+        from pywinauto_pytest.executor.backends.pywinauto_backend import PywinautoBackend
+        assert PywinautoBackend().find_child(SpecDouble(), "Button", title="OK") is None
+
+    def test_win32_snapshot_reads_element_info(self):
+        """测试 win32 后端的快照只读取 element_info，不逐个调用 texts()"""
+        from pywinauto_pytest.executor.backends.pywinauto_backend import PywinautoBackend
+        window = TreeWrapperDouble([ChildDouble("Button", "确定"), ChildDouble("Edit", "42")])
+
+        elements = PywinautoBackend("win32").snapshot(window)
+
+        assert [(info.control_type, info.text) for info in elements] == [("Button", "确定"), ("Edit", "42")]
+        assert elements[0].element is window.children[0]
+
+
+class RectDouble:
+    """模拟 pywinauto 的 RECT"""
+    left, top, right, bottom = 0, 0, 10, 10
+
+
+class ChildDouble:
+    """模拟 win32 控件的包装对象，调用 texts() 时失败"""
+
+    def __init__(self, control_type, name):
+        self.element_info = type("ElementInfoDouble", (), {
+            "control_type": control_type, "name": name, "class_name": control_type, "rectangle": RectDouble()
+        })()
+
+    def texts(self):
+        raise AssertionError("快照不应逐个调用 texts()")
+
+
+class TreeWrapperDouble:
+    """模拟窗口的包装对象"""
+
+    def __init__(self, children):
+        self.children = children
+
+    def descendants(self):
+        return list(self.children)
+
+
+class TestSnapshot:
+    """测试控件树快照"""
+
+    TEXTS = [
+        {"target": "Edit", "locator": "CalculatorResults", "expected": "0"},
+        {"target": "Button", "locator": "plusButton", "expected": "+"},
+        {"target": "Button", "locator": "1", "expected": "1"},
+        {"target": "Button", "locator": "4", "expected": "="},
+    ]
+
+    def test_assert_texts_uses_one_traversal(self, executor, fake_backend):
+        """测试批量文本断言只遍历一次控件树，不再逐个查找和读取文本"""
+        probes = _probes(fake_backend)
+        executor.execute_step(TestStep(action="assert_texts", data={"texts": self.TEXTS}))
+
+        assert fake_backend.calls["snapshot"] == 1
+        assert _probes(fake_backend) == probes
+        assert fake_backend.calls["texts"] == 0
+
+    def test_assert_texts_reports_all_mismatches(self, executor):
+        """测试批量文本断言在一条错误信息中列出所有不匹配的元素"""
+        texts = self.TEXTS + [
+            {"target": "Button", "locator": "2", "expected": "3"},
+            {"target": "Button", "locator": "missingButton", "expected": "x"},
+        ]
+        with pytest.raises(AssertionError) as excinfo:
+            executor.execute_step(TestStep(action="assert_texts", data={"texts": texts}))
+
+        message = str(excinfo.value)
+        assert "2/6" in message
+        assert "Button(2): 实际值 '2', 期望值 '3'" in message
+        assert "Button(missingButton): 找不到元素" in message
+
+    def test_read_only_steps_reuse_snapshot(self, executor, fake_backend):
+        """测试只读断言复用快照，修改界面的 action 使快照失效"""
+        executor.capture_snapshot()
+        executor.execute_step(TestStep(action="assert_text", target="Edit", expected="0"))
+        executor.execute_step(TestStep(action="assert_exists", target="Button", locator="equalButton"))
+        executor.execute_step(TestStep(action="assert_not_exists", target="Button", locator="missingButton"))
+        assert fake_backend.calls["texts"] == 0
+        assert _probes(fake_backend) == 0
+
+        executor.execute_step(TestStep(action="set_text", target="Edit", locator="CalculatorResults",
+                                       data={"text": "42"}))
+        assert executor.snapshot is None
+        executor.execute_step(TestStep(action="assert_text", target="Edit", expected="42"))
+        assert fake_backend.calls["texts"] == 1
+
+    def test_snapshot_bound_to_window(self, executor):
+        """测试切换窗口后旧快照不再使用"""
+        executor.capture_snapshot()
+        executor.execute_step(TestStep(action="switch_window", locator="About"))
+        assert executor._valid_snapshot() is None
+        snapshot = executor.capture_snapshot()
+        assert [info.auto_id for info in snapshot.elements] == ["okButton"]
+
+    def test_elements_created_on_demand(self, executor, fake_backend):
+        """测试快照只提供构造函数时，只有被定位到的控件才创建元素句柄"""
+        created = []
+        snapshot = fake_backend.snapshot
+
+        def lazy_snapshot(window):
+            elements = snapshot(window)
+            for info in elements:
+                element, info.element = info.element, None
+                info.factory = lambda element=element: created.append(element) or element
+            return elements
+
+        fake_backend.snapshot = lazy_snapshot
+        executor.capture_snapshot()
+        executor.execute_step(TestStep(action="assert_text", target="Edit", expected="0"))
+        assert created == []
+
+        executor.execute_step(TestStep(action="click", target="Button", locator="plusButton"))
+        assert [element.auto_id for element in created] == ["plusButton"]
+
+    def test_backend_without_snapshot(self, executor, fake_backend):
+        """测试后端不支持快照时逐个实时查找"""
+        fake_backend.snapshot = lambda window: None
+        executor.execute_step(TestStep(action="assert_texts", data={"texts": self.TEXTS}))
+        assert executor.snapshot is None
+        assert fake_backend.calls["texts"] == len(self.TEXTS)
+
+
+class TestSnapshotIndex:
+    """测试快照索引在录制的设置对话框 UI 树上的查找结果"""
+
+    @pytest.fixture
+    def settings(self, test_data_dir):
+        """已启动设置对话框的执行器"""
+        backend = FakeBackend.from_file(str(test_data_dir / "settings_tree.yaml"))
+        executor = PywinautoExecutor(backend=backend)
+        executor.execute_step(TestStep(action="start_application", target="settings.exe"))
+        return executor
+
+    @staticmethod
+    def _probe_chain(executor, target, locator):
+        """按实时定位策略依次探测，返回第一个找到的元素"""
+        for strategy in executor._locator_strategies(locator):
+            element = executor._locate_by(strategy, target, locator)
+            if element is not None:
+                return element
+        return None
+
+    def test_matches_probe_chain(self, settings):
+        """测试每个控件按 title/auto_id/class_name/index 查找的结果与实时探测一致"""
+        snapshot = settings.capture_snapshot()
+        assert len(snapshot) == 492
+        queries = set()
+        for info in snapshot.elements:
+            queries.update((info.control_type, value) for value in (info.title, info.auto_id, info.class_name) if value)
+        for control_type in ("Edit", "CheckBox", "Button", "Text"):
+            queries.update((control_type, str(i)) for i in (0, 7, 159, 500))
+
+        for target, locator in sorted(queries):
+            info = snapshot.find(target, locator, settings._locator_strategies(locator))
+            expected = self._probe_chain(settings, target, locator)
+            assert (info.element if info else None) is expected, f"{target}({locator})"
+
+    def test_numeric_locator_uses_one_traversal(self, settings):
+        """测试数字定位器缓存未命中时用一次快照代替逐个策略探测"""
+        backend = settings.backend
+        settings.execute_step(TestStep(action="click", target="CheckBox", locator="42"))
+
+        assert backend.calls["snapshot"] == 1
+        assert _probes(backend) == 0
+        assert settings.snapshot is None
+        assert settings.locator_cache._entries[("CheckBox", "42")].strategy == "index"
+
+    def test_action_uses_snapshot_then_drops_it(self, settings):
+        """测试修改界面的 action 从快照中定位元素，执行后快照失效"""
+        backend = settings.backend
+        settings.capture_snapshot()
+        settings.execute_step(TestStep(action="assert_text", target="Edit", locator="field3_4", expected="304"))
+        settings.execute_step(TestStep(action="set_text", target="Edit", locator="field3_4", data={"text": "1"}))
+
+        assert _probes(backend) == 0
+        assert settings.snapshot is None
+        settings.execute_step(TestStep(action="assert_text", target="Edit", locator="field3_4", expected="1"))
+
+    def test_wait_ignores_snapshot(self, settings):
+        """测试条件等待观察实时界面，不使用已有快照"""
+        settings.capture_snapshot()
+        element = [e for e in settings.current_window.descendants() if e.auto_id == "okButton"][0]
+        element.alive = False
+        with pytest.raises(TimeoutError):
+            settings.execute_step(TestStep(action="wait_for", target="Button", locator="okButton",
+                                           data={"timeout": 0.1}))
+
+
+class TestWaits:
+    """测试条件等待"""
+
+    @staticmethod
+    def _later(delay, func):
+        """在后台线程中延迟修改 UI 树"""
+        timer = threading.Timer(delay, func)
+        timer.start()
+        return timer
+
+    def test_wait_until_backoff(self):
+        """测试轮询间隔按倍数增长且不超过截止时间"""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(round(seconds, 3))
+            now[0] += seconds
+
+        ok, waited = wait_until(lambda: False, timeout=1.0, interval=0.1, backoff=2.0,
+                                clock=lambda: now[0], sleep=sleep)
+        assert not ok
+        assert sleeps == [0.1, 0.2, 0.4, 0.3]
+        assert waited == pytest.approx(1.0)
+
+    def test_wait_for_returns_when_element_appears(self, executor):
+        """测试元素出现后立即返回"""
+        window = executor.current_window
+        hidden = [e for e in window.descendants() if e.auto_id == "num1Button"][0]
+        hidden.alive = False
+        timer = self._later(0.1, lambda: setattr(hidden, "alive", True))
+        started = time.perf_counter()
+        executor.execute_step(TestStep(action="wait_for", target="Button", locator="num1Button",
+                                       data={"timeout": 5}))
+        timer.join()
+        assert time.perf_counter() - started < 1.0
+
+        wait = [r for r in executor.instrumentation.records if r.kind == "wait"][0]
+        assert wait.ok and wait.budget == 5.0 and wait.duration < 1.0
+
+    def test_wait_until_gone(self, executor):
+        """测试等待元素消失"""
+        element = executor._find_element("Button", "plusButton")
+        timer = self._later(0.1, lambda: setattr(element, "alive", False))
+        executor.execute_step(TestStep(action="wait_until_gone", target="Button", locator="plusButton",
+                                       data={"timeout": 5}))
+        timer.join()
+
+    def test_wait_for_text(self, executor, fake_backend):
+        """测试等待文本变为期望值"""
+        element = executor._find_element("Edit", "CalculatorResults")
+        timer = self._later(0.1, lambda: fake_backend.set_text(element, "3"))
+        executor.execute_step(TestStep(action="wait_for_text", target="Edit", expected="3", data={"timeout": 5}))
+        timer.join()
+
+    def test_wait_enabled_timeout(self, executor):
+        """测试超时时抛出 TimeoutError 并记录失败"""
+        with pytest.raises(TimeoutError):
+            executor.execute_step(TestStep(action="wait_enabled", target="Button", locator="clearButton",
+                                           data={"timeout": 0.2}))
+
+        wait = [r for r in executor.instrumentation.records if r.kind == "wait"][0]
+        assert not wait.ok
+        assert wait.duration == pytest.approx(0.2, abs=0.1)
+        assert executor.instrumentation.summary()['waits']['wait_enabled']['max_ratio'] >= 1.0
@@ -0,0 +1,98 @@
+"""测试增量执行"""
+from pywinauto_pytest import models
+from pywinauto_pytest.incremental import fingerprint
+
+SUITE_SPEC = """
+test_suite: 共享应用
+setup:
+  - action: start_application
+    target: calc.exe
+tests:
+  - name: 设置文本
+    steps:
+      - action: set_text
+        target: Edit
+        data:
+          text: "42"
+  - name: 点击按钮
+    steps:
+      - action: click
+        target: Button
+        locator: "1"
+"""
+
+
+def make_case(text="42", name="设置文本", description=None):
+    """创建测试用例"""
+    return models.TestCase(
+        name=name,
+        steps=[
+            models.TestStep(action="start_application", target="calc.exe"),
+            models.TestStep(action="set_text", target="Edit", data={"text": text}, description=description),
+        ],
+        teardown=[models.TestStep(action="close_application")]
+    )
+
+
+class TestFingerprint:
+    """测试用例内容指纹"""
+
+    def test_depends_on_steps_only(self):
+        """测试指纹只随步骤内容变化"""
+        base = fingerprint(make_case())
+        assert fingerprint(make_case()) == base
+        assert fingerprint(make_case(name="改名", description="说明")) == base
+        assert fingerprint(make_case(text="43")) != base
+
+    def test_includes_params(self):
+        """测试数据驱动用例的数据行参与指纹计算"""
+        template = make_case(text="${value}")
+        assert fingerprint(template, {"value": 1}) != fingerprint(template, {"value": 2})
+
+    def test_includes_suite_steps(self):
+        """测试所属测试套件的 setup/teardown 步骤参与指纹计算"""
+        case = make_case()
+        suite = models.TestCase(name="套件", steps=[], setup=[models.TestStep(action="start_application",
+                                                                            target="calc.exe")])
+        changed = models.TestCase(name="套件", steps=[], setup=[models.TestStep(action="start_application",
+                                                                              target="notepad.exe")])
+        assert fingerprint(case, suite=suite) != fingerprint(case)
+        assert fingerprint(case, suite=suite) != fingerprint(case, suite=changed)
+
+
+class TestChangedOnly:
+    """测试只执行有变化的用例"""
+
+    def test_skips_unchanged_passed_cases(self, pytester, fake_spec_content, fake_run_args):
+        """测试跳过上次通过且未变化的用例，执行失败、修改和新增的用例"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        args = [f"--pywinauto-file={spec}", str(spec), "--pywinauto-changed-only", *fake_run_args]
+        pytester.runpytest_subprocess(*args).assert_outcomes(passed=3, failed=1)
+
+        result = pytester.runpytest_subprocess(*args)
+        result.assert_outcomes(failed=1, deselected=3)
+        result.stdout.fnmatch_lines(["*pywinauto 增量执行: 跳过 3 个未变化的测试用例*"])
+
+        spec.write_text(
+            fake_spec_content.replace('text: "42"', 'text: "43"').replace('expected: "42"', 'expected: "43"')
+            + "  - name: 新用例\n    steps:\n      - action: start_application\n        target: calc.exe\n",
+            encoding="utf-8"
+        )
+        result = pytester.runpytest_subprocess(*args, "-v")
+        result.assert_outcomes(passed=2, failed=1, deselected=2)
+        result.stdout.fnmatch_lines(["*设置文本 PASSED*"])
+
+    def test_reruns_cases_after_suite_setup_failure(self, pytester, test_data_dir):
+        """测试套件 setup 失败时出错和被跳过的用例不会被当作已通过，下次增量执行时重新执行"""
+        spec = pytester.makefile(".yaml", suite=SUITE_SPEC)
+        broken = pytester.makefile(".yaml", broken_tree="windows: []\n")
+        args = [f"--pywinauto-file={spec}", str(spec), "--pywinauto-backend=fake"]
+        tree = f"--pywinauto-fake-tree={test_data_dir / 'calculator_tree.yaml'}"
+        pytester.runpytest_subprocess(*args, tree).assert_outcomes(passed=2)
+
+        # 被测应用程序不可用时套件 setup 失败，用例指纹不变
+        pytester.runpytest_subprocess(*args, f"--pywinauto-fake-tree={broken}").assert_outcomes(errors=1, skipped=1)
+
+        result = pytester.runpytest_subprocess(*args, tree, "--pywinauto-changed-only")
+        result.assert_outcomes(passed=2)
+        result.stdout.fnmatch_lines(["*pywinauto 增量执行: 跳过 0 个未变化的测试用例*"])
@@ -0,0 +1,125 @@
+"""测试步骤计时"""
+import json
+import pytest
+from pywinauto_pytest.allure_integration import AllureIntegration
+from pywinauto_pytest.executor import FakeBackend, PywinautoExecutor
+from pywinauto_pytest.instrumentation import Instrumentation, TimingRecord
+from pywinauto_pytest import models
+from pywinauto_pytest.runner import run_test_case
+
+
+class RecordingListener:
+    """记录回调顺序的监听器"""
+
+    def __init__(self):
+        self.events = []
+
+    def before_step(self, step):
+        self.events.append(('before_step', step.action))
+
+    def after_step(self, step, record):
+        self.events.append(('after_step', step.action, record.ok))
+
+    def after_lookup(self, record):
+        self.events.append(('after_lookup', record.name, record.ok))
+
+
+@pytest.fixture
+def executor(test_data_dir):
+    """使用 fake 后端的执行器"""
+    backend = FakeBackend.from_file(str(test_data_dir / "calculator_tree.yaml"))
+    return PywinautoExecutor(backend=backend, instrumentation=Instrumentation())
+
+
+def make_case(*steps):
+    """创建启动计算器并执行指定步骤的测试用例"""
+    return models.TestCase(
+        name="计时用例",
+        steps=[models.TestStep(action="start_application", target="calc.exe"), *steps],
+        teardown=[models.TestStep(action="close_application")]
+    )
+
+
+class TestInstrumentation:
+    """测试计时记录和汇总"""
+
+    def test_records_steps_lookups_and_phases(self, executor):
+        """测试记录步骤、定位策略和阶段耗时"""
+        case = make_case(models.TestStep(action="click", target="Button", locator="missing"))
+        with pytest.raises(RuntimeError):
+            run_test_case(executor, case, AllureIntegration())
+
+        summary = executor.instrumentation.summary()
+        assert summary['actions']['click']['count'] == 1
+        assert set(summary['phases']) == {'setup', 'steps', 'teardown'}
+        assert summary['strategies']['cache']['failed'] == 1
+        assert summary['strategies']['title']['failed'] == 1
+        assert 'index' not in summary['strategies']
+        assert summary['slowest'][0]['case'] == "计时用例"
+
+    def test_failed_step_marked(self, executor):
+        """测试失败的步骤和阶段被标记"""
+        case = make_case(models.TestStep(action="assert_text", target="Edit", expected="42"))
+        with pytest.raises(AssertionError):
+            run_test_case(executor, case, AllureIntegration())
+
+        records = executor.instrumentation.records
+        failed = [(r.kind, r.name) for r in records if not r.ok]
+        assert ('step', 'assert_text') in failed
+        assert ('phase', 'steps') in failed
+        assert all(r.phase == 'steps' for r in records if r.kind == 'step' and r.name == 'assert_text')
+
+    def test_listeners_called(self, executor):
+        """测试监听器在步骤和定位前后被调用"""
+        listener = RecordingListener()
+        executor.instrumentation.add_listener(listener)
+        run_test_case(executor, make_case(models.TestStep(action="click", target="Button", locator="+")),
+                      AllureIntegration())
+
+        assert listener.events[:2] == [('before_step', 'start_application'), ('after_step', 'start_application', True)]
+        assert ('after_lookup', 'title', True) in listener.events
+        assert listener.events[-1] == ('after_step', 'close_application', True)
+
+    def test_listener_errors_ignored(self, executor):
+        """测试监听器异常不影响测试执行"""
+        class BrokenListener:
+            def before_step(self, step):
+                raise RuntimeError("broken")
+
+        executor.instrumentation.add_listener(BrokenListener())
+        run_test_case(executor, make_case(), AllureIntegration())
+        assert executor.instrumentation.summary()['actions']['start_application']['count'] == 1
+
+    def test_without_records(self, test_data_dir):
+        """测试不保存记录时监听器仍然收到通知"""
+        backend = FakeBackend.from_file(str(test_data_dir / "calculator_tree.yaml"))
+        executor = PywinautoExecutor(backend=backend, instrumentation=Instrumentation(keep_records=False))
+        listener = RecordingListener()
+        executor.instrumentation.add_listener(listener)
+        for _ in range(3):
+            run_test_case(executor, make_case(models.TestStep(action="click", target="Button", locator="+")),
+                          AllureIntegration())
+        executor.instrumentation.extend([TimingRecord(kind='step', name='click', duration=0.1)])
+
+        assert executor.instrumentation.records == []
+        assert listener.events.count(('after_step', 'click', True)) == 3
+
+
+class TestInstrumentationPlugin:
+    """测试会话结束时的计时汇总"""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_writes_json_and_table(self, pytester, fake_spec_content, fake_run_args, workers):
+        """测试输出 JSON 汇总和最慢步骤表格，分布式执行时合并工作进程的记录"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        output = pytester.path / "profile.json"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), f"--pywinauto-profile={output}",
+            f"--pywinauto-workers={workers}", *fake_run_args
+        )
+
+        result.stdout.fnmatch_lines(["*pywinauto 最慢的 10 个步骤*"])
+        data = json.loads(output.read_text(encoding="utf-8"))
+        assert data['actions']['start_application']['count'] == 4
+        assert data['actions']['assert_text']['failed'] == 1
+        assert len(data['slowest']) == 10
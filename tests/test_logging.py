@@ -0,0 +1,138 @@
+"""测试日志管道"""
+import json
+import logging
+import threading
+from pywinauto_pytest.logger import LogPipeline, log_context, setup_logging
+
+
+class CollectingHandler(logging.Handler):
+    """记录处理日志的线程和消息"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((threading.current_thread(), record.getMessage()))
+
+
+class LazyValue:
+    """记录被格式化的次数和格式化所在的线程"""
+
+    def __init__(self):
+        self.formatted = 0
+        self.threads = []
+
+    def __str__(self):
+        self.formatted += 1
+        self.threads.append(threading.current_thread())
+        return "值"
+
+
+def make_logger(name):
+    """创建带收集处理器的 logger"""
+    target = logging.getLogger(f"pywinauto_pytest.tests.{name}")
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    handler = CollectingHandler()
+    target.addHandler(handler)
+    return target, handler
+
+
+class TestLogPipeline:
+    """测试队列日志和结构化日志"""
+
+    def test_records_handled_in_background(self):
+        """测试日志在后台线程中处理，停止后恢复原来的处理器"""
+        target, handler = make_logger("queue")
+        pipeline = LogPipeline(target)
+        pipeline.start()
+        try:
+            assert target.handlers != [handler]
+            for index in range(3):
+                target.info("步骤 %s", index)
+        finally:
+            pipeline.stop()
+
+        assert [message for _, message in handler.records] == ["步骤 0", "步骤 1", "步骤 2"]
+        assert all(thread is not threading.current_thread() for thread, _ in handler.records)
+        assert target.handlers == [handler]
+
+    def test_disabled_level_not_formatted(self):
+        """测试未启用的级别不会格式化参数"""
+        target, handler = make_logger("lazy")
+        value = LazyValue()
+        pipeline = LogPipeline(target)
+        pipeline.start()
+        try:
+            target.debug("查找元素: %s", value)
+        finally:
+            pipeline.stop()
+
+        assert value.formatted == 0
+        assert handler.records == []
+
+    def test_formatted_in_background(self):
+        """测试消息插值和异常格式化在后台线程中完成"""
+        target, handler = make_logger("prepare")
+        value = LazyValue()
+        pipeline = LogPipeline(target)
+        pipeline.start()
+        try:
+            try:
+                raise RuntimeError("失败")
+            except RuntimeError:
+                target.exception("步骤失败: %s", value)
+            assert value.formatted == 0
+        finally:
+            pipeline.stop()
+
+        assert handler.records[0][1] == "步骤失败: 值"
+        assert value.threads and threading.current_thread() not in value.threads
+
+    def test_logger_level_follows_handlers(self):
+        """测试 logger 的级别取处理器中最低的级别"""
+        logger = logging.getLogger("pywinauto_pytest")
+        try:
+            setup_logging()
+            assert logger.level == logging.INFO
+            setup_logging(log_level="DEBUG")
+            assert logger.level == logging.DEBUG
+        finally:
+            setup_logging()
+
+    def test_json_lines_with_context(self, tmp_path):
+        """测试结构化日志带有测试用例和步骤的关联字段"""
+        target, _ = make_logger("json")
+        path = tmp_path / "log.jsonl"
+        pipeline = LogPipeline(target, json_file=str(path))
+        pipeline.start()
+        try:
+            with log_context(test="加法测试", test_id="abc"):
+                target.info("开始")
+                with log_context(step="click", step_id="steps[1]"):
+                    target.warning("点击 %s", "plusButton")
+            target.info("结束")
+        finally:
+            pipeline.stop()
+
+        entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [entry["message"] for entry in entries] == ["开始", "点击 plusButton", "结束"]
+        assert entries[0]["test_id"] == "abc" and "step_id" not in entries[0]
+        assert (entries[1]["level"], entries[1]["step"], entries[1]["step_id"]) == ("WARNING", "click", "steps[1]")
+        assert "test" not in entries[2]
+
+    def test_plugin_writes_json_log(self, pytester, fake_run_args, fake_spec_content):
+        """测试命令行启用结构化日志"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        log_path = pytester.path / "log.jsonl"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), "--pywinauto-log-queue",
+            f"--pywinauto-log-json={log_path}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3, failed=1)
+        entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+        steps = [entry for entry in entries if entry["message"].startswith("执行步骤")]
+        assert steps and all("test_id" in entry and "step_id" in entry for entry in steps)
+        assert len({entry["test_id"] for entry in steps}) == 4
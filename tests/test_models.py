@@ -1,6 +1,7 @@
 """测试数据模型"""
+import pickle
 import pytest
-from pywinauto_pytest.models import TestStep, TestCase, TestSuite
+from pywinauto_pytest.models import EMPTY_DATA, TestStep, TestCase, TestSuite
 
 
 class TestTestStep:
@@ -134,3 +135,41 @@ class TestTestSuite:
         
         assert len(test_suite.setup) == 1
         assert len(test_suite.teardown) == 1
+
+
+class TestCompactModels:
+    """测试紧凑的数据模型表示"""
+    
+    def test_slots(self):
+        """测试模型实例没有 __dict__"""
+        step = TestStep(action="click")
+        assert not hasattr(step, "__dict__")
+        with pytest.raises(AttributeError):
+            step.unknown = 1
+    
+    def test_shared_empty_data(self):
+        """测试没有数据的步骤共享只读的空 data"""
+        first = TestStep(action="click")
+        second = TestStep(action="click", data={})
+        assert first.data is second.data is EMPTY_DATA
+        with pytest.raises(TypeError):
+            first.data["text"] = "1"
+        
+        step = TestStep(action="type", data={"text": "1"})
+        step.data["text"] = "2"
+        assert step.data == {"text": "2"}
+    
+    def test_interned_strings(self):
+        """测试 action/target/locator 被驻留"""
+        first = TestStep(action="".join("click"), target="".join("Button"), locator="".join("num1"))
+        second = TestStep(action="".join("click"), target="".join("Button"), locator="".join("num1"))
+        assert first.action is second.action
+        assert first.target is second.target
+        assert first.locator is second.locator
+    
+    def test_pickle_roundtrip(self):
+        """测试序列化后保持相等且仍共享空 data"""
+        suite = TestSuite(name="套件", tests=[TestCase(name="用例", steps=[TestStep(action="click")])])
+        loaded = pickle.loads(pickle.dumps(suite))
+        assert loaded == suite
+        assert loaded.tests[0].steps[0].data is EMPTY_DATA
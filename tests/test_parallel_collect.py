@@ -0,0 +1,48 @@
+"""测试并行收集"""
+
+
+class TestParallelCollect:
+    """测试并行预解析测试目录"""
+
+    def test_collects_all_files(self, pytester, sample_yaml_content, sample_json_content, sample_md_content):
+        """测试并行解析的结果与串行收集一致"""
+        specs = pytester.mkdir("specs")
+        (specs / "a.yaml").write_text(sample_yaml_content, encoding="utf-8")
+        (specs / "b.json").write_text(sample_json_content, encoding="utf-8")
+        (specs / "nested").mkdir()
+        (specs / "nested" / "c.md").write_text(sample_md_content, encoding="utf-8")
+        (specs / ".hidden").mkdir()
+        (specs / ".hidden" / "d.yaml").write_text(sample_yaml_content, encoding="utf-8")
+
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-path={specs}", str(specs), "--collect-only", "-q",
+            "--pywinauto-collect-workers=2"
+        )
+
+        result.stdout.fnmatch_lines(["*a.yaml::Sample Test", "*b.json::Sample Test", "*c.md::Sample Test"])
+        result.stdout.fnmatch_lines(["*并行解析 3 个测试文件*"])
+
+    def test_parse_error_attributed_to_file(self, pytester, sample_yaml_content):
+        """测试解析错误归属到对应的文件"""
+        specs = pytester.mkdir("specs")
+        (specs / "good.yaml").write_text(sample_yaml_content, encoding="utf-8")
+        (specs / "broken.yaml").write_text("tests: [unclosed", encoding="utf-8")
+
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-path={specs}", str(specs), "--collect-only", "-q", "-s",
+            "--pywinauto-collect-workers=2"
+        )
+
+        result.stdout.fnmatch_lines(["*解析测试文件失败: *broken.yaml*", "*good.yaml::Sample Test"])
+
+    def test_uses_suite_cache(self, pytester, sample_yaml_content):
+        """测试已缓存的文件不再交给进程池解析"""
+        specs = pytester.mkdir("specs")
+        (specs / "a.yaml").write_text(sample_yaml_content, encoding="utf-8")
+        args = [f"--pywinauto-path={specs}", str(specs), "--collect-only", "-q", "--pywinauto-collect-workers=2"]
+
+        pytester.runpytest_subprocess(*args)
+        result = pytester.runpytest_subprocess(*args)
+
+        result.stdout.no_fnmatch_line("*并行解析*")
+        result.stdout.fnmatch_lines(["*解析缓存: 命中 1/1*", "*a.yaml::Sample Test"])
@@ -0,0 +1,183 @@
+"""测试数据驱动的参数化"""
+import pytest
+from openpyxl import Workbook
+from pywinauto_pytest import models
+from pywinauto_pytest.parametrize import expand, iter_rows, parse_dataset, render_case
+from pywinauto_pytest.parser.yaml_parser import YAMLParser
+
+
+def make_template(dataset):
+    """创建带占位符的测试用例模板"""
+    return models.TestCase(
+        name="设置 ${value}",
+        steps=[
+            models.TestStep(action="start_application", target="calc.exe"),
+            models.TestStep(action="set_text", target="Edit", locator="CalculatorResults",
+                            data={"text": "${value}", "timeout": "${timeout}"}),
+            models.TestStep(action="assert_text", target="Edit", expected="${value}"),
+        ],
+        teardown=[models.TestStep(action="close_application")],
+        dataset=dataset
+    )
+
+
+class TestDataset:
+    """测试数据集的解析和读取"""
+
+    def test_parse_dataset_forms(self, tmp_path):
+        """测试内联数据、文件路径和字典三种写法"""
+        assert parse_dataset([{"a": 1}], str(tmp_path)).rows == [{"a": 1}]
+        assert parse_dataset("data/rows.csv", str(tmp_path)).file == str(tmp_path / "data" / "rows.csv")
+        dataset = parse_dataset({"file": "rows.xlsx", "sheet": "加法"}, str(tmp_path))
+        assert (dataset.file, dataset.sheet) == (str(tmp_path / "rows.xlsx"), "加法")
+        with pytest.raises(ValueError):
+            parse_dataset({"sheet": "加法"}, str(tmp_path))
+
+    def test_csv_rows(self, tmp_path):
+        """测试读取 CSV 数据集"""
+        path = tmp_path / "rows.csv"
+        path.write_text("\ufeffvalue,timeout\n1,5\n2,5\n", encoding="utf-8")
+        rows = list(iter_rows(models.Dataset(file=str(path))))
+        assert rows == [{"value": "1", "timeout": "5"}, {"value": "2", "timeout": "5"}]
+
+    def test_excel_rows(self, tmp_path):
+        """测试读取 Excel 数据集，跳过空行"""
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "数据"
+        for row in [("value", "timeout"), (1, 5), (None, None), (2, 5)]:
+            sheet.append(row)
+        path = tmp_path / "rows.xlsx"
+        workbook.save(path)
+
+        rows = list(iter_rows(models.Dataset(file=str(path), sheet="数据")))
+        assert rows == [{"value": 1, "timeout": 5}, {"value": 2, "timeout": 5}]
+
+
+class TestExpand:
+    """测试用例展开和渲染"""
+
+    def test_expand_names(self):
+        """测试按数据行展开，优先使用 id 列命名"""
+        template = make_template(models.Dataset(rows=[
+            {"value": "1", "timeout": 5},
+            {"value": "2", "timeout": 5, "id": "two"},
+        ]))
+        assert [name for name, _ in expand(template)] == ["设置 1[0]", "设置 2[two]"]
+
+    def test_plain_case_not_expanded(self):
+        """测试没有数据集的用例原样返回"""
+        test_case = models.TestCase(name="普通用例", steps=[])
+        assert list(expand(test_case)) == [("普通用例", None)]
+
+    def test_missing_variable(self):
+        """测试数据行缺少变量时报错"""
+        template = make_template(models.Dataset(rows=[{"value": "1"}]))
+        with pytest.raises(ValueError, match="timeout"):
+            list(expand(template))
+
+    def test_render_shares_template_steps(self):
+        """测试渲染时复用不含占位符的步骤"""
+        template = make_template(None)
+        test_case = render_case(template, {"value": 42, "timeout": 5})
+
+        assert test_case.name == "设置 42"
+        assert test_case.steps[0] is template.steps[0]
+        assert test_case.teardown[0] is template.teardown[0]
+        assert test_case.steps[1].data == {"text": 42, "timeout": 5}
+        assert test_case.steps[2].expected == "42"
+        assert template.steps[1].data == {"text": "${value}", "timeout": "${timeout}"}
+
+    def test_yaml_parser_reads_dataset(self, tmp_path):
+        """测试 YAML 解析器读取 dataset，文件路径相对于测试文件"""
+        path = tmp_path / "suite.yaml"
+        path.write_text(
+            "test_suite: 参数化\n"
+            "tests:\n"
+            "  - name: 用例\n"
+            "    dataset: rows.csv\n"
+            "    steps:\n"
+            "      - action: click\n",
+            encoding="utf-8"
+        )
+        test_case = YAMLParser().parse(str(path)).tests[0]
+        assert test_case.dataset.file == str(tmp_path / "rows.csv")
+
+
+class TestParametrizedRun:
+    """测试数据驱动用例的收集和执行"""
+
+    SPEC = """
+test_suite: 参数化套件
+tests:
+  - name: 设置 ${value}
+    dataset:
+      file: rows.csv
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: set_text
+        target: Edit
+        locator: CalculatorResults
+        data:
+          text: "${value}"
+      - action: assert_text
+        target: Edit
+        expected: "${expected}"
+    teardown:
+      - action: close_application
+"""
+
+    def test_rows_become_items(self, pytester, fake_run_args):
+        """测试每个数据行成为一个测试项"""
+        pytester.path.joinpath("rows.csv").write_text("value,expected\n1,1\n2,2\n3,4\n", encoding="utf-8")
+        spec = pytester.makefile(".yaml", suite=self.SPEC)
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), "-v", *fake_run_args)
+
+        result.assert_outcomes(passed=2, failed=1)
+        result.stdout.fnmatch_lines(["*设置 1[[]0[]] PASSED*", "*设置 3[[]2[]] FAILED*"])
+
+    ACTION_SPEC = """
+test_suite: 参数化操作
+tests:
+  - name: ${name}
+    dataset:
+      - {name: 点击, action: click}
+      - {name: 断言, action: assert_exists}
+      - {name: 未知, action: double_tap}
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: ${action}
+        target: Button
+        locator: plusButton
+    teardown:
+      - action: close_application
+"""
+
+    def test_action_from_dataset(self, pytester, fake_run_args):
+        """测试 action 由数据行决定时按渲染后的数据行校验，无效的数据行在收集阶段报错"""
+        spec = pytester.makefile(".yaml", suite=self.ACTION_SPEC.replace("      - {name: 未知, action: double_tap}\n", ""))
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), "-v", *fake_run_args)
+        result.assert_outcomes(passed=2)
+
+        spec.write_text(self.ACTION_SPEC, encoding="utf-8")
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*测试用例 '未知' 无效*", "*steps[[]1[]] (double_tap): 不支持的操作类型*"])
+
+    def test_invalid_rows_fail_collection(self, pytester, fake_run_args):
+        """测试数据行缺少变量或数据集文件不存在时整个文件报告收集错误，而不是收集到 0 个用例"""
+        spec = pytester.makefile(
+            ".yaml",
+            suite=self.SPEC + "  - name: 普通用例\n    steps:\n      - action: start_application\n        target: calc.exe\n"
+        )
+        pytester.path.joinpath("rows.csv").write_text("value\n1\n", encoding="utf-8")
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*测试用例 '设置 ${value}' 的 dataset: *第 0 行数据缺少变量: expected*"])
+
+        pytester.path.joinpath("rows.csv").unlink()
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*测试用例 '设置 ${value}' 的 dataset: *rows.csv*"])
@@ -2,10 +2,15 @@
 import os
 import tempfile
 import pytest
+import yaml
 from pywinauto_pytest.parser import get_parser
+from pywinauto_pytest.parser import yaml_parser
 from pywinauto_pytest.parser.yaml_parser import YAMLParser
+from pywinauto_pytest.parser import json_parser
 from pywinauto_pytest.parser.json_parser import JSONParser
+from pywinauto_pytest.parser.schema import SpecError
 from pywinauto_pytest.parser.markdown_parser import MarkdownParser
+from pywinauto_pytest.parser.excel_parser import ExcelParser
 
 
 class TestYAMLParser:
@@ -54,6 +59,66 @@ class TestYAMLParser:
         finally:
             # 删除临时文件
             os.unlink(temp_file)
+    
+    def test_c_loader(self):
+        """测试 PyYAML 编译了 libyaml 时使用 C 加载器"""
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML 未编译 libyaml")
+        assert yaml_parser.SafeLoader is yaml.CSafeLoader
+    
+    @pytest.mark.parametrize("loader", ["c", "python"])
+    def test_multiple_documents(self, tmp_path, monkeypatch, loader):
+        """测试 --- 分隔的每个文档解析为一个测试套件，跳过空文档"""
+        if loader == "python":
+            monkeypatch.setattr(yaml_parser, "SafeLoader", yaml.SafeLoader)
+        path = tmp_path / "suites.yaml"
+        path.write_text(
+            "test_suite: A\ntests:\n  - name: a1\n  - name: a2\n"
+            "---\n"
+            "---\ntest_suite: B\ntests:\n  - name: b1\n"
+            "---\n",
+            encoding="utf-8"
+        )
+        parser = YAMLParser()
+        suites = list(parser.iter_suites(str(path)))
+        assert [suite.name for suite in suites] == ["A", "B"]
+        assert [case.name for case in suites[1].tests] == ["b1"]
+        assert parser.parse(str(path)).name == "A"
+    
+    def test_documents_loaded_lazily(self, tmp_path):
+        """测试文档按需加载，后面文档的错误在读到该文档时才报告"""
+        path = tmp_path / "suites.yaml"
+        path.write_text("test_suite: A\n---\ntest_suite: B\n---\ntests: 1\n", encoding="utf-8")
+        suites = YAMLParser().iter_suites(str(path))
+        assert next(suites).name == "A"
+        assert next(suites).name == "B"
+        with pytest.raises(SpecError, match=r"documents\[2\]\.tests: 应为列表"):
+            next(suites)
+    
+    def test_single_document_location(self, tmp_path):
+        """测试只有一个文档时错误位置不带文档序号"""
+        path = tmp_path / "suite.yaml"
+        path.write_text("---\ntests: 1\n", encoding="utf-8")
+        with pytest.raises(SpecError, match=r": tests: 应为列表"):
+            list(YAMLParser().iter_suites(str(path)))
+    
+    @pytest.mark.parametrize("content", ["", "---\n---\n"])
+    def test_empty_file(self, tmp_path, content):
+        """测试没有任何非空文档的文件在 parse 和 iter_suites 中都报告错误"""
+        path = tmp_path / "suite.yaml"
+        path.write_text(content, encoding="utf-8")
+        with pytest.raises(SpecError, match="顶层应为对象"):
+            YAMLParser().parse(str(path))
+        with pytest.raises(SpecError, match="顶层应为对象"):
+            list(YAMLParser().iter_suites(str(path)))
+
+    def test_collect_multiple_documents(self, pytester):
+        """测试收集多文档文件时用套件名称区分同名用例"""
+        spec = pytester.makefile(
+            ".yaml", suite="test_suite: A\ntests:\n  - name: t\n---\ntest_suite: B\ntests:\n  - name: t\n"
+        )
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), "--collect-only", "-q")
+        result.stdout.fnmatch_lines(["*suite.yaml::t[[]A[]]", "*suite.yaml::t[[]B[]]"])
 
 
 class TestJSONParser:
@@ -89,6 +154,81 @@ class TestJSONParser:
         finally:
             # 删除临时文件
             os.unlink(temp_file)
+    
+    def test_stdlib_fallback(self, tmp_path, sample_json_content, monkeypatch):
+        """测试未安装 orjson 时使用标准库 json 得到相同的结果"""
+        path = tmp_path / "suite.json"
+        path.write_text(sample_json_content, encoding="utf-8")
+        expected = JSONParser().parse(str(path))
+        
+        monkeypatch.setattr(json_parser, "orjson", None)
+        assert JSONParser().parse(str(path)) == expected
+    
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_syntax_error_location(self, tmp_path, monkeypatch, fast):
+        """测试 JSON 语法错误报告行列号"""
+        if not fast:
+            monkeypatch.setattr(json_parser, "orjson", None)
+        path = tmp_path / "suite.json"
+        path.write_text('{\n  "tests": [\n    {"name": "a",}\n  ]\n}', encoding="utf-8")
+        with pytest.raises(SpecError, match="第 3 行"):
+            JSONParser().parse(str(path))
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_invalid_encoding(self, tmp_path, monkeypatch, fast):
+        """测试文件不是 UTF-8 编码时抛出带有文件路径的 SpecError"""
+        if not fast:
+            monkeypatch.setattr(json_parser, "orjson", None)
+        path = tmp_path / "suite.json"
+        path.write_bytes('{"test_suite": "计算器"}'.encode("gbk"))
+        with pytest.raises(SpecError) as excinfo:
+            JSONParser().parse(str(path))
+        assert excinfo.value.file_path == str(path)
+
+
+class TestSuiteSchema:
+    """测试 JSON/YAML 测试文件的结构校验"""
+    
+    @pytest.mark.parametrize("content, location", [
+        ('[]', "测试文件的顶层应为对象"),
+        ('{"tests": {}}', "tests: 应为列表"),
+        ('{"tests": ["a"]}', "tests[0]: 测试用例应为对象"),
+        ('{"tests": [{"steps": {}}]}', "tests[0].steps: 应为步骤列表"),
+        ('{"tests": [{"steps": [{"action": "click", "data": []}]}]}', "tests[0].steps[0].data: 应为对象"),
+        ('{"tests": [{"teardown": [{"action": ["x"]}]}]}', "tests[0].teardown[0].action: 应为字符串"),
+        ('{"setup": [{"action": "click", "locator": {"a": 1}}]}', "setup[0].locator: 应为字符串，实际为对象"),
+        ('{"tests": [{"dataset": 1}]}', "tests[0].dataset: 无效的 dataset 定义"),
+    ])
+    def test_error_location(self, tmp_path, content, location):
+        """测试结构错误报告出错的位置"""
+        path = tmp_path / "suite.json"
+        path.write_text(content, encoding="utf-8")
+        with pytest.raises(SpecError) as excinfo:
+            JSONParser().parse(str(path))
+        assert location in str(excinfo.value)
+        assert str(excinfo.value).startswith(str(path))
+    
+    def test_scalars_become_strings(self, tmp_path):
+        """测试 YAML 中的数字定位器和期望值转换为字符串"""
+        path = tmp_path / "suite.yaml"
+        path.write_text(
+            "tests:\n  - name: 1\n    tags: [smoke, 2]\n    steps:\n"
+            "      - {action: click, target: Button, locator: 3}\n"
+            "      - {action: assert_text, target: Edit, expected: 42}\n",
+            encoding="utf-8"
+        )
+        test_case = YAMLParser().parse(str(path)).tests[0]
+        assert test_case.name == "1"
+        assert test_case.tags == ["smoke", "2"]
+        assert test_case.steps[0].locator == "3"
+        assert test_case.steps[1].expected == "42"
+    
+    def test_collection_reports_error(self, pytester):
+        """测试收集阶段报告结构错误的位置"""
+        spec = pytester.makefile(".json", suite='{"tests": [{"name": "a", "steps": [{"action": "click", "data": 1}]}]}')
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec))
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*tests[[]0[]].steps[[]0[]].data: 应为对象，实际为int*"])
 
 
 class TestMarkdownParser:
@@ -126,6 +266,99 @@ class TestMarkdownParser:
             # 删除临时文件
             os.unlink(temp_file)
 
+    def test_matches_html_parser(self, test_dir, tmp_path, sample_md_content):
+        """测试逐行解析与 HTML 解析结果一致"""
+        parser = MarkdownParser()
+        inline = tmp_path / "inline.md"
+        inline.write_text(sample_md_content, encoding="utf-8")
+
+        for path in [test_dir.parent / "examples" / "sample_tests" / "sample.md", inline]:
+            assert parser.parse(str(path)) == parser.parse_html(str(path))
+
+    def test_ignores_code_blocks_and_sections(self, tmp_path):
+        """测试忽略代码块，每个用例只读取自己的步骤"""
+        path = tmp_path / "suite.md"
+        path.write_text(
+            "# Suite\n\n"
+            "```\n## Not A Test\n1. **click**: Button(\"1\")\n```\n\n"
+            "## Empty\n\n"
+            "## Second\n"
+            "1. **click**: Button(\"2\")\n\n"
+            "**Teardown**:\n"
+            "- **close_application**\n",
+            encoding="utf-8"
+        )
+
+        test_suite = MarkdownParser().parse(str(path))
+        assert [test_case.name for test_case in test_suite.tests] == ["Empty", "Second"]
+        assert test_suite.tests[0].steps == []
+        assert test_suite.tests[1].steps[0].locator == '"2"'
+        assert test_suite.tests[1].teardown[0].action == "close_application"
+
+
+class TestExcelParser:
+    """测试 Excel 解析器"""
+    
+    @pytest.fixture
+    def sample_xlsx(self, test_dir):
+        """示例 Excel 测试文件"""
+        return str(test_dir.parent / "examples" / "sample_tests" / "sample.xlsx")
+    
+    @pytest.fixture
+    def multi_sheet_xlsx(self, tmp_path):
+        """包含两个工作表的 Excel 测试文件"""
+        from openpyxl import Workbook
+        
+        workbook = Workbook()
+        for index, sheet in enumerate([workbook.active, workbook.create_sheet("Second")]):
+            sheet.append([f"Suite {index}"])
+            sheet.append(["Test Case", "Action", "Target", "Locator", "Expected"])
+            sheet.append([f"## Test {index}"])
+            sheet.append([None, "click", "Button", "1"])
+            sheet.append(["Teardown", "close_application"])
+        path = tmp_path / "multi.xlsx"
+        workbook.save(path)
+        return str(path)
+    
+    def test_supports(self):
+        """测试是否支持 Excel 文件"""
+        parser = ExcelParser()
+        assert parser.supports("test.xlsx") is True
+        assert parser.supports("test.yaml") is False
+    
+    def test_parse(self, sample_xlsx):
+        """测试解析 Excel 文件"""
+        test_suite = ExcelParser().parse(sample_xlsx)
+        
+        assert test_suite.name == "Calculator Tests"
+        assert [t.name for t in test_suite.tests] == ["加法测试", "减法测试"]
+        
+        test_case = test_suite.tests[0]
+        assert len(test_case.steps) == 6
+        assert test_case.steps[1].action == "click"
+        assert test_case.steps[1].target == "Button"
+        assert test_case.steps[1].locator == "1"
+        assert test_case.steps[5].expected == "3"
+        assert [s.action for s in test_case.teardown] == ["close_application"]
+    
+    def test_short_rows(self, multi_sheet_xlsx):
+        """测试只读模式下长度不足的行"""
+        test_case = ExcelParser().parse(multi_sheet_xlsx).tests[0]
+        assert test_case.steps[0].expected is None
+        assert test_case.teardown[0].target is None
+    
+    def test_iter_suites(self, multi_sheet_xlsx):
+        """测试默认只解析活动工作表，启用 all_sheets 后每个工作表一个套件"""
+        assert [s.name for s in ExcelParser().iter_suites(multi_sheet_xlsx)] == ["Suite 0"]
+        
+        suites = list(ExcelParser(all_sheets=True).iter_suites(multi_sheet_xlsx))
+        assert [s.name for s in suites] == ["Suite 0", "Suite 1"]
+        assert [s.tests[0].name for s in suites] == ["Test 0", "Test 1"]
+    
+    def test_cache_token(self):
+        """测试缓存标识包含工作表配置"""
+        assert ExcelParser().cache_token() != ExcelParser(all_sheets=True).cache_token()
+
 
 class TestParserRegistry:
     """测试解析器注册和获取"""
@@ -0,0 +1,68 @@
+"""测试执行计划的编译"""
+import pytest
+from pywinauto_pytest import models
+from pywinauto_pytest.executor import PlanError, PywinautoExecutor, compile_case
+
+
+class TestCompileCase:
+    """测试编译测试用例"""
+
+    def test_resolves_handlers(self):
+        """测试解析处理函数"""
+        test_case = models.TestCase(
+            name="有效用例",
+            steps=[
+                models.TestStep(action="start_application", target="calc.exe"),
+                models.TestStep(action="click", target="Button", locator="plusButton"),
+                models.TestStep(action="click", target="Button", locator="2"),
+                models.TestStep(action="assert_text", target="Edit"),
+            ],
+            teardown=[models.TestStep(action="close_application")]
+        )
+        plan = compile_case(PywinautoExecutor, test_case)
+
+        assert plan.steps[1].handler is PywinautoExecutor._action_click
+        assert plan.teardown[0].handler is PywinautoExecutor._action_close_application
+
+    def test_reports_all_problems(self):
+        """测试一次报告所有无效的步骤"""
+        test_case = models.TestCase(
+            name="无效用例",
+            steps=[
+                models.TestStep(action="start_application"),
+                models.TestStep(action="double_tap", target="Button"),
+                models.TestStep(action="set_text", target="Edit"),
+            ],
+            teardown=[models.TestStep(action="switch_window")]
+        )
+        with pytest.raises(PlanError) as excinfo:
+            compile_case(PywinautoExecutor, test_case)
+
+        assert excinfo.value.problems == [
+            "steps[0] (start_application): 缺少 target",
+            "steps[1] (double_tap): 不支持的操作类型: double_tap",
+            "steps[2] (set_text): data 缺少: text",
+            "teardown[0] (switch_window): 缺少 locator",
+        ]
+
+
+class TestCollectionValidation:
+    """测试收集阶段的校验"""
+
+    def test_invalid_step_fails_collection(self, pytester, fake_run_args):
+        """测试无效步骤在收集阶段报错，不会启动应用程序"""
+        spec = pytester.makefile(".yaml", suite="""
+test_suite: 无效套件
+tests:
+  - name: 未知操作
+    steps:
+      - action: start_application
+        target: calc.exe
+      - action: double_tap
+        target: Button
+""")
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*测试用例 '未知操作' 无效*", "*steps[[]1[]] (double_tap): 不支持的操作类型*"])
+        result.stdout.no_fnmatch_line("*启动应用程序*")
@@ -0,0 +1,48 @@
+"""测试用例执行顺序和快速失败"""
+from pywinauto_pytest.history import CaseHistory
+from pywinauto_pytest.scheduling import failed_first, spread_long
+
+
+class TestOrdering:
+    """测试按执行历史排序"""
+
+    def test_failed_first(self):
+        """测试上次失败的用例排在前面，其余保持原有顺序"""
+        history = CaseHistory()
+        history.record("c", 1.0, "failed")
+        history.record("a", 1.0, "passed")
+        assert failed_first(["a", "b", "c", "d"], history) == ["c", "a", "b", "d"]
+
+    def test_spread_long(self):
+        """测试长用例均匀分散到其他用例之间"""
+        durations = {"l1": 60.0, "l2": 50.0, **{f"s{i}": 1.0 for i in range(6)}}
+        order = spread_long(["l1", "l2", "s0", "s1", "s2", "s3", "s4", "s5"], durations)
+        assert order == ["s0", "l1", "s1", "s2", "s3", "l2", "s4", "s5"]
+
+    def test_spread_without_long_cases(self):
+        """测试没有长用例时保持原有顺序"""
+        durations = {"a": 1.0, "b": 1.2, "c": 0.9}
+        assert spread_long(["a", "b", "c"], durations) == ["a", "b", "c"]
+
+
+class TestSchedulerRun:
+    """测试调度插件的端到端流程"""
+
+    def test_failed_first_then_stop(self, pytester, fake_spec_content, fake_run_args):
+        """测试上次失败的用例先执行，达到失败数上限后停止"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        args = [f"--pywinauto-file={spec}", str(spec), *fake_run_args]
+        pytester.runpytest_subprocess(*args).assert_outcomes(passed=3, failed=1)
+
+        result = pytester.runpytest_subprocess(*args, "-v", "--pywinauto-failed-first", "--pywinauto-max-failures=1")
+        result.assert_outcomes(failed=1)
+        result.stdout.fnmatch_lines(["*断言失败 FAILED*", "*pywinauto 快速失败: 失败 1 个用例*剩余用例未执行*"])
+
+    def test_time_budget(self, pytester, fake_spec_content, fake_run_args):
+        """测试超过时间预算后停止执行"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), "--pywinauto-time-budget=0.000001", *fake_run_args
+        )
+        result.assert_outcomes(passed=1)
+        result.stdout.fnmatch_lines(["*超过时间预算*"])
@@ -0,0 +1,134 @@
+"""测试截图去重、裁剪和大小预算"""
+import os
+import pytest
+from PIL import Image, ImageDraw
+from pywinauto_pytest import allure_integration, models, screenshots
+from pywinauto_pytest.allure_integration import AllureIntegration
+from pywinauto_pytest.attachments import encode_png
+from pywinauto_pytest.executor.backends import FakeBackend
+from pywinauto_pytest.executor.pywinauto_executor import PywinautoExecutor
+from pywinauto_pytest.screenshots import ScreenshotStore, frame_hash
+
+
+def make_frame(label: str, noise: int = 0, size=(640, 480)) -> Image.Image:
+    """生成带对话框的模拟画面，noise 改变少量像素"""
+    image = Image.new("RGB", size, (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    offset = 100 if label == "A" else 300
+    draw.rectangle((offset, 100, offset + 200, 300), fill=(30, 60, 200))
+    for index in range(noise):
+        image.putpixel((index, 0), (0, 0, 0))
+    return image
+
+
+def noisy_frame(size=(640, 480)) -> Image.Image:
+    """生成难以压缩的随机画面"""
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+class TestScreenshotStore:
+    """测试截图存储"""
+
+    def test_frame_hash_ignores_small_changes(self):
+        """测试几乎相同的画面得到相同的感知哈希"""
+        assert frame_hash(make_frame("A")) == frame_hash(make_frame("A", noise=3))
+        assert frame_hash(make_frame("A")) != frame_hash(make_frame("B"))
+
+    def test_duplicates_stored_once(self):
+        """测试感知哈希去重时几乎相同的截图只保存一次，并按首次保存的大小统计节省的字节"""
+        store = ScreenshotStore(dedup="perceptual")
+        key, original = store.admit(make_frame("A"), "用例1: 失败截图")
+        data = store.encode(make_frame("A"), key=key)
+        assert original is None
+
+        for index in range(3):
+            assert store.admit(make_frame("A", noise=index), f"用例{index + 2}")[1] == "用例1: 失败截图"
+        assert store.admit(make_frame("B"), "用例5")[1] is None
+
+        assert (store.captured, store.duplicates) == (5, 3)
+        assert store.saved_bytes == 3 * len(data)
+
+    def test_default_keeps_similar_frames(self):
+        """测试默认只合并完全相同的画面，只有细微差别的失败截图都会保存"""
+        store = ScreenshotStore()
+        assert store.admit(make_frame("A"), "用例1")[1] is None
+        assert store.admit(make_frame("A", noise=1), "用例2")[1] is None
+        assert store.duplicates == 0
+
+    def test_exact_mode(self):
+        """测试内容哈希只合并完全相同的画面"""
+        store = ScreenshotStore(dedup="exact")
+        store.admit(make_frame("A"), "用例1")
+        assert store.admit(make_frame("A", noise=3), "用例2")[1] is None
+        assert store.admit(make_frame("A"), "用例3")[1] == "用例1"
+
+    def test_budget_downscales_then_drops(self):
+        """测试超出预算时缩小截图，缩到下限仍放不下时丢弃"""
+        full_size = len(encode_png(noisy_frame()))
+        store = ScreenshotStore(budget=full_size + 300 * 1024, min_side=150)
+
+        assert store.encode(noisy_frame()) is not None
+        smaller = store.encode(noisy_frame())
+        assert smaller is not None and len(smaller) < full_size
+        assert store.encode(noisy_frame()) is None
+
+        assert (store.stored, store.downscaled, store.dropped) == (2, 1, 1)
+        assert store.stored_bytes <= store.budget
+        assert store.saved_bytes > full_size
+
+    def test_dropped_screenshot_not_referenced(self):
+        """测试超出预算被丢弃的截图不登记，之后相同的截图重新保存而不是指向它"""
+        frame = noisy_frame()
+        store = ScreenshotStore(budget=1024, min_side=150)
+        key, _ = store.admit(frame, "用例1")
+        assert store.encode(frame, key=key) is None
+
+        key, original = store.admit(frame, "用例2")
+        assert original is None
+        store.budget = 0
+        data = store.encode(frame, key=key)
+        assert data is not None
+        assert store.admit(frame, "用例3")[1] == "用例2"
+        assert store.saved_bytes == 2 * len(data)
+
+    def test_failed_encode_not_referenced(self, monkeypatch):
+        """测试编码失败的截图不登记"""
+        def fail(image):
+            raise OSError("编码失败")
+
+        store = ScreenshotStore()
+        key, _ = store.admit(make_frame("A"), "用例1")
+        monkeypatch.setattr(screenshots, "encode_png", fail)
+        with pytest.raises(OSError):
+            store.encode(make_frame("A"), key=key)
+        assert store.admit(make_frame("A"), "用例2")[1] is None
+
+
+class TestAllureScreenshots:
+    """测试 Allure 截图经过截图存储"""
+
+    def test_duplicate_becomes_note(self, monkeypatch):
+        """测试重复的截图只添加一条文本说明"""
+        monkeypatch.setattr(allure_integration, "grab_screen", lambda bbox=None: make_frame("A"))
+        store = ScreenshotStore()
+        attached = []
+        for owner in ("用例1", "用例2"):
+            integration = AllureIntegration(store=store, owner=owner)
+            monkeypatch.setattr(integration, "attach_data",
+                                lambda data, name, file_type="png": attached.append((file_type, data)))
+            integration.attach_screenshot("失败截图")
+
+        assert attached[0][0] == "png"
+        assert attached[1] == ("txt", "与 用例1: 失败截图 的截图相同，未重复保存".encode("utf-8"))
+
+    def test_crop_to_window(self, monkeypatch, test_data_dir):
+        """测试启用裁剪时按当前窗口区域截图"""
+        boxes = []
+        monkeypatch.setattr(allure_integration, "grab_screen", lambda bbox=None: boxes.append(bbox) or make_frame("A"))
+        executor = PywinautoExecutor(backend=FakeBackend.from_file(str(test_data_dir / "calculator_tree.yaml")))
+        executor.execute_step(models.TestStep(action="start_application", target="calc.exe"))
+
+        AllureIntegration(store=ScreenshotStore(crop=True)).attach_screenshot(region=executor.window_rect)
+        AllureIntegration(store=ScreenshotStore()).attach_screenshot(region=executor.window_rect)
+
+        assert boxes == [(100, 100, 420, 600), None]
@@ -0,0 +1,125 @@
+"""测试应用会话池"""
+import pytest
+from pywinauto_pytest.executor import FakeBackend, PywinautoExecutor, SessionPool
+from pywinauto_pytest.models import TestStep
+
+
+@pytest.fixture
+def fake_backend(test_data_dir):
+    """加载计算器 UI 树的 fake 后端"""
+    return FakeBackend.from_file(str(test_data_dir / "calculator_tree.yaml"))
+
+
+def run_case(executor, text):
+    """启动应用、修改文本并关闭应用"""
+    executor.execute_step(TestStep(action="start_application", target="calc.exe"))
+    executor.execute_step(TestStep(action="assert_text", target="Edit", expected="0"))
+    executor.execute_step(TestStep(action="set_text", target="Edit", locator="CalculatorResults",
+                                   data={"text": text}))
+    executor.execute_step(TestStep(action="close_application"))
+
+
+class TestSessionPool:
+    """测试会话池的复用和回收"""
+
+    def test_reuses_reset_instance(self, fake_backend):
+        """测试关闭后的实例恢复初始状态并被下一个用例复用"""
+        pool = SessionPool(fake_backend)
+        for text in ["1", "2", "3"]:
+            run_case(PywinautoExecutor(session_pool=pool), text)
+
+        assert fake_backend.calls["start"] == 1
+        assert fake_backend.calls["kill"] == 0
+        assert (pool.starts, pool.reuses) == (1, 2)
+
+    def test_recycles_after_max_uses(self, fake_backend):
+        """测试达到最大使用次数后关闭并重新启动"""
+        pool = SessionPool(fake_backend, max_uses=2)
+        for text in ["1", "2", "3"]:
+            run_case(PywinautoExecutor(session_pool=pool), text)
+
+        assert fake_backend.calls["start"] == 2
+        assert pool.recycled == 1
+
+    def test_unhealthy_instance_killed(self, fake_backend):
+        """测试健康检查失败的实例不会被复用"""
+        pool = SessionPool(fake_backend)
+        app = pool.acquire("calc.exe")
+        pool.release(app)
+        app.running = False
+
+        assert pool.acquire("calc.exe") is not app
+        assert fake_backend.calls["start"] == 2
+        assert pool.recycled == 1
+
+    def test_failed_reset_kills_instance(self, fake_backend):
+        """测试恢复初始状态失败时关闭实例"""
+        def broken_reset(backend, app):
+            raise RuntimeError("dialog stuck")
+
+        pool = SessionPool(fake_backend, reset=broken_reset)
+        pool.release(pool.acquire("calc.exe"))
+        assert pool.idle == {}
+        assert fake_backend.calls["kill"] == 1
+
+    def test_release_session_returns_open_app(self, fake_backend):
+        """测试未执行 close_application 的用例结束后实例也会归还"""
+        pool = SessionPool(fake_backend)
+        executor = PywinautoExecutor(session_pool=pool)
+        executor.execute_step(TestStep(action="start_application", target="calc.exe"))
+        executor.release_session()
+
+        assert executor.app is None
+        assert len(pool.idle["calc.exe"]) == 1
+
+    def test_close_kills_all(self, fake_backend):
+        """测试关闭会话池时关闭所有实例"""
+        pool = SessionPool(fake_backend)
+        pool.release(pool.acquire("calc.exe"))
+        pool.acquire("calc.exe")
+        pool.close()
+        assert fake_backend.calls["kill"] == 1
+
+
+class TestSessionPoolPlugin:
+    """测试命令行启用会话池"""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_reuse_app(self, pytester, fake_spec_content, fake_run_args, workers):
+        """测试启用会话池后用例结果不变"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), "--pywinauto-reuse-app",
+            f"--pywinauto-workers={workers}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3, failed=1)
+        if not workers:
+            result.stdout.fnmatch_lines(["*应用会话池: 启动 1 次, 复用 3 次*"])
+
+
+class TestSessionBackend:
+    """测试会话内的执行器共用一个后端"""
+
+    def test_tree_loaded_once(self, pytester, fake_spec_content, fake_run_args):
+        """测试 fake 后端的 UI 树文件在整个会话中只加载一次"""
+        pytester.makeconftest("""
+            from pywinauto_pytest.executor.backends import FakeBackend
+
+            loads = []
+            from_file = FakeBackend.from_file.__func__
+
+            def counting_from_file(cls, *args, **kwargs):
+                loads.append(args)
+                return from_file(cls, *args, **kwargs)
+
+            FakeBackend.from_file = classmethod(counting_from_file)
+
+            def pytest_terminal_summary(terminalreporter):
+                terminalreporter.write_line(f"UI 树加载次数: {len(loads)}")
+        """)
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), *fake_run_args)
+
+        result.assert_outcomes(passed=3, failed=1)
+        result.stdout.fnmatch_lines(["UI 树加载次数: 1"])
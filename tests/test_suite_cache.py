@@ -0,0 +1,104 @@
+"""测试解析结果缓存"""
+import os
+import pytest
+from pywinauto_pytest.parser.yaml_parser import YAMLParser
+from pywinauto_pytest.suite_cache import SuiteCache
+
+
+class CountingYAMLParser(YAMLParser):
+    """记录解析次数的 YAML 解析器"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def iter_suites(self, file_path):
+        self.calls += 1
+        return super().iter_suites(file_path)
+
+
+@pytest.fixture
+def spec_file(tmp_path, sample_yaml_content):
+    """临时 YAML 测试文件"""
+    path = tmp_path / "suite.yaml"
+    path.write_text(sample_yaml_content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def suite_cache(tmp_path):
+    """临时目录中的解析缓存"""
+    return SuiteCache(tmp_path / "cache")
+
+
+class TestSuiteCache:
+    """测试解析缓存"""
+
+    def test_unchanged_file_skips_parsing(self, suite_cache, spec_file):
+        """测试文件未变化时不再解析"""
+        parser = CountingYAMLParser()
+        first = suite_cache.parse(str(spec_file), parser)
+        second = suite_cache.parse(str(spec_file), parser)
+
+        assert parser.calls == 1
+        assert second == first
+        assert (suite_cache.hits, suite_cache.misses) == (1, 1)
+        assert suite_cache.hit_rate == 0.5
+
+    def test_touched_file_with_same_content_hits(self, suite_cache, spec_file):
+        """测试仅修改时间变化时通过内容哈希命中"""
+        parser = CountingYAMLParser()
+        suite_cache.parse(str(spec_file), parser)
+        stat = spec_file.stat()
+        os.utime(spec_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        suite_cache.parse(str(spec_file), parser)
+        assert parser.calls == 1
+
+    def test_changed_content_reparses(self, suite_cache, spec_file):
+        """测试内容变化时重新解析"""
+        parser = CountingYAMLParser()
+        suite_cache.parse(str(spec_file), parser)
+        spec_file.write_text(spec_file.read_text(encoding="utf-8").replace("Sample Test Suite", "Changed"),
+                             encoding="utf-8")
+
+        suites = suite_cache.parse(str(spec_file), parser)
+        assert parser.calls == 2
+        assert suites[0].name == "Changed"
+
+    def test_parser_version_change_reparses(self, suite_cache, spec_file):
+        """测试解析器版本变化时重新解析"""
+        parser = CountingYAMLParser()
+        suite_cache.parse(str(spec_file), parser)
+        parser.version = "2"
+
+        suite_cache.parse(str(spec_file), parser)
+        assert parser.calls == 2
+
+    def test_corrupted_entry_reparses(self, suite_cache, spec_file):
+        """测试缓存文件损坏时重新解析"""
+        parser = CountingYAMLParser()
+        suite_cache.parse(str(spec_file), parser)
+        for entry in suite_cache.directory.iterdir():
+            entry.write_bytes(b"corrupted")
+
+        suite_cache.parse(str(spec_file), parser)
+        assert parser.calls == 2
+
+
+class TestSuiteCachePlugin:
+    """测试收集阶段的缓存报告"""
+
+    def test_reports_hit_rate(self, pytester, sample_yaml_content):
+        """测试第二次收集时全部命中缓存"""
+        spec = pytester.makefile(".yaml", suite=sample_yaml_content)
+        args = [f"--pywinauto-file={spec}", str(spec), "--collect-only", "-q"]
+
+        pytester.runpytest_subprocess(*args).stdout.fnmatch_lines(["*解析缓存: 命中 0/1 (0%)*"])
+        pytester.runpytest_subprocess(*args).stdout.fnmatch_lines(["*解析缓存: 命中 1/1 (100%)*"])
+
+    def test_can_be_disabled(self, pytester, sample_yaml_content):
+        """测试可以禁用缓存"""
+        spec = pytester.makefile(".yaml", suite=sample_yaml_content)
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), "--collect-only",
+                                               "--pywinauto-no-suite-cache")
+        result.stdout.no_fnmatch_line("*解析缓存*")
@@ -0,0 +1,74 @@
+"""测试套件级别的 setup/teardown"""
+import json
+
+SUITE_SPEC = """
+test_suite: 共享应用
+setup:
+  - action: start_application
+    target: calc.exe
+{extra_setup}
+teardown:
+  - action: close_application
+tests:
+  - name: 设置文本
+    steps:
+      - action: set_text
+        target: Edit
+        locator: CalculatorResults
+        data:
+          text: "42"
+  - name: 读取上一个用例的文本
+    steps:
+      - action: assert_text
+        target: Edit
+        expected: "42"
+  - name: 点击按钮
+    steps:
+      - action: click
+        target: Button
+        locator: "1"
+"""
+
+
+class TestSuiteFixture:
+    """测试套件 setup/teardown 每个文件只执行一次"""
+
+    def test_setup_runs_once(self, pytester, fake_run_args):
+        """测试套件 setup 只执行一次，用例共用应用实例"""
+        spec = pytester.makefile(".yaml", suite=SUITE_SPEC.format(extra_setup=""))
+        profile = pytester.path / "profile.json"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), f"--pywinauto-profile={profile}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3)
+        actions = json.loads(profile.read_text(encoding="utf-8"))["actions"]
+        assert actions["start_application"]["count"] == 1
+        assert actions["close_application"]["count"] == 1
+
+    def test_setup_failure_skips_cases(self, pytester, fake_run_args):
+        """测试套件 setup 失败时第一个用例报错，其余用例跳过"""
+        extra = "  - action: switch_window\n    locator: 不存在的窗口\n"
+        spec = pytester.makefile(".yaml", suite=SUITE_SPEC.format(extra_setup=extra))
+        result = pytester.runpytest_subprocess(f"--pywinauto-file={spec}", str(spec), "-rs", *fake_run_args)
+
+        result.assert_outcomes(errors=1, skipped=2)
+        result.stdout.fnmatch_lines(["*测试套件 '共享应用' 的 setup 失败*"])
+
+    def test_distributed(self, pytester, fake_run_args):
+        """测试分布式执行时每个工作进程为自己分到的用例执行一次套件 setup"""
+        content = SUITE_SPEC.format(extra_setup="").replace(
+            'action: assert_text\n        target: Edit\n        expected: "42"',
+            'action: click\n        target: Button\n        locator: "2"'
+        )
+        spec = pytester.makefile(".yaml", suite=content)
+        profile = pytester.path / "profile.json"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), "--pywinauto-workers=2",
+            f"--pywinauto-profile={profile}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3)
+        actions = json.loads(profile.read_text(encoding="utf-8"))["actions"]
+        assert actions["start_application"]["count"] == 2
+        assert actions["close_application"]["count"] == 2
@@ -0,0 +1,211 @@
+"""测试执行轨迹的记录和重放"""
+import gzip
+import pytest
+from pywinauto_pytest import models
+from pywinauto_pytest.allure_integration import AllureIntegration
+from pywinauto_pytest.executor import FakeBackend, PywinautoExecutor
+from pywinauto_pytest.runner import run_test_case
+from pywinauto_pytest.trace import TraceRecorder, fake_tree, read_trace, replay
+
+
+@pytest.fixture
+def tree_file(test_data_dir):
+    """计算器 UI 树文件"""
+    return str(test_data_dir / "calculator_tree.yaml")
+
+
+def make_case(expected="42"):
+    """设置文本、点击按钮并断言文本的测试用例"""
+    return models.TestCase(
+        name="轨迹用例",
+        steps=[
+            models.TestStep(action="start_application", target="calc.exe"),
+            models.TestStep(action="set_text", target="Edit", locator="CalculatorResults", data={"text": "42"}),
+            models.TestStep(action="click", target="Button", locator="plusButton"),
+            models.TestStep(action="assert_text", target="Edit", expected=expected),
+        ],
+        teardown=[models.TestStep(action="close_application")]
+    )
+
+
+def record(path, tree_file, test_case):
+    """在 fake 后端上执行测试用例并记录轨迹"""
+    executor = PywinautoExecutor(backend=FakeBackend.from_file(tree_file))
+    recorder = TraceRecorder(str(path), test_case.name, "suite.yaml::" + test_case.name, "fake")
+    executor.instrumentation.add_listener(recorder)
+    try:
+        run_test_case(executor, test_case, AllureIntegration())
+    finally:
+        recorder.close()
+
+
+class TestTraceRecorder:
+    """测试轨迹记录"""
+
+    def test_records_steps(self, tmp_path, tree_file):
+        """测试记录步骤、定位策略、定位到的元素和执行结果"""
+        path = tmp_path / "case.trace.gz"
+        record(path, tree_file, make_case())
+
+        [run] = read_trace(str(path))
+        assert run.case == "轨迹用例"
+        assert run.backend == "fake"
+        assert [s.step.action for s in run.steps] == [
+            "start_application", "set_text", "click", "assert_text", "close_application"
+        ]
+        assert [s.phase for s in run.steps] == ["steps"] * 4 + ["teardown"]
+        set_text = run.steps[1]
+        assert set_text.step.data == {"text": "42"}
+        assert set_text.strategy == "auto_id"
+        assert set_text.element["auto_id"] == "CalculatorResults"
+        assert [lookup[:2] for lookup in set_text.lookups] == [("cache", False), ("title", False), ("auto_id", True)]
+        assert all(s.ok for s in run.steps)
+
+    def test_records_failure(self, tmp_path, tree_file):
+        """测试记录失败步骤的错误信息"""
+        path = tmp_path / "case.trace.gz"
+        with pytest.raises(AssertionError):
+            record(path, tree_file, make_case(expected="0"))
+
+        [run] = read_trace(str(path))
+        failed = run.steps[3]
+        assert not failed.ok
+        assert failed.error.startswith("AssertionError: 文本断言失败")
+        assert run.steps[-1].step.action == "close_application"
+
+    def test_appends_runs(self, tmp_path, tree_file):
+        """测试同一个文件追加多次执行"""
+        path = tmp_path / "case.trace.gz"
+        record(path, tree_file, make_case())
+        with pytest.raises(AssertionError):
+            record(path, tree_file, make_case(expected="0"))
+        assert [all(s.ok for s in run.steps) for run in read_trace(str(path))] == [True, False]
+
+    def test_truncated_file(self, tmp_path, tree_file):
+        """测试文件末尾不完整时读出已完整写入的步骤"""
+        path = tmp_path / "case.trace.gz"
+        record(path, tree_file, make_case())
+        data = path.read_bytes()
+        path.write_bytes(data[:-12])
+
+        [run] = read_trace(str(path))
+        assert run.case == "轨迹用例"
+
+    def test_skips_unsupported_version(self, tmp_path, tree_file):
+        """测试不支持版本的执行连同它的步骤一起跳过，不会并入前一个执行"""
+        path = tmp_path / "case.trace.gz"
+        record(path, tree_file, make_case())
+        with gzip.open(path, "ab") as f:
+            f.write('["run", 999, "新版本用例", "suite.yaml::new", "fake", 0]\n'.encode("utf-8"))
+            f.write(b'["step", "steps", "click", "Button", "1", null, null, null, true, 0.1, null, [], null, null]\n')
+        record(path, tree_file, make_case())
+
+        runs = read_trace(str(path))
+        assert [len(run.steps) for run in runs] == [5, 5]
+        assert all(s.step.action != "click" or s.step.locator == "plusButton" for run in runs for s in run.steps)
+
+    def test_compact(self, tmp_path, tree_file):
+        """测试轨迹文件经过压缩"""
+        path = tmp_path / "case.trace.gz"
+        for _ in range(20):
+            record(path, tree_file, make_case())
+        with gzip.open(path, "rb") as f:
+            raw = len(f.read())
+        assert path.stat().st_size * 2 < raw
+
+
+class TestReplay:
+    """测试在 fake 后端上重放轨迹"""
+
+    def test_replay_matches_original(self, tmp_path, tree_file):
+        """测试重放结果与原始执行一致，耗时记录在执行器的计时器中"""
+        path = tmp_path / "case.trace.gz"
+        with pytest.raises(AssertionError):
+            record(path, tree_file, make_case(expected="0"))
+        [run] = read_trace(str(path))
+
+        executor = PywinautoExecutor(backend=FakeBackend.from_file(tree_file))
+        results = replay(run, executor)
+
+        assert [r.ok for r in results] == [True, True, True, False, True]
+        assert not any(r.diverged for r in results)
+        summary = executor.instrumentation.summary()
+        assert summary["actions"]["assert_text"]["failed"] == 1
+        assert set(summary["phases"]) == {"steps", "teardown"}
+
+    def test_replay_on_tree_from_trace(self, tmp_path, tree_file):
+        """测试根据轨迹构建的 UI 树离线重放"""
+        path = tmp_path / "case.trace.gz"
+        record(path, tree_file, make_case())
+        runs = read_trace(str(path))
+
+        tree = fake_tree(runs)
+        assert [c["auto_id"] for c in tree["windows"][0]["children"]] == ["CalculatorResults", "plusButton"]
+        executor = PywinautoExecutor(backend=FakeBackend(tree=tree))
+        assert not any(r.diverged for r in replay(runs[0], executor))
+
+
+class TestTracePlugin:
+    """测试插件为每个测试项记录轨迹"""
+
+    def test_trace_option(self, pytester, fake_spec_content, fake_run_args):
+        """测试每个测试用例一个轨迹文件，失败用例记录错误信息"""
+        spec = pytester.makefile(".yaml", suite=fake_spec_content)
+        trace_dir = pytester.path / "traces"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), f"--pywinauto-trace={trace_dir}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=3, failed=1)
+        result.stdout.fnmatch_lines(["*pywinauto 执行轨迹: 4 个测试用例*"])
+        paths = sorted(trace_dir.iterdir())
+        assert len(paths) == 4
+        runs = {run.case: run for path in paths for run in read_trace(str(path))}
+        assert runs["断言失败"].steps[1].error.startswith("AssertionError")
+        assert runs["切换窗口"].steps[2].element["auto_id"] == "okButton"
+
+    SUITE_SPEC = """
+test_suite: 共享应用
+setup:
+  - action: start_application
+    target: calc.exe
+teardown:
+  - action: close_application
+tests:
+  - name: 点击按钮
+    steps:
+      - action: click
+        target: Button
+        locator: plusButton
+  - name: 设置文本
+    steps:
+      - action: set_text
+        target: Edit
+        locator: CalculatorResults
+        data:
+          text: "42"
+      - action: assert_text
+        target: Edit
+        expected: "42"
+"""
+
+    def test_suite_setup_and_teardown(self, pytester, fake_run_args, tree_file):
+        """测试套件 setup 写入每个测试用例的轨迹，套件 teardown 追加到最后一个测试用例，单独重放时先启动应用"""
+        spec = pytester.makefile(".yaml", suite=self.SUITE_SPEC)
+        trace_dir = pytester.path / "traces"
+        result = pytester.runpytest_subprocess(
+            f"--pywinauto-file={spec}", str(spec), f"--pywinauto-trace={trace_dir}", *fake_run_args
+        )
+
+        result.assert_outcomes(passed=2)
+        runs = {run.case: run for path in trace_dir.iterdir() for run in read_trace(str(path))}
+        assert [(s.phase, s.step.action) for s in runs["点击按钮"].steps] == [
+            ("suite_setup", "start_application"), ("steps", "click")
+        ]
+        assert [(s.phase, s.step.action) for s in runs["设置文本"].steps] == [
+            ("suite_setup", "start_application"), ("steps", "set_text"), ("steps", "assert_text"),
+            ("suite_teardown", "close_application")
+        ]
+
+        executor = PywinautoExecutor(backend=FakeBackend.from_file(tree_file))
+        assert all(r.ok for r in replay(runs["设置文本"], executor))